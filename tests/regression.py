@@ -116,6 +116,71 @@ def establish_baseline(*args, counts=[390, 3820, 1710]):
     return times
 
 
+def stl_ascii_timing(subdivisions=6, repeats=3):
+    '''
+    Time parsing an ASCII STL file, loaded all at once and in
+    batches, for comparison between versions.
+
+    Arguments
+    ----------
+    subdivisions: int, subdivisions of the icosphere exported
+    repeats:      int, number of times to repeat each timing
+
+    Returns
+    ---------
+    timings: dict, minimum seconds for each way of loading
+    '''
+    mesh = g.trimesh.creation.icosphere(subdivisions=subdivisions)
+    export = g.trimesh.io.stl.export_stl_ascii(mesh).encode('utf-8')
+
+    def load():
+        g.trimesh.io.stl.load_stl_ascii(g.BytesIO(export))
+
+    def iterate():
+        for batch in g.trimesh.io.stl.iterate_stl(g.BytesIO(export)):
+            pass
+
+    timings = {'faces': len(mesh.faces),
+               'megabytes': len(export) / 1e6,
+               'load_stl_ascii': min(timeit.repeat(load,
+                                                   repeat=repeats,
+                                                   number=1)),
+               'iterate_stl': min(timeit.repeat(iterate,
+                                                repeat=repeats,
+                                                number=1))}
+    return timings
+
+
+def export_ascii_timing(subdivisions=6, repeats=3):
+    '''
+    Time exporting a mesh to each ASCII format, for comparison
+    of formatting throughput between versions.
+
+    Arguments
+    ----------
+    subdivisions: int, subdivisions of the icosphere exported
+    repeats:      int, number of times to repeat each timing
+
+    Returns
+    ---------
+    timings: dict, megabytes per second for each file type
+    '''
+    mesh = g.trimesh.creation.icosphere(subdivisions=subdivisions)
+    # include vertex normals in the OBJ export
+    mesh.vertex_normals
+
+    timings = {'faces': len(mesh.faces)}
+    for file_type in ['off', 'obj', 'stl_ascii']:
+        def export():
+            return mesh.export(file_type=file_type)
+        megabytes = len(export()) / 1e6
+        seconds = min(timeit.repeat(export,
+                                    repeat=repeats,
+                                    number=1))
+        timings[file_type] = megabytes / seconds
+    return timings
+
+
 def machine_info():
     info = {}
 
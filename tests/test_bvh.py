@@ -0,0 +1,52 @@
+import generic as g
+
+
+class BVHTest(g.unittest.TestCase):
+
+    def test_query(self):
+        for count in [0, 1, 10, 500]:
+            center = g.np.random.random((count, 3))
+            bounds = g.np.stack((center,
+                                 center + g.np.random.random((count, 3)) * .1),
+                                axis=1)
+            tree = g.trimesh.bvh.BVH(bounds, leaf_size=4)
+
+            query = g.np.random.random((50, 3))
+            query = g.np.stack((query, query + .2), axis=1)
+
+            # compare every overlap against brute force
+            truth = set((i, j) for i in range(len(query))
+                        for j in range(count)
+                        if g.trimesh.bvh.bounds_overlap(query[[i]],
+                                                        bounds[[j]])[0])
+
+            result = set(zip(*tree.query_bounds(query)))
+            assert result == truth
+
+    def test_pairs(self):
+        center = g.np.random.random((300, 3))
+        bounds = g.np.stack((center, center + .05), axis=1)
+        tree = g.trimesh.bvh.BVH(bounds, leaf_size=3)
+
+        pairs = tree.query_pairs()
+        truth = [(i, j) for i in range(len(bounds))
+                 for j in range(i + 1, len(bounds))
+                 if g.trimesh.bvh.bounds_overlap(bounds[[i]],
+                                                 bounds[[j]])[0]]
+        assert len(pairs) == len(truth)
+        assert set(map(tuple, pairs.tolist())) == set(truth)
+
+    def test_mesh(self):
+        mesh = g.get_mesh('featuretype.STL')
+        tree = mesh.triangles_bvh
+        # every primitive is in exactly one leaf
+        leaf = tree.is_leaf
+        assert tree.node_count[leaf].sum() == len(mesh.faces)
+        assert (g.np.sort(tree.order) == g.np.arange(len(mesh.faces))).all()
+        # root node contains the mesh
+        assert g.np.allclose(tree.node_bounds[0], mesh.bounds)
+
+
+if __name__ == '__main__':
+    g.trimesh.util.attach_to_log()
+    g.unittest.main()
@@ -165,6 +165,295 @@ class CollisionTest(g.unittest.TestCase):
         self.assertTrue(g.np.isclose(dist, 1.0))
         self.assertTrue(names == ('cube0', 'cube4'))
 
+    def test_numpy(self):
+        # the numpy engine is always available
+        m = g.trimesh.collision.CollisionManager(engine='numpy')
+        sphere = g.trimesh.creation.icosphere(subdivisions=2)
+        box = g.trimesh.creation.box()
+
+        # rotated box with a corner poking into the sphere
+        tf = g.trimesh.transformations.rotation_matrix(
+            g.np.pi / 4, [0, 0, 1])
+        tf[:3, 3] = [1.5, 0, 0]
+        m.add_object('box', box, tf)
+
+        ret, names, contacts = m.in_collision_single(
+            sphere, return_names=True, return_data=True)
+        assert ret
+        assert names == {'box'}
+        assert len(contacts) > 0
+        for c in contacts:
+            # contact points are on the surface of both meshes
+            # in the world frame and reference faces of both
+            assert c.names == {'box', '__external'}
+            assert c.index('__external') < len(sphere.faces)
+            assert c.index('box') < len(box.faces)
+            assert g.np.linalg.norm(c.point) < 1.0 + 1e-8
+
+        # move the box away along X
+        tf[0, 3] = 3.0
+        m.set_transform('box', tf)
+        assert not m.in_collision_single(sphere)
+
+        dist, data = m.min_distance_single(sphere, return_data=True)
+        # corner of the rotated box is at 3 - sqrt(2)/2
+        truth = 3.0 - g.np.sqrt(2) / 2.0 - 1.0
+        assert abs(dist - truth) < 1e-2
+        assert g.np.isclose(dist, data.distance)
+        assert g.np.isclose(g.np.linalg.norm(
+            data.point('box') - data.point('__external')), dist)
+        assert g.np.allclose(data.point('box'),
+                             [3.0 - g.np.sqrt(2) / 2.0, 0, 0])
+
+        # compare against every pair of triangles
+        other = g.trimesh.creation.icosphere(subdivisions=1)
+        for i in range(10):
+            tf = g.trimesh.transformations.random_rotation_matrix()
+            tf[:3, 3] = g.np.random.random(3) * 4.0 - 2.0
+            dist, faces, points = g.trimesh.collision.mesh_distance(
+                sphere, g.np.eye(4), other, tf)
+            pairs = g.np.array(list(g.itertools.product(
+                range(len(sphere.faces)), range(len(other.faces)))))
+            moved = other.copy()
+            moved.apply_transform(tf)
+            hit, _ = g.trimesh.intersections.triangle_triangle(
+                sphere.triangles[pairs[:, 0]],
+                moved.triangles[pairs[:, 1]])
+            if hit.any():
+                truth = 0.0
+            else:
+                truth = g.trimesh.triangles.pair_distance(
+                    sphere.triangles[pairs[:, 0]],
+                    moved.triangles[pairs[:, 1]])[0].min()
+            assert g.np.isclose(dist, truth)
+            assert g.np.isclose(
+                g.np.linalg.norm(points[0] - points[1]), dist)
+
+            contacts, _ = g.trimesh.collision.mesh_contacts(
+                sphere, g.np.eye(4), other, tf)
+            assert len(contacts) == hit.sum()
+
+        with self.assertRaises(ValueError):
+            g.trimesh.collision.CollisionManager(engine='nope')
+
+    def test_trajectory(self):
+        try:
+            g.trimesh.collision.CollisionManager()
+        except ValueError:
+            g.log.warning('skipping collision tests, no FCL installed')
+            return
+
+        cube = g.get_mesh('unit_cube.STL')
+        m = g.trimesh.collision.CollisionManager()
+        m.add_object('cube0', cube)
+        m.add_object('cube1', cube)
+        m.add_object('cube2', cube)
+
+        # move every object in one call
+        tf = [g.np.eye(4) for i in range(3)]
+        for i, t in enumerate(tf):
+            t[:3, 3] = [i * 3.0, 0, 0]
+        m.set_transforms({'cube{}'.format(i): t for i, t in enumerate(tf)})
+        assert not m.in_collision_internal()
+        assert g.np.isclose(m.min_distance_internal(), 2.0)
+
+        # nothing changes if any name is bad
+        with self.assertRaises(ValueError):
+            m.set_transforms({'cube0': g.np.eye(4), 'nope': g.np.eye(4)})
+        assert not m.in_collision_internal()
+
+        # slide cube2 towards cube1 one unit at a time
+        trajectory = []
+        for x in [5.0, 4.0, 3.0, 2.0, 1.0]:
+            t = g.np.eye(4)
+            t[:3, 3] = [x, 0, 0]
+            trajectory.append({'cube2': t})
+
+        index, distances = m.in_collision_trajectory(
+            trajectory, return_distances=True)
+        # faces touch at x=4.0
+        assert index == 1
+        assert g.np.allclose(distances, [1.0, 0.0])
+        # the manager is left at the colliding waypoint
+        assert m.in_collision_internal()
+
+        # check against a second manager
+        n = g.trimesh.collision.CollisionManager()
+        n.add_object('wall', cube, trajectory[0]['cube2'])
+        m.remove_object('cube2')
+        moved = [{'cube1': t['cube2']} for t in trajectory[::-1]]
+        assert m.in_collision_trajectory(
+            moved[:2], other_manager=n) is None
+        assert m.in_collision_trajectory(
+            moved[2:], other_manager=n) == 1
+
+    def test_registry(self):
+        # build with a stand- in so this runs without FCL
+        registry = g.trimesh.collision.BVHRegistry(
+            size=2, build=lambda mesh: object())
+
+        a = g.trimesh.creation.box()
+        b = g.trimesh.creation.icosphere()
+        c = g.trimesh.creation.cylinder(radius=1, height=1)
+
+        model = registry.get(a)
+        # identical geometry in a different mesh shares the model
+        assert registry.get(a.copy()) is model
+        registry.get(b)
+        # touch a so b is the least recently used
+        assert registry.get(a) is model
+        registry.get(c)
+
+        assert a in registry
+        assert b not in registry
+        assert c in registry
+
+        metrics = registry.metrics
+        assert metrics['hits'] == 2
+        assert metrics['misses'] == 3
+        assert metrics['evictions'] == 1
+        assert metrics['count'] == 2
+        assert metrics['build_time'] >= 0.0
+
+        registry.clear()
+        assert len(registry) == 0
+        assert registry.metrics['hits'] == 0
+
+    def test_shared(self):
+        try:
+            import fcl
+        except ImportError:
+            return
+        box = g.trimesh.creation.box()
+        sphere = g.trimesh.creation.icosphere()
+
+        def translation(x):
+            return g.trimesh.transformations.translation_matrix([x, 0, 0])
+
+        a = g.trimesh.collision.CollisionManager()
+        a.add_object('a1', box)
+        a.add_object('a2', sphere, translation(10))
+        # a copy of the same part in one manager shares the model
+        a.add_object('a3', box.copy(), translation(-10))
+        assert a._objs['a1']['geom'] is a._objs['a3']['geom']
+
+        # the other manager uses the same models
+        b = g.trimesh.collision.CollisionManager()
+        b.add_object('b1', box, translation(11.2))
+        b.add_object('b2', sphere, translation(-20))
+        assert a._objs['a1']['geom'] is b._objs['b1']['geom']
+
+        # only the sphere of a and the box of b collide
+        for first, second in [(a, b), (b, a)]:
+            ret, names, contacts = first.in_collision_other(
+                second, return_names=True, return_data=True)
+            assert ret
+            if first is a:
+                assert names == {('a2', 'b1')}
+            else:
+                assert names == {('b1', 'a2')}
+            for c in contacts:
+                assert c.names == {'a2', 'b1'}
+                assert c.index('a2') < len(sphere.faces)
+                assert c.index('b1') < len(box.faces)
+
+        # move the box of b out of collision
+        b.set_transform('b1', translation(12))
+        dist, names, data = a.min_distance_other(
+            b, return_names=True, return_data=True)
+        assert g.np.isclose(dist, 0.5)
+        assert names == ('a2', 'b1')
+        assert g.np.isclose(data.point('b1')[0], 11.5)
+
+        # objects sharing a model in one manager are told apart
+        ret, names = a.in_collision_single(
+            box, translation(-10.5), return_names=True)
+        assert ret
+        assert names == {'a3'}
+        dist, name = a.min_distance_single(
+            box, translation(-12), return_name=True)
+        assert g.np.isclose(dist, 1.0)
+        assert name == 'a3'
+
+        a.add_object('a4', box, translation(-10.5))
+        ret, names = a.in_collision_internal(return_names=True)
+        assert names == {('a3', 'a4')}
+
+        # removing one object keeps the names of the others
+        a.remove_object('a1')
+        dist, names = a.min_distance_internal(return_names=True)
+        assert names == ('a3', 'a4')
+        assert g.np.isclose(dist, 0.0)
+
+    def test_names(self):
+        # stand-ins for the copies FCL passes to callbacks
+        class Stub(object):
+
+            def __init__(self, translation, rotation=None):
+                if rotation is None:
+                    rotation = g.np.eye(3)
+                self.translation = g.np.array(translation, dtype=g.np.float32)
+                self.rotation = g.np.array(rotation, dtype=g.np.float32)
+
+            def getTranslation(self):
+                return self.translation
+
+            def getRotation(self):
+                return self.rotation
+
+        box, sphere = object(), object()
+        managers = []
+        for objects in [{'a1': (box, [0, 0, 0]),
+                         'a2': (sphere, [10, 0, 0]),
+                         'a3': (box, [-10, 0, 0])},
+                        {'b1': (box, [11, 0, 0]),
+                         'b2': (box, [-10, 0, 0])}]:
+            m = g.trimesh.collision.CollisionManager(engine='numpy')
+            for name, (geom, translation) in objects.items():
+                m._objs[name] = {'geom': geom, 'obj': Stub(translation)}
+                m._add_name(name)
+            managers.append(m)
+        a, b = managers
+
+        # objects sharing geometry are found by their transform
+        assert a._extract_names(box, Stub([-10, 0, 0])) == ['a3']
+        assert a._extract_names(box, Stub([10, 0, 0])) == []
+        # transforms read back as float32 match float64 keys
+        assert a._extract_names(
+            box, Stub(g.np.zeros(3, dtype=g.np.float64))) == ['a1']
+
+        pairs, names = a._pair_names(
+            (sphere, box), (Stub([10, 0, 0]), Stub([-10, 0, 0])), other=a)
+        assert pairs == [('a2', 'a3')]
+        assert names == ('a2', 'a3')
+
+        # FCL may report objects of the other manager first
+        for order in [1, -1]:
+            geoms = (sphere, box)[::order]
+            objects = (Stub([10, 0, 0]), Stub([11, 0, 0]))[::order]
+            pairs, names = a._pair_names(geoms, objects, other=b)
+            assert pairs == [('a2', 'b1')]
+            assert names == ('a2', 'b1')[::order]
+
+        # coincident objects in both managers give every pair
+        pairs, names = a._pair_names(
+            (box, box), (Stub([-10, 0, 0]), Stub([-10, 0, 0])), other=b)
+        assert pairs == [('a3', 'b2'), ('a3', 'b2')]
+
+        # moving an object updates its key
+        a._remove_name('a3')
+        a._objs['a3']['obj'] = Stub([-12, 0, 0])
+        a._add_name('a3')
+        assert a._extract_names(box, Stub([-10, 0, 0])) == []
+        assert a._extract_names(box, Stub([-12, 0, 0])) == ['a3']
+
+        # an object moved without updating the manager is an error
+        with self.assertRaises(ValueError):
+            a._pair_names(
+                (box, box), (Stub([0, 0, 0]), Stub([-10, 0, 0])), other=a)
+        with self.assertRaises(ValueError):
+            a._pair_names((box, box), (Stub([5, 0, 0]), Stub([6, 0, 0])))
+
     def test_scene(self):
         try:
             import fcl
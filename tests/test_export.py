@@ -90,6 +90,26 @@ class ExportTest(g.unittest.TestCase):
         assert g.np.allclose(reconstructed.visual.vertex_colors,
                              m.visual.vertex_colors)
 
+    def test_stream(self):
+        mesh = g.get_mesh('machinist.XAML')
+        exporters = g.trimesh.io.export._mesh_exporters
+        for file_type in g.trimesh.io.export._stream_exporters:
+            export = exporters[file_type](mesh)
+            if hasattr(export, 'encode'):
+                export = export.encode('utf-8')
+
+            # writing in small chunks gives the same result
+            # native files write whole arrays so have no chunk size
+            if file_type != 'trimesh':
+                streamed = g.BytesIO()
+                exporters[file_type](mesh, file_obj=streamed, chunk=7)
+                assert streamed.getvalue() == export
+
+            # export_mesh writes to a file object directly
+            streamed = g.BytesIO()
+            mesh.export(file_obj=streamed, file_type=file_type)
+            assert streamed.getvalue() == export
+
     def test_dict(self):
         mesh = g.get_mesh('machinist.XAML')
         assert mesh.visual.kind == 'face'
@@ -116,6 +136,121 @@ class ExportTest(g.unittest.TestCase):
         assert g.np.allclose(loaded.extents / source.extents,
                              1.0)
 
+    def test_glb_instanced(self):
+        # many copies of the same mesh with different names
+        m = g.trimesh.creation.icosphere()
+        scene = g.trimesh.Scene()
+        for i in range(10):
+            scene.add_geometry(m.copy())
+        # move every node so the instances don't overlap
+        for i, node in enumerate(scene.graph.nodes_geometry):
+            scene.graph.update(frame_to=node,
+                               matrix=g.trimesh.transformations.translation_matrix(
+                                   [i * 3.0, 0, 0]))
+
+        export = scene.export(file_type='glb')
+        # writing to a file object gives the same file
+        streamed = g.BytesIO()
+        g.trimesh.io.gltf.export_glb(scene, file_obj=streamed)
+        assert streamed.getvalue() == export
+
+        # the mesh is only included once
+        header = g.trimesh.io.gltf.export_gltf(scene)
+        tree = g.json.loads(header['model.gltf'].decode('utf-8'))
+        assert len(tree['meshes']) == 1
+        assert len(tree['nodes']) == 11
+        # file is smaller than two copies of the mesh data
+        assert len(export) < (len(m.vertices) + len(m.faces)) * 12 * 2
+
+        loaded = g.trimesh.load(file_obj=g.trimesh.util.wrap_as_stream(export),
+                                file_type='glb')
+        assert len(loaded.graph.nodes_geometry) == 10
+        assert g.np.allclose(loaded.bounds, scene.bounds)
+
+    def test_glb_accessors(self):
+        gltf = g.trimesh.io.gltf
+        source = g.get_mesh('cycloidal.3DXML')
+        export = source.export(file_type='glb')
+        kwargs = gltf.load_glb(g.trimesh.util.wrap_as_stream(export))
+
+        # accessors are views of the file data rather than copies
+        for mesh in kwargs['geometry'].values():
+            assert not mesh['vertices'].flags['OWNDATA']
+            assert not mesh['faces'].flags['OWNDATA']
+
+        # positions interleaved with normals in a single view
+        data = g.np.arange(24, dtype=g.np.float32).reshape((4, 6))
+        header = {'bufferViews': [{'buffer': 0,
+                                   'byteOffset': 8,
+                                   'byteLength': 96,
+                                   'byteStride': 24}],
+                  'accessors': [{'bufferView': 0,
+                                 'componentType': 5126,
+                                 'count': 4,
+                                 'type': 'VEC3'},
+                                {'bufferView': 0,
+                                 'byteOffset': 12,
+                                 'componentType': 5126,
+                                 'count': 4,
+                                 'type': 'VEC3'}]}
+        buffers = [g.np.frombuffer(b'\x00' * 8 + data.tostring(),
+                                   dtype=g.np.uint8)]
+        assert (gltf._read_accessor(header, buffers, 0) ==
+                data[:, :3]).all()
+        assert (gltf._read_accessor(header, buffers, 1) ==
+                data[:, 3:]).all()
+
+        # an accessor running past the end of its view
+        header['accessors'][1]['count'] = 5
+        with self.assertRaises(ValueError):
+            gltf._read_accessor(header, buffers, 1)
+
+    def test_native(self):
+        binary = g.trimesh.io.binary
+        m = g.get_mesh('machinist.XAML')
+        m.metadata['note'] = 'hi'
+        # compute a cached value to be stored
+        area = m.area_faces
+
+        export = binary.export_trimesh(m, include_cache=True)
+        loaded = g.trimesh.load(g.trimesh.util.wrap_as_stream(export),
+                                file_type='trimesh')
+        assert (loaded.vertices == m.vertices).all()
+        assert (loaded.faces == m.faces).all()
+        assert (loaded.visual.face_colors == m.visual.face_colors).all()
+        assert loaded.metadata['note'] == 'hi'
+        # cached values are loaded rather than recomputed
+        assert 'area_faces' in loaded._cache
+        assert g.np.allclose(loaded.area_faces, area)
+
+        # files on disk are mapped rather than read
+        with g.tempfile.NamedTemporaryFile(suffix='.trimesh') as f:
+            m.export(file_obj=f.name)
+            loaded = g.trimesh.load(f.name)
+            base = loaded.vertices
+            while isinstance(base.base, g.np.ndarray):
+                base = base.base
+            assert isinstance(base, g.np.memmap)
+            assert (loaded.vertices == m.vertices).all()
+            # arrays are copy- on- write
+            loaded.apply_translation([1, 0, 0])
+            assert g.np.allclose(loaded.vertices, m.vertices + [1, 0, 0])
+
+        # scenes keep their geometry and transforms
+        scene = g.get_mesh('cycloidal.3DXML')
+        export = scene.export(file_type='trimesh')
+        loaded = g.trimesh.load(g.trimesh.util.wrap_as_stream(export),
+                                file_type='trimesh')
+        assert set(loaded.geometry.keys()) == set(scene.geometry.keys())
+        assert g.np.allclose(loaded.bounds, scene.bounds)
+
+        # files from a newer version are refused
+        newer = bytearray(export)
+        newer[8] = binary._version + 1
+        with self.assertRaises(ValueError):
+            g.trimesh.load(g.trimesh.util.wrap_as_stream(bytes(newer)),
+                           file_type='trimesh')
+
 
 if __name__ == '__main__':
     g.trimesh.util.attach_to_log()
@@ -56,10 +56,222 @@ class LoaderTest(g.unittest.TestCase):
         assert g.np.allclose(g.np.abs(mesh.vertex_normals).sum(axis=1),
                              1.0)
 
+    def test_obj_polygons(self):
+        # a hexagon and a quad with relative indices, mixed
+        # corner formats, groups and materials
+        text = '\n'.join(['# comment',
+                          'o hexagon',
+                          'v 1 0 0', 'v .5 .866 0', 'v -.5 .866 0',
+                          'v -1 0 0', 'v -.5 -.866 0', 'v .5 -.866 0',
+                          'vt 0 0', 'vt 1 0', 'vt 1 1',
+                          'g top',
+                          'usemtl red',
+                          '  f -6 -5 -4 -3 -2 -1',
+                          'g bottom',
+                          'usemtl blue',
+                          'f 1/1 3/2 4/3',
+                          'f\t1 2//1 3/1/1 4',
+                          'usemtl red',
+                          'f 4 5 6'])
+        loaded = g.trimesh.io.wavefront.load_wavefront(
+            g.trimesh.util.wrap_as_stream(text))
+        assert len(loaded) == 1
+        mesh = g.trimesh.Trimesh(**loaded[0])
+
+        # the hexagon and quad are split into a fan of triangles
+        assert mesh.faces.shape == (4 + 1 + 2 + 1, 3)
+        assert g.np.isclose(mesh.area, 2.598 + .866 * 3, atol=1e-3)
+        assert (mesh.faces[:4, 0] == mesh.faces[0, 0]).all()
+
+        # faces before the first group would be in group zero
+        assert (mesh.metadata['face_groups'] ==
+                [1, 1, 1, 1, 2, 2, 2, 2]).all()
+        materials = g.np.array(mesh.metadata['materials'])[
+            mesh.metadata['face_materials']]
+        assert materials.tolist() == ['red'] * 4 + ['blue'] * 3 + ['red']
+
+    def test_ply_polygons(self):
+        # a pentagon, a quad and a triangle with face colors
+        vertices = g.np.array([[0, 0, 0], [1, 0, 0], [1.5, 1, 0],
+                               [.5, 2, 0], [-.5, 1, 0], [0, -1, 0]],
+                              dtype=g.np.float32)
+        polygons = [[0, 1, 2, 3, 4], [0, 5, 1, 1], [1, 5, 2]]
+        colors = [[255, 0, 0], [0, 255, 0], [0, 0, 255]]
+        header = '\n'.join(['ply',
+                            'format {} 1.0',
+                            'element vertex 6',
+                            'property float x',
+                            'property float y',
+                            'property float z',
+                            'element face 3',
+                            'property list uchar int vertex_indices',
+                            'property uchar red',
+                            'property uchar green',
+                            'property uchar blue',
+                            'end_header\n'])
+
+        ascii = header.format('ascii')
+        ascii += '\n'.join(' '.join(str(i) for i in v) for v in vertices)
+        ascii += '\n'
+        ascii += '\n'.join(' '.join(str(i) for i in [len(p)] + p + c)
+                           for p, c in zip(polygons, colors))
+        ascii = ascii.encode('utf-8')
+        binary = header.format('binary_little_endian').encode('utf-8')
+        binary += vertices.tostring()
+        for p, c in zip(polygons, colors):
+            binary += (g.np.uint8(len(p)).tostring() +
+                       g.np.array(p, dtype='<i4').tostring() +
+                       g.np.array(c, dtype=g.np.uint8).tostring())
+
+        for data in [ascii, binary]:
+            kwargs = g.trimesh.io.ply.load_ply(
+                g.trimesh.util.wrap_as_stream(data))
+            # polygons are triangulated as fans
+            assert (kwargs['faces'] == [[0, 1, 2], [0, 2, 3], [0, 3, 4],
+                                        [0, 5, 1], [0, 1, 1],
+                                        [1, 5, 2]]).all()
+            assert (kwargs['face_colors'] ==
+                    g.np.repeat(colors, [3, 2, 1], axis=0)).all()
+            assert g.np.allclose(kwargs['vertices'], vertices)
+
+        # a binary file missing its last byte
+        with self.assertRaises(ValueError):
+            g.trimesh.io.ply.load_ply(
+                g.trimesh.util.wrap_as_stream(binary[:-1]))
+
+        # many polygons of irregular sizes
+        counts = g.np.random.choice([3, 4, 4, 5, 8], 20000)
+        rows = [g.np.uint8(c).tostring() +
+                g.np.random.randint(0, 6, c).astype('<i4').tostring() +
+                g.np.array(colors[0], dtype=g.np.uint8).tostring()
+                for c in counts]
+        raw = b''.join(rows)
+        buffer = g.np.frombuffer(raw, dtype=g.np.uint8)
+
+        def read(positions, dtype):
+            index = positions.reshape((-1, 1)) + g.np.arange(dtype.itemsize)
+            index = g.np.minimum(index, len(buffer) - 1)
+            return buffer[index].view(dtype).reshape(-1)
+
+        properties = g.trimesh.io.ply._properties(
+            {'properties': g.collections.OrderedDict(
+                [('vertex_indices', '<u1, ($LIST,)<i4'),
+                 ('red', '<u1'),
+                 ('green', '<u1'),
+                 ('blue', '<u1')])})
+        truth = g.np.append(0, g.np.cumsum([len(r) for r in rows])[:-1])
+        # check both seeds and the pointer doubling fallback
+        for sync in [64, 100000]:
+            offsets = g.trimesh.io.ply._binary_offsets(
+                read=read,
+                start=0,
+                end=len(buffer),
+                length=len(counts),
+                properties=properties,
+                sync=sync)
+            assert (offsets == truth).all()
+
+        data = (header.format('binary_little_endian').replace(
+            'element face 3', 'element face {}'.format(len(counts))).encode(
+                'utf-8') + vertices.tostring() + raw)
+        kwargs = g.trimesh.io.ply.load_ply(
+            g.trimesh.util.wrap_as_stream(data))
+        assert len(kwargs['faces']) == (counts - 2).sum()
+
     def test_stl(self):
         model = g.get_mesh('empty.stl')
         assert model.is_empty
 
+    def test_stl_binary(self):
+        m = g.get_mesh('featuretype.STL', process=False)
+        path = g.os.path.join(g.dir_models, 'featuretype.STL')
+
+        # files on disk are memory mapped
+        with open(path, 'rb') as f:
+            kwargs = g.trimesh.io.stl.load_stl(f)
+            # files in memory are read
+            f.seek(0)
+            loaded = g.trimesh.io.stl.load_stl(
+                g.trimesh.util.wrap_as_stream(f.read()))
+
+        for r in [kwargs, loaded]:
+            # vertices are merged while loading
+            assert len(r['vertices']) < len(r['faces']) * 3
+            assert g.np.allclose(r['vertices'][r['faces']],
+                                 m.triangles, atol=1e-5)
+            assert g.np.allclose(r['face_normals'],
+                                 m.face_normals, atol=1e-5)
+
+        # without processing binary and ASCII files are a triangle soup
+        ascii = g.trimesh.load(g.trimesh.util.wrap_as_stream(
+            g.trimesh.io.stl.export_stl_ascii(m)),
+            file_type='stl',
+            process=False)
+        for r in [m, ascii]:
+            assert len(r.vertices) == len(r.faces) * 3
+            assert (r.faces.ravel() == g.np.arange(len(r.vertices))).all()
+        assert g.np.allclose(m.vertices, ascii.vertices, atol=1e-5)
+
+        # merging in chunks matches merging at once
+        triangles = m.triangles.astype(g.np.float32)
+        a = g.trimesh.io.stl._merge_triangles(triangles)
+        b = g.trimesh.io.stl._merge_triangles(triangles, chunk=7)
+        assert g.np.allclose(a[0], b[0])
+        assert (a[1] == b[1]).all()
+
+    def test_stl_ascii(self):
+        m = g.get_mesh('featuretype.STL')
+        export = g.trimesh.io.stl.export_stl_ascii(m)
+
+        # multiple solids with names and mixed case
+        first = export.replace('solid \n', 'solid part 1.0 2\n')
+        second = export.replace('solid \n', 'SOLID other\n').replace(
+            'endsolid', 'endsolid other 3').upper()
+        loaded = g.trimesh.io.stl.load_stl(g.trimesh.util.wrap_as_stream(
+            first + '\n' + second))
+
+        assert len(loaded['faces']) == len(m.faces) * 2
+        assert g.np.allclose(loaded['vertices'].reshape((-1, 3, 3)),
+                             g.np.vstack((m.triangles, m.triangles)))
+        assert g.np.allclose(loaded['face_normals'],
+                             g.np.vstack((m.face_normals, m.face_normals)))
+
+        # a facet missing a vertex
+        broken = export.replace('vertex', 'bad', 1)
+        with self.assertRaises(g.trimesh.io.stl.HeaderError):
+            g.trimesh.io.stl.load_stl_ascii(
+                g.trimesh.util.wrap_as_stream(broken))
+
+    def test_stl_iterate(self):
+        m = g.get_mesh('featuretype.STL')
+        stl = g.trimesh.io.stl
+        for export in [stl.export_stl(m),
+                       stl.export_stl_ascii(m).encode('utf-8')]:
+            for chunk in [1, 100, len(m.faces) * 2]:
+                batches = list(stl.iterate_stl(
+                    g.trimesh.util.wrap_as_stream(export), chunk=chunk))
+                sizes = [len(b['triangles']) for b in batches]
+                # every batch but the last is full
+                assert all(i == chunk for i in sizes[:-1])
+                assert sum(sizes) == len(m.faces)
+                assert [b['start'] for b in batches] == list(
+                    g.np.cumsum([0] + sizes[:-1]))
+
+                triangles = g.np.vstack([b['triangles'] for b in batches])
+                normals = g.np.vstack([b['face_normals'] for b in batches])
+                assert g.np.allclose(triangles, m.triangles, atol=1e-5)
+                assert g.np.allclose(normals, m.face_normals, atol=1e-5)
+                # bounds are running bounds of every face so far
+                assert g.np.allclose(batches[-1]['bounds'], m.bounds,
+                                     atol=1e-5)
+
+        # ASCII faces split across blocks of the file
+        export = stl.export_stl_ascii(m).encode('utf-8')
+        for block in [1, 33]:
+            triangles = g.np.vstack([t for n, t in stl._iterate_ascii(
+                g.trimesh.util.wrap_as_stream(export), 50, block=block)])
+            assert g.np.allclose(triangles, m.triangles, atol=1e-5)
+
     def test_3MF(self):
         # an assembly with instancing
         s = g.get_mesh('counterXP.3MF')
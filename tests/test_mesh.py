@@ -83,6 +83,56 @@ class MeshTests(g.unittest.TestCase):
             for n in neighs:
                 self.assertTrue(([v_i, n] in elist or [n, v_i] in elist))
 
+    def test_self_intersections(self):
+        # a clean sphere doesn't intersect itself
+        m = g.trimesh.creation.icosphere(subdivisions=3)
+        assert len(m.self_intersections()) == 0
+
+        # two overlapping spheres meet on a circle
+        other = m.copy()
+        other.apply_translation([1.0, 0, 0])
+        c = g.trimesh.util.concatenate(m, other)
+        pairs, segments = c.self_intersections(return_segments=True)
+        assert len(pairs) > 0
+        assert len(pairs) == len(segments)
+        # every pair has one face from each sphere
+        assert ((pairs < len(m.faces)).sum(axis=1) == 1).all()
+        # the segments are on the plane between the spheres
+        assert g.np.allclose(segments[:, :, 0], 0.5, atol=1e-2)
+
+        # compare against checking every pair of faces
+        small = g.trimesh.creation.icosphere(subdivisions=1)
+        other = small.copy()
+        other.apply_transform(
+            g.trimesh.transformations.random_rotation_matrix())
+        other.apply_translation([.5, .2, .1])
+        c = g.trimesh.util.concatenate(small, other)
+        a, b = g.np.triu_indices(len(c.faces), 1)
+        shared = (c.faces[a].reshape((-1, 3, 1)) ==
+                  c.faces[b].reshape((-1, 1, 3))).any(axis=(1, 2))
+        hit, _ = g.trimesh.intersections.triangle_triangle(
+            c.triangles[a], c.triangles[b])
+        hit &= ~shared
+        truth = g.np.column_stack((a[hit], b[hit]))
+        assert g.np.allclose(c.self_intersections(), truth)
+
+        # faces around one vertex which fold through each other
+        vertices = [[0, 0, 0],
+                    [1, 0, 0], [0, 1, 0],
+                    # passes through the middle of face 0
+                    [.3, .3, 1], [.3, .3, -1],
+                    # only touches the others at the shared vertex
+                    [-1, 0, .5], [0, -1, .5],
+                    # flat inside face 0
+                    [.5, .2, 0], [.2, .5, 0]]
+        faces = [[0, 1, 2], [0, 3, 4], [0, 5, 6], [0, 7, 8]]
+        fan = g.trimesh.Trimesh(vertices=vertices,
+                                faces=faces,
+                                process=False)
+        pairs, segments = fan.self_intersections(return_segments=True)
+        pairs = set(tuple(sorted(p)) for p in pairs)
+        assert pairs == set([(0, 1), (0, 3), (1, 3)])
+
 
 if __name__ == '__main__':
     g.trimesh.util.attach_to_log()
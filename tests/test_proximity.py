@@ -30,6 +30,164 @@ class NearestTest(g.unittest.TestCase):
         vector = g.trimesh.util.diagonal_dot(closest, points / 2.0)
         self.assertTrue((g.np.abs(vector - 1.0) < .01).all())
 
+    def test_tree(self):
+        # the tree traversal should match checking every triangle
+        for mesh in g.get_meshes(3):
+            points = ((g.np.random.random((50, 3)) - .5) *
+                      mesh.scale * 2) + mesh.centroid
+
+            naive = g.trimesh.proximity.closest_point_naive(mesh, points)
+            tree = g.trimesh.proximity.closest_point(mesh, points, chunk=7)
+
+            self.assertTrue(g.np.allclose(naive[1], tree[1]))
+            self.assertTrue((tree[2] >= 0).all())
+
+    def test_unreferenced(self):
+        # a vertex not used by any face is closer than the surface
+        box = g.trimesh.creation.box()
+        mesh = g.trimesh.Trimesh(
+            vertices=g.np.vstack((box.vertices, [0, 0, 5])),
+            faces=box.faces,
+            process=False)
+        closest, distance, tid = mesh.nearest.on_surface([[0, 0, 4.9]])
+        self.assertTrue(g.np.allclose(distance, 4.4))
+        self.assertTrue(g.np.allclose(closest, [[0, 0, .5]]))
+        self.assertTrue((tid >= 0).all())
+
+        # the stray vertex isn't part of the surface
+        signed = mesh.nearest.signed_distance([[0, 0, 4.9]])
+        self.assertTrue(g.np.allclose(signed, -4.4))
+        within = mesh.nearest.within_distance([[0, 0, 4.9]], 1.0)
+        self.assertFalse(within.any())
+
+        # the tree of referenced vertices is shared by identical meshes
+        tree = mesh.kdtree_referenced
+        assert tree.n == len(box.vertices)
+        assert mesh.copy().kdtree_referenced is tree
+        # and is the full tree when every vertex is referenced
+        assert box.kdtree_referenced is box.kdtree
+
+    def test_distance_grid(self):
+        sphere = g.trimesh.primitives.Sphere(subdivisions=3)
+        sphere = g.trimesh.Trimesh(vertices=sphere.vertices,
+                                   faces=sphere.faces)
+        grid = sphere.nearest.signed_distance_grid(resolution=32)
+        # grid should be cached
+        self.assertTrue(
+            sphere.nearest.signed_distance_grid(resolution=32) is grid)
+
+        points = (g.np.random.random((1000, 3)) - .5) * 2.4
+        truth = 1.0 - g.np.linalg.norm(points, axis=1)
+        distance = grid.distance(points)
+        self.assertTrue(g.np.abs(distance - truth).max() < grid.pitch)
+
+        # away from the surface the gradient points inwards
+        far = g.np.abs(truth) > .25
+        gradient = g.trimesh.util.unitize(grid.gradient(points[far]))
+        radial = -g.trimesh.util.unitize(points[far])
+        dot = g.trimesh.util.diagonal_dot(gradient, radial)
+        self.assertTrue(dot.min() > .8)
+
+        # near the surface queries should be exact
+        exact = sphere.nearest.signed_distance_grid(resolution=32,
+                                                    exact=.1)
+        near = g.np.abs(truth) < .05
+        self.assertTrue(g.np.allclose(
+            exact.distance(points[near]),
+            sphere.nearest.signed_distance(points[near])))
+
+        # narrow band grids clamp far values and survive a round trip
+        band = sphere.nearest.signed_distance_grid(resolution=32,
+                                                   band=.2)
+        self.assertTrue(g.np.abs(band.values).max() <= .2 + 1e-9)
+        file_obj = g.trimesh.util.BytesIO()
+        band.export(file_obj)
+        file_obj.seek(0)
+        loaded = g.trimesh.proximity.load_signed_distance_grid(file_obj)
+        self.assertTrue(g.np.allclose(loaded.values, band.values))
+        self.assertTrue(g.np.isclose(loaded.band, .2))
+        # without a mesh only points outside the grid differ
+        inside = g.trimesh.bounds.contains(band.bounds, points)
+        self.assertTrue(g.np.allclose(loaded.distance(points[inside]),
+                                      band.distance(points[inside])))
+
+    def test_hausdorff(self):
+        a = g.trimesh.creation.box()
+        b = g.trimesh.creation.box()
+        b.apply_translation([.3, 0, 0])
+
+        distance = g.trimesh.proximity.hausdorff_distance(a, b)
+        self.assertTrue(g.np.isclose(distance, .3))
+        # a single face of the box is on the box but not the other way
+        c = a.submesh([[0, 1]], append=True)
+        one = g.trimesh.proximity.hausdorff_distance(c, a, symmetric=False)
+        self.assertTrue(one < g.tol.merge)
+        self.assertTrue(g.trimesh.proximity.hausdorff_distance(a, c) > .5)
+
+        # stopping early still reports a violated tolerance
+        early = g.trimesh.proximity.hausdorff_distance(a, b, tolerance=.1)
+        self.assertTrue(early > .1)
+
+        deviation = g.trimesh.proximity.surface_deviation(a, a)
+        self.assertTrue(deviation['max'] < g.tol.merge)
+        deviation = g.trimesh.proximity.surface_deviation(a, b)
+        self.assertTrue(deviation['max'] <= distance + g.tol.merge)
+        self.assertTrue(0.0 < deviation['mean'] <= deviation['rms'])
+
+    def test_approximate(self):
+        for mesh in g.get_meshes(3):
+            surface = mesh.sample(500)
+            points = g.np.vstack((
+                surface + (g.np.random.random((500, 3)) - .5) * mesh.scale / 20,
+                (g.np.random.random((200, 3)) - .5) * mesh.scale * 4))
+            exact = mesh.nearest.on_surface(points)[1]
+
+            error = mesh.scale / 500.0
+            closest, distance, tid = mesh.nearest.on_surface_approximate(
+                points, error=error)
+            # results are real points on the reported triangles
+            self.assertTrue(g.np.allclose(
+                g.np.linalg.norm(closest - points, axis=1), distance))
+            self.assertTrue(g.np.allclose(
+                g.trimesh.triangles.closest_point(mesh.triangles[tid],
+                                                  points), closest))
+            # never closer than the exact answer and within the bound
+            bound = g.np.maximum(error, exact * 1e-3)
+            self.assertTrue((distance >= exact - g.tol.merge).all())
+            self.assertTrue((distance <= exact + bound + g.tol.merge).all())
+
+    def test_max_distance(self):
+        mesh = g.get_mesh('featuretype.STL')
+        points = ((g.np.random.random((500, 3)) - .5) *
+                  mesh.scale * 2) + mesh.centroid
+        limit = mesh.scale / 20.0
+
+        closest, distance, tid = mesh.nearest.on_surface(points)
+        near = distance <= limit
+
+        c, d, t = mesh.nearest.on_surface(points, max_distance=limit)
+        self.assertTrue(g.np.allclose(d[near], distance[near]))
+        self.assertTrue(g.np.allclose(c[near], closest[near]))
+        far = distance > limit + g.tol.merge
+        self.assertTrue(g.np.isinf(d[far]).all())
+        self.assertTrue((t[far] == -1).all())
+        self.assertTrue(g.np.isnan(c[far]).all())
+
+        within = mesh.nearest.within_distance(points, limit)
+        self.assertTrue((within == near).all())
+
+        vd, vi = mesh.nearest.vertex(points, max_distance=limit)
+        vertex = mesh.nearest.vertex(points)[0] <= limit
+        self.assertTrue(((vi >= 0) == vertex).all())
+        self.assertTrue(g.np.isinf(vd[~vertex]).all())
+
+        signed = mesh.nearest.signed_distance(points,
+                                              contains_engine='winding',
+                                              max_distance=limit)
+        self.assertTrue(g.np.isnan(signed[far]).all())
+        self.assertTrue(g.np.allclose(g.np.abs(signed[near]),
+                                      distance[near]))
+
     def test_helper(self):
         # just make sure the plumbing returns something
         for mesh in g.get_meshes(2):
@@ -1,5 +1,7 @@
 import generic as g
 
+from trimesh.ray import ray_render
+
 
 class RayTests(g.unittest.TestCase):
 
@@ -135,6 +137,93 @@ class RayTests(g.unittest.TestCase):
                                                                      multiple_hits=True)
             assert len(g.np.unique(index_triangles)) > 2
 
+    def test_no_rays(self):
+        empty = g.np.zeros((0, 3))
+        mesh = g.trimesh.primitives.Box(use_embree=True)
+        if 'embree' in mesh.ray.__module__:
+            for multiple_hits in [True, False]:
+                index_tri, index_ray = mesh.ray.intersects_id(
+                    empty, empty, multiple_hits=multiple_hits)
+                assert len(index_tri) == 0
+                assert len(index_ray) == 0
+            locations, index_ray, index_tri = mesh.ray.intersects_location(
+                empty, empty)
+            assert len(locations) == 0
+            assert len(index_ray) == 0
+
+    def test_thin_walls(self):
+        # two plates much thinner than the default ray offset
+        plate = g.trimesh.creation.box(extents=[1, 1, 1e-4])
+        other = plate.copy()
+        other.apply_translation([0, 0, 2e-4])
+        thin = plate + other
+
+        origins = (g.np.random.random((100, 3)) - .5) * .8
+        origins[:, 2] = -3
+        directions = g.np.tile([0, 0, 1], (len(origins), 1))
+
+        for use_embree in [True, False]:
+            mesh = g.trimesh.Trimesh(vertices=thin.vertices,
+                                     faces=thin.faces,
+                                     use_embree=use_embree)
+            locations, index_ray, index_tri = mesh.ray.intersects_location(
+                origins, directions)
+            # every wall of both plates should be hit exactly once
+            assert (g.np.bincount(index_ray, minlength=len(origins)) == 4).all()
+
+    def test_render(self):
+        resolution = (64, 48)
+        for use_embree in [True, False]:
+            sphere = g.trimesh.creation.icosphere()
+            if not use_embree:
+                sphere.ray = g.trimesh.ray.ray_triangle.RayMeshIntersector(
+                    sphere)
+
+            tic = g.time.time()
+            rendered = ray_render.render(sphere, resolution=resolution)
+            rps = g.np.product(resolution) / (g.time.time() - tic)
+            g.log.info('Rendered %f rays/second with %s',
+                       rps,
+                       sphere.ray.__class__.__module__)
+
+            depth = rendered['depth']
+            assert depth.shape == resolution[::-1]
+            assert rendered['normal'].shape == resolution[::-1] + (3,)
+
+            # default camera looks at the center of the sphere
+            # from 1.35 times the distance set by the field of view
+            distance = 1.35 / g.np.tan(g.np.radians(30.0))
+            assert g.np.isclose(depth[24, 32], distance - 1.0, atol=.02)
+            # corners should miss the sphere
+            assert not g.np.isfinite(depth[0, 0])
+            assert rendered['face'][0, 0] == -1
+
+            # normals of hit pixels should face the camera
+            hit = rendered['face'] >= 0
+            assert (rendered['normal'][hit][:, 2] > 0.0).all()
+
+            ortho = ray_render.render(sphere,
+                                      resolution=resolution,
+                                      orthographic=True)
+            assert g.np.isclose(ortho['depth'][24, 32], distance - 1.0,
+                                atol=.02)
+
+    def test_render_scene(self):
+        box = g.trimesh.creation.box()
+        sphere = g.trimesh.creation.icosphere()
+        sphere.apply_translation([3, 0, 0])
+        scene = g.trimesh.Scene([box, sphere])
+
+        rendered = ray_render.render(scene, resolution=(80, 60))
+        names, count = g.np.unique(rendered['node'], return_counts=True)
+        # both nodes and the background should be visible
+        assert len(names) == 3
+        assert len(rendered['nodes']) == 2
+        # face indexes refer to the geometry of each node
+        hit = rendered['node'] >= 0
+        assert rendered['face'][rendered['node'] == 0].max() < len(box.faces)
+        assert (rendered['face'][hit] >= 0).all()
+
 
 if __name__ == '__main__':
     g.trimesh.util.attach_to_log()
@@ -17,6 +17,22 @@ class SampleTest(g.unittest.TestCase):
         distance = m.nearest.signed_distance(even)
         assert (g.np.abs(distance) < g.trimesh.tol.merge).all()
 
+    def test_cover(self):
+        m = g.get_mesh('featuretype.STL')
+        radius = m.scale / 50.0
+        cover, index = g.trimesh.sample.sample_surface_cover(m, radius)
+        self.assertTrue(len(cover) == len(index))
+
+        # every sample is on the face it came from
+        distance = g.np.linalg.norm(g.trimesh.triangles.closest_point(
+            m.triangles[index], cover) - cover, axis=1)
+        self.assertTrue((distance < g.trimesh.tol.merge).all())
+
+        # every point on the surface is within radius of a sample
+        samples = m.sample(1000)
+        tree = g.trimesh.base.KDTree(cover)
+        self.assertTrue((tree.query(samples)[0] <= radius).all())
+
 
 if __name__ == '__main__':
     g.trimesh.util.attach_to_log()
@@ -121,6 +121,33 @@ class SceneTests(g.unittest.TestCase):
         n = s.duplicate_nodes
         assert len(n) == 0
 
+    def test_overlapping(self):
+        s = g.get_mesh('cycloidal.3DXML')
+        nodes = s.graph.nodes_geometry
+
+        # compare against the box around transformed corners
+        for node, bounds in zip(nodes, s.bounds_nodes):
+            transform, geometry = s.graph[node]
+            corners = g.trimesh.transformations.transform_points(
+                g.trimesh.bounds.corners(s.geometry[geometry].bounds),
+                transform)
+            assert g.np.allclose(bounds, [corners.min(axis=0),
+                                          corners.max(axis=0)])
+        assert g.np.allclose(s.bounds_nodes[:, 0].min(axis=0),
+                             s.bounds[0])
+
+        # compare against checking every pair of nodes
+        for distance in [0.0, s.scale / 10.0]:
+            pairs = s.overlapping_nodes(distance=distance)
+            truth = set()
+            for a, b in g.itertools.combinations(range(len(nodes)), 2):
+                box_a, box_b = s.bounds_nodes[a], s.bounds_nodes[b]
+                if ((box_a[0] <= box_b[1] + distance).all() and
+                        (box_b[0] <= box_a[1] + distance).all()):
+                    truth.add(frozenset((nodes[a], nodes[b])))
+            assert set(frozenset(p) for p in pairs) == truth
+            assert len(pairs) == len(truth)
+
 
 class GraphTests(g.unittest.TestCase):
 
@@ -129,6 +156,20 @@ class GraphTests(g.unittest.TestCase):
         for i in range(5000):
             g.add_edge(random_chr(), random_chr())
 
+    def test_cache_transforms(self):
+        s = g.get_mesh('cycloidal.3DXML')
+        # transforms found from a path to each node
+        expected = {n: s.graph.get(n) for n in s.graph.nodes}
+
+        # transforms found in a single pass over the tree
+        s.graph._cache.clear()
+        s.graph._cache_transforms()
+        assert len(s.graph._cache) == len(expected)
+        for node, (transform, geometry) in expected.items():
+            cached = s.graph._cache[s.graph.base_frame + ':' + str(node)]
+            assert g.np.allclose(cached[0], transform)
+            assert cached[1] == geometry
+
 
 if __name__ == '__main__':
     g.trimesh.util.attach_to_log()
@@ -32,6 +32,30 @@ class TrianglesTest(g.unittest.TestCase):
         self.assertTrue((comparison < 1e-8).all())
         g.log.info('finished closest check on %d triangles', len(closest))
 
+    def test_closest_regions(self):
+        # points past a vertex but beside an edge should land on the edge
+        triangles = g.np.random.random((1000, 3, 3))
+        points = (g.np.random.random((1000, 3)) - .5) * 4
+        closest = g.trimesh.triangles.closest_point(triangles=triangles,
+                                                    points=points)
+        distance = g.np.linalg.norm(closest - points, axis=1)
+
+        # compare against dense samples of every triangle
+        weights = g.np.random.random((2000, 2))
+        flip = weights.sum(axis=1) > 1.0
+        weights[flip] = 1.0 - weights[flip]
+        weights = g.np.column_stack((1.0 - weights.sum(axis=1), weights))
+        weights = g.np.vstack((weights, g.np.eye(3)))
+        samples = g.np.einsum('sk,tkd->tsd', weights, triangles)
+        brute = g.np.linalg.norm(samples - points.reshape((-1, 1, 3)),
+                                 axis=2).min(axis=1)
+        self.assertTrue((distance <= brute + 1e-10).all())
+
+        # results should be on the triangles
+        barycentric = g.trimesh.triangles.points_to_barycentric(
+            triangles, closest)
+        self.assertTrue((barycentric > -1e-8).all())
+
     def test_degenerate(self):
         tri = [[[0, 0, 0],
                 [1, 0, 0],
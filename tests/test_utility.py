@@ -124,6 +124,27 @@ class UtilTests(unittest.TestCase):
                 tree = g.trimesh.util.bounds_tree(bounds)
                 self.assertTrue(0 in tree.intersection(bounds[0]))
 
+    def test_registry(self):
+        mesh = g.trimesh.creation.icosphere()
+        copied = mesh.copy()
+
+        # identical geometry should share acceleration structures
+        assert mesh.triangles_tree is copied.triangles_tree
+        assert mesh.triangles_bvh is copied.triangles_bvh
+        assert mesh.kdtree is copied.kdtree
+
+        # changed geometry should get its own structure
+        copied.apply_translation([1, 0, 0])
+        assert mesh.kdtree is not copied.kdtree
+
+        key = ('kdtree', copied.md5())
+        assert key in g.trimesh.util.registry
+        # entries are only weakly referenced
+        del copied
+        import gc
+        gc.collect()
+        assert key not in g.trimesh.util.registry
+
     def test_strips(self):
         '''
         Test our conversion of triangle strips to face indexes.
@@ -183,6 +204,19 @@ class UtilTests(unittest.TestCase):
         # make sure all pairs are length 2
         assert all(len(i) == 2 for i in pa)
 
+    def test_array_to_string(self):
+        a = np.arange(6).reshape((-1, 2))
+        assert g.trimesh.util.array_to_string(a) == '0 1\n2 3\n4 5'
+        # values repeated in the format and literal percent signs
+        r = g.trimesh.util.array_to_string(a[:2],
+                                           col_delim='%',
+                                           row_delim='\n% ',
+                                           value_format='{}/{}')
+        assert r == '0/0%1/1\n% 2/2%3/3'
+        # floats have the requested number of digits
+        r = g.trimesh.util.array_to_string([0.5, 1.0 / 3.0], digits=3)
+        assert r == '0.500 0.333'
+
 
 class IOTest(unittest.TestCase):
 
@@ -51,6 +51,28 @@ class VoxelTest(g.unittest.TestCase):
                        m.volume,
                        v.volume)
 
+    def test_occupancy(self):
+        for m in [g.get_mesh('featuretype.STL'),
+                  g.get_mesh('7_8ths_cube.stl'),
+                  g.trimesh.primitives.Box()]:
+            grid = m.occupancy_grid(resolution=32, engine='winding')
+            # the grid is cached on the mesh
+            assert grid is m.occupancy_grid(resolution=32, engine='winding')
+
+            cells = g.np.bincount(grid.cells.ravel(), minlength=3)
+            assert (cells > 0).all()
+
+            # every point on the surface is in a boundary cell
+            samples = m.sample(1000)
+            index = g.np.floor((samples - grid.origin) / grid.pitch)
+            state = grid.cells[tuple(index.astype(int).T)]
+            assert (state == grid.boundary).all()
+
+            points = (g.np.random.random((1000, 3)) - .5) * m.extents * 1.5
+            points += m.bounds.mean(axis=0)
+            assert (grid.contains_points(points) ==
+                    m.contains(points, engine='winding')).all()
+
 
 if __name__ == '__main__':
     g.trimesh.util.attach_to_log()
@@ -0,0 +1,52 @@
+import generic as g
+
+
+class WindingTest(g.unittest.TestCase):
+
+    def test_contains(self):
+        for mesh in [g.get_mesh('unit_cube.STL'),
+                     g.get_mesh('7_8ths_cube.stl'),
+                     g.trimesh.creation.icosphere()]:
+            points = (g.np.random.random((1000, 3)) - .5) * mesh.extents * 1.5
+            points += mesh.bounds.mean(axis=0)
+
+            # only compare points which aren't right on the surface
+            distance = mesh.nearest.on_surface(points)[1]
+            points = points[distance > mesh.scale * 1e-3]
+
+            ray = mesh.contains(points)
+            winding = mesh.contains(points, engine='winding')
+            assert (ray == winding).all()
+
+            # far away nodes are approximated so the winding
+            # number should be close to but not exactly 0 or 1
+            number = mesh.winding.number(points)
+            assert g.np.allclose(number[winding], 1.0, atol=.05)
+            assert g.np.allclose(number[~winding], 0.0, atol=.05)
+
+    def test_holes(self):
+        sphere = g.trimesh.creation.icosphere(subdivisions=3)
+        # remove a few faces to open small holes
+        sphere.update_faces(g.np.arange(len(sphere.faces)) > 3)
+        assert not sphere.is_watertight
+
+        points = (g.np.random.random((2000, 3)) - .5) * 2.2
+        radius = g.np.linalg.norm(points, axis=1)
+        # avoid points near the faceted surface
+        points = points[g.np.abs(radius - 1.0) > .05]
+        truth = g.np.linalg.norm(points, axis=1) < 1.0
+
+        contains = sphere.contains(points, engine='winding')
+        assert (contains == truth).all()
+
+    def test_solid_angle(self):
+        # a closed surface subtends 4 pi steradians from inside
+        mesh = g.trimesh.creation.box()
+        points = g.np.tile([.1, .2, -.1], (len(mesh.faces), 1))
+        angle = g.trimesh.winding.solid_angle(mesh.triangles, points)
+        assert g.np.isclose(angle.sum(), 4 * g.np.pi)
+
+
+if __name__ == '__main__':
+    g.trimesh.util.attach_to_log()
+    g.unittest.main()
@@ -19,10 +19,12 @@ from . import sample
 from . import repair
 from . import convex
 from . import remesh
+from . import bvh
 from . import bounds
 from . import inertia
 from . import nsphere
 from . import boolean
+from . import winding
 from . import grouping
 from . import geometry
 from . import permutate
@@ -40,6 +42,18 @@ from .ray import ray_triangle
 from .constants import log, _log_time, tol
 from .scene import Scene
 
+try:
+    from scipy.spatial import cKDTree
+
+    class KDTree(cKDTree):
+        """
+        A cKDTree which supports weak references, so it can be
+        shared between identical meshes with util.registry.
+        """
+        pass
+except ImportError:
+    log.warning('Scipy unavailable')
+
 
 class Trimesh(object):
 
@@ -103,7 +117,6 @@ class Trimesh(object):
         # In order to maintain consistency
         # the cache is cleared when self._data.crc() changes
         self._cache = util.Cache(id_function=self._data.crc)
-        self._cache.update(initial_cache)
 
         # if validate we are allowed to alter the mesh silently
         # to ensure valid results
@@ -138,6 +151,10 @@ class Trimesh(object):
         if vertex_normals is not None:
             self.vertex_normals = vertex_normals
 
+        # add the passed values to the cache after the data is set
+        # otherwise they would be cleared as soon as it changed
+        self._cache.update(initial_cache)
+
         # create a ray-mesh query object for the current mesh
         # initializing is very inexpensive and object is convenient to have.
         # On first query expensive bookkeeping is done (creation of r-tree),
@@ -159,6 +176,9 @@ class Trimesh(object):
         # convience class for nearest point queries
         self.nearest = proximity.ProximityQuery(self)
 
+        # convience class for generalized winding number queries
+        self.winding = winding.WindingQuery(self)
+
         # store metadata about the mesh in a dictionary
         self.metadata = dict()
         # update the mesh metadata with passed metadata
@@ -754,9 +774,26 @@ class Trimesh(object):
         ----------
         tree: rtree.index where each triangle in self.faces has a rectangular cell
         """
-        tree = triangles.bounds_tree(self.triangles)
+        tree = util.registry.get(
+            ('triangles_tree', self.md5()),
+            lambda: triangles.bounds_tree(self.triangles))
         return tree
 
+    @util.cache_decorator
+    def triangles_bvh(self):
+        """
+        A bounding volume hierarchy of the bounds of each face,
+        stored as flat numpy arrays for batched queries.
+
+        Returns
+        ----------
+        bvh: trimesh.bvh.BVH object containing every triangle
+        """
+        hierarchy = util.registry.get(
+            ('triangles_bvh', self.md5()),
+            lambda: bvh.triangles_bvh(self.triangles))
+        return hierarchy
+
     @util.cache_decorator
     def triangles_center(self):
         """
@@ -1341,15 +1378,36 @@ class Trimesh(object):
     def kdtree(self):
         """
         Return a scipy.spatial.cKDTree of the vertices of the mesh.
-        Not cached as this lead to observed memory issues and segfaults.
+        Trees are shared between meshes with identical geometry.
 
         Returns
         ---------
         tree: scipy.spatial.cKDTree containing mesh vertices
         """
+        tree = util.registry.get(
+            ('kdtree', self.md5()),
+            lambda: KDTree(self.vertices.view(np.ndarray)))
+        return tree
 
-        from scipy.spatial import cKDTree as KDTree
-        tree = KDTree(self.vertices.view(np.ndarray))
+    @util.cache_decorator
+    def kdtree_referenced(self):
+        """
+        Return a scipy.spatial.cKDTree of the vertices referenced by
+        faces, which unlike self.kdtree never gives a distance closer
+        than the surface. Indexes returned by queries are of vertices
+        referenced by faces, not of self.vertices.
+
+        Returns
+        ---------
+        tree: scipy.spatial.cKDTree containing referenced vertices
+        """
+        referenced = np.unique(self.faces.view(np.ndarray).reshape(-1))
+        if len(referenced) == len(self.vertices):
+            # every vertex is on the surface
+            return self.kdtree
+        tree = util.registry.get(
+            ('kdtree_referenced', self.md5()),
+            lambda: KDTree(self.vertices.view(np.ndarray)[referenced]))
         return tree
 
     def remove_degenerate_faces(self, height=tol.merge):
@@ -2084,7 +2142,27 @@ class Trimesh(object):
                                       engine=engine)
         return result
 
-    def contains(self, points):
+    def self_intersections(self, return_segments=False):
+        """
+        Find pairs of faces which intersect each other, ignoring
+        faces which share an edge, and faces which share a vertex
+        but touch nowhere else.
+
+        Parameters
+        ---------
+        return_segments: bool, if True return where faces intersect
+
+        Returns
+        ---------
+        pairs:    (n,2) int, index of faces which intersect
+        segments: (n,2,3) float, only returned if return_segments,
+                  the line segment shared by each pair of faces
+        """
+        result = intersections.mesh_self(self,
+                                         return_segments=return_segments)
+        return result
+
+    def contains(self, points, engine=None):
         """
         Given a set of points, determine whether or not they are inside the mesh.
         This raises an error if called on a non- watertight mesh.
@@ -2092,16 +2170,59 @@ class Trimesh(object):
         Parameters
         ---------
         points: (n,3) set of points in space
+        engine: str, which method to use:
+                     None or 'ray': count ray hits with self.ray
+                     'winding':     generalized winding number, which
+                                    is robust to small holes
+                     'grid':        answer from self.occupancy_grid()
+                                    and only check points near the surface
 
         Returns
         ---------
         contains: (n) boolean array, whether or not a point is inside the mesh
         """
-        if not self.is_watertight:
-            log.warning('Mesh is non- watertight for contained point query!')
-        contains = self.ray.contains_points(points)
+        if engine in [None, 'ray']:
+            if not self.is_watertight:
+                log.warning(
+                    'Mesh is non- watertight for contained point query!')
+            contains = self.ray.contains_points(points)
+        elif engine == 'winding':
+            contains = self.winding.contains_points(points)
+        elif engine == 'grid':
+            contains = self.occupancy_grid().contains_points(points)
+        else:
+            raise ValueError('contains engine {} not available!'.format(
+                engine))
         return contains
 
+    def occupancy_grid(self, pitch=None, resolution=64, engine=None):
+        """
+        A cached grid classifying cells as inside, outside, or on the
+        surface of the mesh, for fast repeated contains queries.
+
+        The grid is computed on first query and kept until the mesh
+        changes, and each combination of arguments is cached separately.
+
+        Parameters
+        ---------
+        pitch:      float, edge length of a cell
+        resolution: int, if pitch is None cells along the longest side
+        engine:     str, contains engine for points in boundary cells
+
+        Returns
+        ---------
+        grid: trimesh.voxel.OccupancyGrid object
+        """
+        key = 'occupancy_grid_{}_{}_{}'.format(pitch, resolution, engine)
+        if key in self._cache:
+            return self._cache[key]
+        grid = voxel.OccupancyGrid(self,
+                                   pitch=pitch,
+                                   resolution=resolution,
+                                   engine=engine)
+        self._cache[key] = grid
+        return grid
+
     def copy(self):
         """
         Safely get a copy of the current mesh.
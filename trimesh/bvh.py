@@ -0,0 +1,554 @@
+"""
+bvh.py
+-------------
+
+A bounding volume hierarchy stored as flat numpy arrays.
+
+Construction splits every node of a level at once, and queries are
+evaluated on a frontier of (query, node) pairs so that batches of
+queries descend the tree together without per- node Python loops.
+"""
+import numpy as np
+
+from . import util
+
+
+class BVH(object):
+    """
+    A binary hierarchy of axis aligned bounding boxes.
+
+    Node 0 is the root, every internal node has exactly two children,
+    and the primitives of every node are stored contiguously in
+    self.order[node_start:node_start + node_count].
+    """
+
+    def __init__(self, bounds, leaf_size=8):
+        """
+        Build a hierarchy from the bounds of primitives.
+
+        Parameters
+        ------------
+        bounds:    (n, 2, dimension) float, (min, max) of every primitive
+        leaf_size: int, maximum number of primitives in a leaf node
+        """
+        bounds = np.asanyarray(bounds, dtype=np.float64)
+        if len(bounds.shape) == 2 and bounds.shape[1] % 2 == 0:
+            # accept (n, dimension * 2) rtree- style bounds
+            bounds = bounds.reshape((len(bounds), 2, -1))
+        if len(bounds.shape) != 3 or bounds.shape[1] != 2:
+            raise ValueError('bounds must be (n, 2, dimension)!')
+
+        self.bounds = bounds
+        self.leaf_size = max(int(leaf_size), 1)
+        self._build()
+
+    def _build(self):
+        """
+        Split nodes level by level along the longest axis of their
+        primitive centers, at the median primitive.
+        """
+        count = len(self.bounds)
+        dimension = self.bounds.shape[2]
+        centers = self.bounds.mean(axis=1)
+
+        order = np.arange(count)
+        # per- node data accumulated one level at a time
+        starts = [np.zeros(1, dtype=np.int64)]
+        counts = [np.array([count], dtype=np.int64)]
+        children = [np.full((1, 2), -1, dtype=np.int64)]
+
+        total = 1
+        level_id = np.zeros(1, dtype=np.int64)
+        level_start = starts[0]
+        level_count = counts[0]
+
+        while len(level_id) > 0:
+            split = level_count > self.leaf_size
+            if not split.any():
+                break
+            split_id = level_id[split]
+            split_start = level_start[split]
+            split_count = level_count[split]
+
+            # index of every primitive slot contained by a splitting node
+            slots = ranges(split_start, split_count)
+            segment = np.repeat(np.arange(len(split_id)), split_count)
+            points = centers[order[slots]]
+
+            # find the longest axis of the centers in each node
+            offsets = np.append(0, np.cumsum(split_count)[:-1])
+            extents = (np.maximum.reduceat(points, offsets) -
+                       np.minimum.reduceat(points, offsets))
+            axis = extents.argmax(axis=1)
+
+            # sort primitives inside each node along the chosen axis
+            key = points[np.arange(len(points)), axis[segment]]
+            order[slots] = order[slots][np.lexsort((key, segment))]
+
+            # the two children take each half of the sorted node
+            half = split_count // 2
+            child_start = np.column_stack((split_start,
+                                           split_start + half)).ravel()
+            child_count = np.column_stack((half,
+                                           split_count - half)).ravel()
+            child_id = np.arange(total, total + len(child_start))
+            total += len(child_start)
+
+            # assign children to the nodes being split
+            level_local = np.nonzero(split)[0]
+            children[-1][level_local] = child_id.reshape((-1, 2))
+
+            starts.append(child_start)
+            counts.append(child_count)
+            children.append(np.full((len(child_id), 2), -1, dtype=np.int64))
+
+            level_id = child_id
+            level_start = child_start
+            level_count = child_count
+
+        self.order = order
+        self.node_start = np.concatenate(starts)
+        self.node_count = np.concatenate(counts)
+        self.node_children = np.concatenate(children)
+        self.node_bounds = np.zeros((total, 2, dimension), dtype=np.float64)
+
+        if count == 0:
+            return
+
+        # leaves partition the ordered primitives into contiguous blocks
+        leaf = np.nonzero(self.node_children[:, 0] < 0)[0]
+        leaf = leaf[self.node_start[leaf].argsort()]
+        ordered = self.bounds[order]
+        self.node_bounds[leaf, 0] = np.minimum.reduceat(
+            ordered[:, 0], self.node_start[leaf])
+        self.node_bounds[leaf, 1] = np.maximum.reduceat(
+            ordered[:, 1], self.node_start[leaf])
+
+        # children always have larger indexes than their parents
+        # so walking each level from the bottom up sees children first
+        level_end = np.cumsum([len(i) for i in counts])
+        level_begin = np.append(0, level_end[:-1])
+        for begin, end in zip(level_begin[::-1], level_end[::-1]):
+            node = np.arange(begin, end)
+            node = node[self.node_children[node, 0] >= 0]
+            if len(node) == 0:
+                continue
+            child = self.node_children[node]
+            self.node_bounds[node, 0] = np.minimum(
+                self.node_bounds[child[:, 0], 0],
+                self.node_bounds[child[:, 1], 0])
+            self.node_bounds[node, 1] = np.maximum(
+                self.node_bounds[child[:, 0], 1],
+                self.node_bounds[child[:, 1], 1])
+
+    def __len__(self):
+        return len(self.node_start)
+
+    @property
+    def is_leaf(self):
+        """
+        Which nodes are leaves.
+
+        Returns
+        ----------
+        is_leaf: (len(self),) bool, True for leaf nodes
+        """
+        return self.node_children[:, 0] < 0
+
+    def expand(self, query, node):
+        """
+        Advance a frontier of (query, node) pairs by one level.
+
+        Internal nodes are replaced by their two children and leaf
+        nodes are replaced by the primitives they contain.
+
+        Parameters
+        ------------
+        query: (p,) int, index of query for each pair
+        node:  (p,) int, index of node for each pair
+
+        Returns
+        ------------
+        query:     (q,) int, query index of pairs with internal nodes
+        node:      (q,) int, child node index
+        leaf_query:     (r,) int, query index of primitive pairs
+        leaf_primitive: (r,) int, index of primitive in self.bounds
+        """
+        leaf = self.node_children[node, 0] < 0
+        internal = np.logical_not(leaf)
+
+        leaf_query = np.repeat(query[leaf], self.node_count[node[leaf]])
+        leaf_primitive = self.order[ranges(
+            self.node_start[node[leaf]],
+            self.node_count[node[leaf]])]
+
+        query = np.repeat(query[internal], 2)
+        node = self.node_children[node[internal]].ravel()
+
+        return query, node, leaf_query, leaf_primitive
+
+    def query_bounds(self, bounds):
+        """
+        Find every primitive whose bounds overlap query bounds.
+
+        Parameters
+        ------------
+        bounds: (m, 2, dimension) float, query bounds
+
+        Returns
+        ------------
+        query:     (p,) int, index of query bounds
+        primitive: (p,) int, index of overlapping primitive
+        """
+        bounds = np.asanyarray(bounds, dtype=np.float64)
+        bounds = bounds.reshape((-1, 2, self.bounds.shape[2]))
+
+        result_query = []
+        result_primitive = []
+        if len(self.bounds) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        query = np.arange(len(bounds))
+        node = np.zeros(len(bounds), dtype=np.int64)
+        while len(query) > 0:
+            ok = bounds_overlap(bounds[query], self.node_bounds[node])
+            (query,
+             node,
+             leaf_query,
+             leaf_primitive) = self.expand(query[ok], node[ok])
+            # leaf nodes can be loose so check the primitives too
+            ok = bounds_overlap(bounds[leaf_query],
+                                self.bounds[leaf_primitive])
+            result_query.append(leaf_query[ok])
+            result_primitive.append(leaf_primitive[ok])
+
+        return np.concatenate(result_query), np.concatenate(result_primitive)
+
+    def query_pairs(self, other=None, transform=None):
+        """
+        Find every pair of primitives with overlapping bounds.
+
+        Parameters
+        ------------
+        other:     BVH object, or None to query this hierarchy
+                   against itself
+        transform: (4,4) float, moves other from its frame into the
+                   frame of this hierarchy, boxes of other are
+                   replaced by the boxes around their transformed
+                   corners so the result is conservative
+
+        Returns
+        ------------
+        pairs: (p, 2) int, index of primitive in self and other.
+               If other is None the pairs are unique with pairs[:,0] < pairs[:,1]
+        """
+        self_query = other is None
+        if self_query:
+            other = self
+
+        if len(self.bounds) == 0 or len(other.bounds) == 0:
+            return np.zeros((0, 2), dtype=np.int64)
+
+        other_nodes = other.node_bounds
+        other_bounds = other.bounds
+        if transform is not None:
+            other_nodes = transform_bounds(other_nodes, transform)
+            other_bounds = transform_bounds(other_bounds, transform)
+
+        result = []
+        a = np.zeros(1, dtype=np.int64)
+        b = np.zeros(1, dtype=np.int64)
+        while len(a) > 0:
+            ok = bounds_overlap(self.node_bounds[a], other_nodes[b])
+            a, b = a[ok], b[ok]
+
+            if self_query:
+                # a node against itself only needs the unique
+                # combinations of its children
+                same = np.logical_and(a == b,
+                                      self.node_children[a, 0] >= 0)
+                child = self.node_children[a[same]]
+                same_a = np.column_stack((child[:, 0],
+                                          child[:, 0],
+                                          child[:, 1])).ravel()
+                same_b = np.column_stack((child[:, 0],
+                                          child[:, 1],
+                                          child[:, 1])).ravel()
+                keep = np.logical_not(same)
+                a, b = a[keep], b[keep]
+            else:
+                same_a = same_b = np.zeros(0, dtype=np.int64)
+
+            a, b, leaf_a, leaf_b = self.expand_pairs(other, a, b)
+            # expand leaf- leaf pairs into every primitive combination
+            if len(leaf_a) > 0:
+                pairs = leaf_pairs(self, leaf_a, other, leaf_b)
+                # leaf nodes can be loose so check the primitives too
+                ok = bounds_overlap(self.bounds[pairs[:, 0]],
+                                    other_bounds[pairs[:, 1]])
+                result.append(pairs[ok])
+
+            a = np.concatenate((same_a, a))
+            b = np.concatenate((same_b, b))
+
+        pairs = np.vstack(result) if len(result) > 0 else np.zeros(
+            (0, 2), dtype=np.int64)
+        if len(pairs) == 0:
+            return pairs
+
+        if self_query:
+            pairs.sort(axis=1)
+            pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+            # leaves against themselves produce duplicates and a
+            # unique on a single integer key is much faster
+            count = len(self.bounds)
+            key = np.unique(pairs[:, 0] * count + pairs[:, 1])
+            pairs = np.column_stack((key // count, key % count))
+        return pairs
+
+    def expand_pairs(self, other, a, b):
+        """
+        Advance a frontier of node pairs between this hierarchy and
+        another one level, by splitting the larger node of each pair.
+
+        Parameters
+        ------------
+        other: BVH object
+        a:     (p,) int, index of node in self
+        b:     (p,) int, index of node in other
+
+        Returns
+        ------------
+        a:      (q,) int, node in self of pairs still being expanded
+        b:      (q,) int, node in other of pairs still being expanded
+        leaf_a: (r,) int, node in self of pairs of two leaves
+        leaf_b: (r,) int, node in other of pairs of two leaves
+        """
+        a_leaf = self.node_children[a, 0] < 0
+        b_leaf = other.node_children[b, 0] < 0
+        both = np.logical_and(a_leaf, b_leaf)
+
+        # descend into the larger of the two nodes when possible
+        descend_a = np.logical_and(
+            np.logical_not(a_leaf),
+            np.logical_or(b_leaf,
+                          self.node_count[a] >= other.node_count[b]))
+        descend_b = np.logical_not(np.logical_or(both, descend_a))
+
+        leaf_a, leaf_b = a[both], b[both]
+        a, b = (np.concatenate((self.node_children[a[descend_a]].ravel(),
+                                np.repeat(a[descend_b], 2))),
+                np.concatenate((np.repeat(b[descend_a], 2),
+                                other.node_children[b[descend_b]].ravel())))
+        return a, b, leaf_a, leaf_b
+
+
+def leaf_pairs(a_tree, a_node, b_tree, b_node):
+    """
+    Every combination of primitives between corresponding leaves.
+
+    Parameters
+    ------------
+    a_tree: BVH object
+    a_node: (n,) int, index of leaf nodes in a_tree
+    b_tree: BVH object
+    b_node: (n,) int, index of leaf nodes in b_tree
+
+    Returns
+    ------------
+    pairs: (p, 2) int, index of primitive in a_tree and b_tree
+    """
+    a_count = a_tree.node_count[a_node]
+    b_count = b_tree.node_count[b_node]
+    per_pair = a_count * b_count
+
+    pair = np.repeat(np.arange(len(a_node)), per_pair)
+    local = np.arange(per_pair.sum()) - np.repeat(
+        np.cumsum(per_pair) - per_pair, per_pair)
+
+    a_index = a_tree.order[a_tree.node_start[a_node][pair] +
+                           local // b_count[pair]]
+    b_index = b_tree.order[b_tree.node_start[b_node][pair] +
+                           local % b_count[pair]]
+    return np.column_stack((a_index, b_index))
+
+
+def ranges(starts, counts):
+    """
+    Concatenate integer ranges without a Python loop.
+
+    Parameters
+    ------------
+    starts: (n,) int, first value of each range
+    counts: (n,) int, length of each range
+
+    Returns
+    ------------
+    values: (counts.sum(),) int, concatenated ranges
+
+    Examples
+    ------------
+    ranges([0, 10], [2, 3]) = [0, 1, 10, 11, 12]
+    """
+    starts = np.asanyarray(starts, dtype=np.int64)
+    counts = np.asanyarray(counts, dtype=np.int64)
+    if len(counts) == 0:
+        return np.zeros(0, dtype=np.int64)
+    offset = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return offset + np.arange(counts.sum())
+
+
+def bounds_overlap(a, b):
+    """
+    Check corresponding axis aligned bounding boxes for overlap.
+
+    Parameters
+    ------------
+    a: (n, 2, dimension) float, (min, max) bounds
+    b: (n, 2, dimension) float, (min, max) bounds
+
+    Returns
+    ------------
+    overlap: (n,) bool, whether each pair of boxes overlaps
+    """
+    return np.logical_and((a[:, 0] <= b[:, 1]).all(axis=1),
+                          (b[:, 0] <= a[:, 1]).all(axis=1))
+
+
+def bounds_distance(points, bounds, squared=False):
+    """
+    Distance from points to corresponding axis aligned bounding boxes,
+    which is zero for points inside their box.
+
+    Parameters
+    ------------
+    points:  (n, dimension) float, points in space
+    bounds:  (n, 2, dimension) float, (min, max) bounds
+    squared: bool, return squared distance
+
+    Returns
+    ------------
+    distance: (n,) float, distance from each point to its box
+    """
+    delta = np.maximum(bounds[:, 0] - points, 0.0)
+    delta = np.maximum(delta, points - bounds[:, 1])
+    distance = util.diagonal_dot(delta, delta)
+    if squared:
+        return distance
+    return np.sqrt(distance)
+
+
+def bounds_separation(a, b, squared=False):
+    """
+    Distance between corresponding axis aligned bounding boxes,
+    which is zero for boxes which overlap.
+
+    Parameters
+    ------------
+    a:       (n, 2, dimension) float, (min, max) bounds
+    b:       (n, 2, dimension) float, (min, max) bounds
+    squared: bool, return squared distance
+
+    Returns
+    ------------
+    distance: (n,) float, distance between each pair of boxes
+    """
+    delta = np.maximum(a[:, 0] - b[:, 1], 0.0)
+    delta = np.maximum(delta, b[:, 0] - a[:, 1])
+    distance = util.diagonal_dot(delta, delta)
+    if squared:
+        return distance
+    return np.sqrt(distance)
+
+
+def sweep_pairs(bounds, distance=0.0):
+    """
+    Find every pair of axis aligned bounding boxes which overlap
+    using sort and sweep along a single axis.
+
+    Parameters
+    ------------
+    bounds:   (n, 2, dimension) float, (min, max) bounds
+    distance: float, also include pairs whose boxes are separated
+              by no more than this along every axis
+
+    Returns
+    ------------
+    pairs: (p, 2) int, unique pairs of overlapping boxes
+           with pairs[:,0] < pairs[:,1]
+    """
+    bounds = np.asanyarray(bounds, dtype=np.float64)
+    if len(bounds) < 2:
+        return np.zeros((0, 2), dtype=np.int64)
+
+    # sweep along the axis where the boxes are most spread out
+    axis = bounds.mean(axis=1).var(axis=0).argmax()
+    # sort boxes by their minimum along the axis
+    order = bounds[:, 0, axis].argsort()
+    ordered = bounds[order]
+    # every box starting before this one ends is a candidate
+    end = np.searchsorted(ordered[:, 0, axis],
+                          ordered[:, 1, axis] + distance,
+                          side='right')
+    start = np.arange(len(ordered)) + 1
+    count = np.maximum(end - start, 0)
+
+    a = np.repeat(np.arange(len(ordered)), count)
+    b = ranges(start, count)
+
+    padded = ordered[a].copy()
+    padded[:, 0] -= distance
+    padded[:, 1] += distance
+    ok = bounds_overlap(padded, ordered[b])
+
+    pairs = np.column_stack((order[a[ok]], order[b[ok]]))
+    pairs.sort(axis=1)
+    return pairs
+
+
+def transform_bounds(bounds, matrix):
+    """
+    Find the axis aligned boxes around transformed boxes.
+
+    Parameters
+    ------------
+    bounds: (n, 2, 3) float, (min, max) bounds
+    matrix: (4, 4) float, homogenous transformation
+
+    Returns
+    ------------
+    transformed: (n, 2, 3) float, (min, max) of transformed boxes
+    """
+    bounds = np.asanyarray(bounds, dtype=np.float64)
+    matrix = np.asanyarray(matrix, dtype=np.float64)
+    if matrix.shape != (4, 4):
+        raise ValueError('matrix must be (4,4)!')
+
+    center = bounds.mean(axis=1)
+    half = (bounds[:, 1] - bounds[:, 0]) / 2.0
+    # the extent along each new axis is the sum of every
+    # old half extent projected onto it
+    center = np.dot(center, matrix[:3, :3].T) + matrix[:3, 3]
+    half = np.dot(half, np.abs(matrix[:3, :3]).T)
+    return np.stack((center - half, center + half), axis=1)
+
+
+def triangles_bvh(triangles, leaf_size=8):
+    """
+    Build a bounding volume hierarchy for a triangle soup.
+
+    Parameters
+    ------------
+    triangles: (n, 3, 3) float, triangles in space
+    leaf_size: int, maximum triangles per leaf
+
+    Returns
+    ------------
+    bvh: BVH object
+    """
+    triangles = np.asanyarray(triangles, dtype=np.float64)
+    if not util.is_shape(triangles, (-1, 3, 3)):
+        raise ValueError('Triangles must be (n,3,3)!')
+    bounds = np.stack((triangles.min(axis=1),
+                       triangles.max(axis=1)), axis=1)
+    return BVH(bounds, leaf_size=leaf_size)
@@ -1,16 +1,29 @@
 import numpy as np
 
+import time
+import threading
 import collections
 
+from . import bvh
+from . import intersections
+from . import transformations
+
 from .constants import tol, log
+from .triangles import pair_distance
 
 _fcl_exists = True
 try:
     import fcl  # pip install python-fcl
 except BaseException:
-    log.warning('No FCL -- collision checking will not work')
+    log.debug('No FCL -- collision checking will use numpy')
     _fcl_exists = False
 
+# stand- ins for the fcl results used by ContactData and DistanceData
+# which are created by the numpy collision engine
+_Contact = collections.namedtuple('_Contact', ['b1', 'b2', 'pos'])
+_DistanceResult = collections.namedtuple(
+    '_DistanceResult', ['b1', 'b2', 'nearest_points', 'min_distance'])
+
 
 class ContactData(object):
     """
@@ -31,7 +44,7 @@ class ContactData(object):
             names[0]: contact.b1,
             names[1]: contact.b2
         }
-        self._point = result.pos
+        self._point = contact.pos
 
     @property
     def point(self):
@@ -131,23 +144,34 @@ class CollisionManager(object):
     A mesh-mesh collision manager.
     """
 
-    def __init__(self):
+    def __init__(self, engine=None):
         """
         Initialize a mesh-mesh collision manager.
+
+        Parameters
+        ----------
+        engine: str, 'fcl' or 'numpy', by default 'fcl' if
+                python-fcl is installed and 'numpy' otherwise
         """
-        if not _fcl_exists:
+        if engine is None:
+            engine = 'fcl' if _fcl_exists else 'numpy'
+        if engine == 'fcl' and not _fcl_exists:
             raise ValueError('No FCL Available!')
+        if engine not in ['fcl', 'numpy']:
+            raise ValueError('collision engine {} not available!'.format(
+                engine))
+        self.engine = engine
+
         # {name: {geom:, obj}}
         self._objs = {}
-        # {id(bvh) : str, name}
-        # unpopulated values will return None
-        self._names = collections.defaultdict(lambda: None)
+        # {(id(bvh), translation, rotation) : [str, names]}
+        # to find objects from copies passed to FCL callbacks
+        self._names = {}
 
-        # cache BVH objects
-        # {mesh.md5(): fcl.BVHModel object}
-        self._bvh = {}
-        self._manager = fcl.DynamicAABBTreeCollisionManager()
-        self._manager.setup()
+        # BVH objects are shared between managers via bvh_registry
+        if self.engine == 'fcl':
+            self._manager = fcl.DynamicAABBTreeCollisionManager()
+            self._manager.setup()
 
     def add_object(self,
                    name,
@@ -164,11 +188,29 @@ class CollisionManager(object):
         name:      str, an identifier for the object
         mesh:      Trimesh object, the geometry of the collision object
         transform: (4,4) float, homogenous transform matrix for the object
+
+        Returns
+        ----------
+        handle: the object as stored by the engine, which is an
+                fcl.CollisionObject for 'fcl' and a dict with keys
+                'mesh' and 'transform' for 'numpy'. Transforms
+                should be changed with set_transform rather than
+                through the handle.
         """
 
         # if no transform passed, assume identity transform
         if transform is None:
             transform = np.eye(4)
+        if self.engine == 'numpy':
+            transform = np.asanyarray(transform, dtype=np.float64)
+            if transform.shape != (4, 4):
+                raise ValueError('transform must be (4,4)!')
+            # the triangle hierarchy is cached by the mesh
+            # and shared between meshes with identical geometry
+            self._objs[name] = {'mesh': mesh,
+                                'transform': transform.copy()}
+            return self._objs[name]
+
         transform = np.asanyarray(transform, dtype=np.float32)
         if transform.shape != (4, 4):
             raise ValueError('transform must be (4,4)!')
@@ -181,11 +223,11 @@ class CollisionManager(object):
 
         # Add collision object to set
         if name in self._objs:
-            self._manager.unregisterObject(self._objs[name])
+            self.remove_object(name)
         self._objs[name] = {'obj': o,
                             'geom': bvh}
-        # store the name of the geometry
-        self._names[id(bvh)] = name
+        # store the name of the object by its geometry and transform
+        self._add_name(name)
 
         self._manager.registerObject(o)
         self._manager.update()
@@ -199,15 +241,18 @@ class CollisionManager(object):
         ----------
         name: str, the identifier for the object
         """
-        if name in self._objs:
-            self._manager.unregisterObject(self._objs[name]['obj'])
-            self._manager.update(self._objs[name]['obj'])
-            # remove objects from _objs
-            geom_id = id(self._objs.pop(name)['geom'])
-            # remove names
-            self._names.pop(geom_id)
-        else:
+        if name not in self._objs:
             raise ValueError('{} not in collision manager!'.format(name))
+        if self.engine == 'numpy':
+            self._objs.pop(name)
+            return
+
+        self._manager.unregisterObject(self._objs[name]['obj'])
+        self._manager.update(self._objs[name]['obj'])
+        # remove names
+        self._remove_name(name)
+        # remove objects from _objs
+        self._objs.pop(name)
 
     def set_transform(self, name, transform):
         """
@@ -219,13 +264,104 @@ class CollisionManager(object):
         name:      str, an identifier for the object already in the manager
         transform: (4,4) float, a new homogenous transform matrix for the object
         """
-        if name in self._objs:
+        if name not in self._objs:
+            raise ValueError('{} not in collision manager!'.format(name))
+        if self.engine == 'numpy':
+            transform = np.asanyarray(transform, dtype=np.float64)
+            if transform.shape != (4, 4):
+                raise ValueError('transform must be (4,4)!')
+            self._objs[name]['transform'] = transform.copy()
+            return
+
+        self._remove_name(name)
+        o = self._objs[name]['obj']
+        o.setRotation(transform[:3, :3])
+        o.setTranslation(transform[:3, 3])
+        self._add_name(name)
+        self._manager.update(o)
+
+    def set_transforms(self, transforms):
+        """
+        Set the transforms for many of the manager's objects at once,
+        refitting the broadphase a single time.
+
+        Parameters
+        ----------
+        transforms: dict, {name: (4,4) float} new homogenous transform
+                    matrix for objects already in the manager
+        """
+        # check everything before changing anything
+        checked = {}
+        for name, transform in transforms.items():
+            if name not in self._objs:
+                raise ValueError('{} not in collision manager!'.format(name))
+            transform = np.asanyarray(transform, dtype=np.float64)
+            if transform.shape != (4, 4):
+                raise ValueError('transform must be (4,4)!')
+            checked[name] = transform
+
+        if self.engine == 'numpy':
+            for name, transform in checked.items():
+                self._objs[name]['transform'] = transform.copy()
+            return
+
+        for name, transform in checked.items():
+            self._remove_name(name)
             o = self._objs[name]['obj']
             o.setRotation(transform[:3, :3])
             o.setTranslation(transform[:3, 3])
-            self._manager.update(o)
-        else:
-            raise ValueError('{} not in collision manager!'.format(name))
+            self._add_name(name)
+        if len(checked) > 0:
+            self._manager.update()
+
+    def in_collision_trajectory(self,
+                                trajectory,
+                                other_manager=None,
+                                return_distances=False):
+        """
+        Move objects through a sequence of waypoints and find the
+        first waypoint where objects collide, stopping there.
+
+        Parameters
+        ----------
+        trajectory:       sequence of dict, {name: (4,4) float} the
+                          transforms of objects at each waypoint, objects
+                          not included keep their previous transform
+        other_manager:    CollisionManager, if passed check objects
+                          against this manager rather than each other
+        return_distances: bool, if True the minimum distance at each
+                          checked waypoint is returned as well
+
+        Returns
+        -------
+        index:     int, index of first waypoint in collision or None
+        distances: (m,) float, minimum distance at each waypoint up to
+                   and including the first in collision
+        """
+        distances = []
+        index = None
+        for i, transforms in enumerate(trajectory):
+            self.set_transforms(transforms)
+            if other_manager is None:
+                collision = self.in_collision_internal()
+            else:
+                collision = self.in_collision_other(other_manager)
+
+            if return_distances:
+                if collision:
+                    distances.append(0.0)
+                elif other_manager is None:
+                    distances.append(self.min_distance_internal())
+                else:
+                    distances.append(
+                        self.min_distance_other(other_manager))
+            if collision:
+                index = i
+                break
+
+        if return_distances:
+            return index, np.array(distances, dtype=np.float64)
+        return index
 
     def in_collision_single(self, mesh, transform=None,
                             return_names=False, return_data=False):
@@ -251,6 +387,35 @@ class CollisionManager(object):
         if transform is None:
             transform = np.eye(4)
 
+        if self.engine == 'numpy':
+            external = {'mesh': mesh,
+                        'transform': np.asanyarray(transform,
+                                                   dtype=np.float64)}
+            pairs = [(name, '__external')
+                     for name in self._numpy_candidates_single(external)]
+            result, names, contact_data = self._numpy_collide(
+                pairs,
+                objects={'__external': external},
+                return_names=return_names,
+                return_data=return_data)
+            objs_in_collision = set(i[0] for i in names)
+        else:
+            result, objs_in_collision, contact_data = self._fcl_single(
+                mesh, transform, return_names, return_data)
+
+        if return_names and return_data:
+            return result, objs_in_collision, contact_data
+        elif return_names:
+            return result, objs_in_collision
+        elif return_data:
+            return result, contact_data
+        else:
+            return result
+
+    def _fcl_single(self, mesh, transform, return_names, return_data):
+        """
+        Collide a single object with fcl, see in_collision_single.
+        """
         # Create FCL data
         b = self._get_BVH(mesh)
         t = fcl.Transform(transform[:3, :3], transform[:3, 3])
@@ -263,36 +428,28 @@ class CollisionManager(object):
                 num_max_contacts=100000,
                 enable_contact=True))
 
-        self._manager.collide(o, cdata, fcl.defaultCollisionCallback)
+        objects = []
+        self._manager.collide(o, cdata, _contact_callback(objects))
         result = cdata.result.is_collision
 
         # If we want to return the objects that were collision, collect them.
         objs_in_collision = set()
         contact_data = []
         if return_names or return_data:
-            for contact in cdata.result.contacts:
-                cg = contact.o1
-                if cg == b:
-                    cg = contact.o2
-                name = self._extract_name(cg)
-
-                names = (name, '__external')
-                if cg == contact.o2:
-                    names = reversed(names)
+            # contacts from the same call share a pair of objects
+            found = {}
+            for contact, pair in zip(cdata.result.contacts, objects):
+                if id(pair) not in found:
+                    found[id(pair)] = self._pair_names(
+                        (contact.o1, contact.o2), pair)
+                pairs, names = found[id(pair)]
 
                 if return_names:
-                    objs_in_collision.add(name)
+                    objs_in_collision.update(i[0] for i in pairs)
                 if return_data:
                     contact_data.append(ContactData(names, contact))
 
-        if return_names and return_data:
-            return result, objs_in_collision, contact_data
-        elif return_names:
-            return result, objs_in_collision
-        elif return_data:
-            return result, contact_data
-        else:
-            return result
+        return result, objs_in_collision, contact_data
 
     def in_collision_internal(self, return_names=False, return_data=False):
         """
@@ -313,35 +470,56 @@ class CollisionManager(object):
                              that the two correspoinding objects are in collision.
         contacts: list of ContactData, All contacts detected
         """
+        if self.engine == 'numpy':
+            result, names, contact_data = self._numpy_collide(
+                self._numpy_candidates_internal(),
+                return_names=return_names,
+                return_data=return_data)
+            objs_in_collision = set(tuple(sorted(i)) for i in names)
+        else:
+            result, objs_in_collision, contact_data = self._fcl_internal(
+                return_names, return_data)
+
+        if return_names and return_data:
+            return result, objs_in_collision, contact_data
+        elif return_names:
+            return result, objs_in_collision
+        elif return_data:
+            return result, contact_data
+        else:
+            return result
+
+    def _fcl_internal(self, return_names, return_data):
+        """
+        Collide objects in the manager with fcl, see in_collision_internal.
+        """
         cdata = fcl.CollisionData()
         if return_names or return_data:
             cdata = fcl.CollisionData(request=fcl.CollisionRequest(
                 num_max_contacts=100000, enable_contact=True))
 
-        self._manager.collide(cdata, fcl.defaultCollisionCallback)
+        objects = []
+        self._manager.collide(cdata, _contact_callback(objects))
 
         result = cdata.result.is_collision
 
         objs_in_collision = set()
         contact_data = []
         if return_names or return_data:
-            for contact in cdata.result.contacts:
-                names = (self._extract_name(contact.o1),
-                         self._extract_name(contact.o2))
+            # contacts from the same call share a pair of objects
+            found = {}
+            for contact, pair in zip(cdata.result.contacts, objects):
+                if id(pair) not in found:
+                    found[id(pair)] = self._pair_names(
+                        (contact.o1, contact.o2), pair, other=self)
+                pairs, names = found[id(pair)]
 
                 if return_names:
-                    objs_in_collision.add(tuple(sorted(names)))
+                    objs_in_collision.update(tuple(sorted(i)) for i in pairs)
                 if return_data:
                     contact_data.append(ContactData(names, contact))
 
-        if return_names and return_data:
-            return result, objs_in_collision, contact_data
-        elif return_names:
-            return result, objs_in_collision
-        elif return_data:
-            return result, contact_data
-        else:
-            return result
+        return result, objs_in_collision, contact_data
 
     def in_collision_other(self, other_manager,
                            return_names=False, return_data=False):
@@ -365,42 +543,59 @@ class CollisionManager(object):
                              that the two correspoinding objects are in collision.
         contacts: list of ContactData, All contacts detected
         """
+        if self.engine != other_manager.engine:
+            raise ValueError('collision managers must use the same engine!')
+        if self.engine == 'numpy':
+            result, names, contact_data = self._numpy_collide(
+                self._numpy_candidates_other(other_manager),
+                other=other_manager,
+                return_names=return_names,
+                return_data=return_data)
+            objs_in_collision = set(names)
+        else:
+            result, objs_in_collision, contact_data = self._fcl_other(
+                other_manager, return_names, return_data)
+
+        if return_names and return_data:
+            return result, objs_in_collision, contact_data
+        elif return_names:
+            return result, objs_in_collision
+        elif return_data:
+            return result, contact_data
+        else:
+            return result
+
+    def _fcl_other(self, other_manager, return_names, return_data):
+        """
+        Collide with another manager with fcl, see in_collision_other.
+        """
         cdata = fcl.CollisionData()
         if return_names or return_data:
             cdata = fcl.CollisionData(request=fcl.CollisionRequest(num_max_contacts=100000,
                                                                    enable_contact=True))
+        objects = []
         self._manager.collide(other_manager._manager,
                               cdata,
-                              fcl.defaultCollisionCallback)
+                              _contact_callback(objects))
         result = cdata.result.is_collision
 
         objs_in_collision = set()
         contact_data = []
         if return_names or return_data:
-            for contact in cdata.result.contacts:
-                reverse = False
-                names = (self._extract_name(contact.o1),
-                         other_manager._extract_name(contact.o2))
-                if names[0] is None:
-                    names = (self._extract_name(contact.o2),
-                             other_manager._extract_name(contact.o1))
-                    reverse = True
+            # contacts from the same call share a pair of objects
+            found = {}
+            for contact, pair in zip(cdata.result.contacts, objects):
+                if id(pair) not in found:
+                    found[id(pair)] = self._pair_names(
+                        (contact.o1, contact.o2), pair, other=other_manager)
+                pairs, names = found[id(pair)]
 
                 if return_names:
-                    objs_in_collision.add(names)
+                    objs_in_collision.update(pairs)
                 if return_data:
-                    if reverse:
-                        names = reversed(names)
                     contact_data.append(ContactData(names, contact))
 
-        if return_names and return_data:
-            return result, objs_in_collision, contact_data
-        elif return_names:
-            return result, objs_in_collision
-        elif return_data:
-            return result, contact_data
-        else:
-            return result
+        return result, objs_in_collision, contact_data
 
     def min_distance_single(self, mesh, transform=None,
                             return_name=False, return_data=False):
@@ -424,6 +619,31 @@ class CollisionManager(object):
         if transform is None:
             transform = np.eye(4)
 
+        if self.engine == 'numpy':
+            external = {'mesh': mesh,
+                        'transform': np.asanyarray(transform,
+                                                   dtype=np.float64)}
+            pairs = [(name, '__external') for name in self._objs]
+            distance, names, data = self._numpy_distance(
+                pairs, objects={'__external': external})
+            name = None if names is None else names[0]
+        else:
+            distance, name, data = self._fcl_distance_single(
+                mesh, transform, return_name, return_data)
+
+        if return_name and return_data:
+            return distance, name, data
+        elif return_name:
+            return distance, name
+        elif return_data:
+            return distance, data
+        else:
+            return distance
+
+    def _fcl_distance_single(self, mesh, transform, return_name, return_data):
+        """
+        Distance to a single object with fcl, see min_distance_single.
+        """
         # Create FCL data
         b = self._get_BVH(mesh)
 
@@ -438,32 +658,20 @@ class CollisionManager(object):
                 fcl.DistanceResult()
             )
 
-        self._manager.distance(o, ddata, fcl.defaultDistanceCallback)
+        objects = []
+        self._manager.distance(o, ddata, _distance_callback(objects))
 
         distance = ddata.result.min_distance
 
         # If we want to return the objects that were collision, collect them.
         name, data = None, None
-        if return_name or return_data:
-            cg = ddata.result.o1
-            if cg == b:
-                cg = ddata.result.o2
-
-            name = self._extract_name(cg)
-
-            names = (name, '__external')
-            if cg == ddata.result.o2:
-                names = reversed(names)
+        if (return_name or return_data) and len(objects) > 0:
+            pairs, names = self._pair_names(
+                (ddata.result.o1, ddata.result.o2), objects)
+            name = pairs[0][0]
             data = DistanceData(names, ddata.result)
 
-        if return_name and return_data:
-            return distance, name, data
-        elif return_name:
-            return distance, name
-        elif return_data:
-            return distance, data
-        else:
-            return distance
+        return distance, name, data
 
     def min_distance_internal(self, return_names=False, return_data=False):
         """
@@ -481,6 +689,30 @@ class CollisionManager(object):
         names: (2,) str,    The names of the closest objects
         data: DistanceData, Extra data about the distance query
         """
+        if self.engine == 'numpy':
+            names = sorted(self._objs.keys())
+            pairs = [(a, b) for i, a in enumerate(names)
+                     for b in names[i + 1:]]
+            distance, names, data = self._numpy_distance(pairs)
+            if names is not None:
+                names = tuple(sorted(names))
+        else:
+            distance, names, data = self._fcl_distance_internal(
+                return_names, return_data)
+
+        if return_names and return_data:
+            return distance, names, data
+        elif return_names:
+            return distance, names
+        elif return_data:
+            return distance, data
+        else:
+            return distance
+
+    def _fcl_distance_internal(self, return_names, return_data):
+        """
+        Distance between objects with fcl, see min_distance_internal.
+        """
         ddata = fcl.DistanceData()
         if return_data:
             ddata = fcl.DistanceData(
@@ -488,25 +720,19 @@ class CollisionManager(object):
                 fcl.DistanceResult()
             )
 
-        self._manager.distance(ddata, fcl.defaultDistanceCallback)
+        objects = []
+        self._manager.distance(ddata, _distance_callback(objects))
 
         distance = ddata.result.min_distance
 
         names, data = None, None
-        if return_names or return_data:
-            names = (self._extract_name(ddata.result.o1),
-                     self._extract_name(ddata.result.o2))
+        if (return_names or return_data) and len(objects) > 0:
+            pairs, names = self._pair_names(
+                (ddata.result.o1, ddata.result.o2), objects, other=self)
             data = DistanceData(names, ddata.result)
             names = tuple(sorted(names))
 
-        if return_names and return_data:
-            return distance, names, data
-        elif return_names:
-            return distance, names
-        elif return_data:
-            return distance, data
-        else:
-            return distance
+        return distance, names, data
 
     def min_distance_other(self, other_manager,
                            return_names=False, return_data=False):
@@ -529,6 +755,29 @@ class CollisionManager(object):
                              the two closest objects.
         data: DistanceData,  Extra data about the distance query
         """
+        if self.engine != other_manager.engine:
+            raise ValueError('collision managers must use the same engine!')
+        if self.engine == 'numpy':
+            pairs = [(a, b) for a in self._objs for b in other_manager._objs]
+            distance, names, data = self._numpy_distance(
+                pairs, other=other_manager)
+        else:
+            distance, names, data = self._fcl_distance_other(
+                other_manager, return_names, return_data)
+
+        if return_names and return_data:
+            return distance, names, data
+        elif return_names:
+            return distance, names
+        elif return_data:
+            return distance, data
+        else:
+            return distance
+
+    def _fcl_distance_other(self, other_manager, return_names, return_data):
+        """
+        Distance to another manager with fcl, see min_distance_other.
+        """
         ddata = fcl.DistanceData()
         if return_data:
             ddata = fcl.DistanceData(
@@ -536,37 +785,181 @@ class CollisionManager(object):
                 fcl.DistanceResult()
             )
 
+        objects = []
         self._manager.distance(other_manager._manager,
                                ddata,
-                               fcl.defaultDistanceCallback)
+                               _distance_callback(objects))
 
         distance = ddata.result.min_distance
 
         names, data = None, None
-        if return_names or return_data:
-            reverse = False
-            names = (self._extract_name(ddata.result.o1),
-                     other_manager._extract_name(ddata.result.o2))
-            if names[0] is None:
-                reverse = True
-                names = (self._extract_name(ddata.result.o2),
-                         other_manager._extract_name(ddata.result.o1))
-
-            dnames = tuple(names)
-            if reverse:
-                dnames = reversed(dnames)
+        if (return_names or return_data) and len(objects) > 0:
+            pairs, dnames = self._pair_names(
+                (ddata.result.o1, ddata.result.o2), objects,
+                other=other_manager)
+            names = pairs[0]
             data = DistanceData(dnames, ddata.result)
 
-        if return_names and return_data:
-            return distance, names, data
-        elif return_names:
-            return distance, names
-        elif return_data:
-            return distance, data
-        else:
-            return distance
+        return distance, names, data
+
+    def _numpy_bounds(self, names, objects):
+        """
+        World axis aligned bounds of objects.
+
+        Parameters
+        -----------
+        names:   (n,) str, names of objects
+        objects: dict, {name: {'mesh':, 'transform':}}
+
+        Returns
+        -----------
+        bounds: (n,2,3) float, bounds of each object
+        """
+        if len(names) == 0:
+            return np.zeros((0, 2, 3))
+        return np.vstack([bvh.transform_bounds(
+            objects[name]['mesh'].bounds.reshape((1, 2, 3)),
+            objects[name]['transform']) for name in names])
+
+    def _numpy_candidates_single(self, external):
+        """
+        Names of objects whose bounds overlap an external object.
+        """
+        names = list(self._objs.keys())
+        if len(names) == 0:
+            return []
+        bounds = self._numpy_bounds(names, self._objs)
+        external = self._numpy_bounds(['__external'],
+                                      {'__external': external})
+        ok = bvh.bounds_overlap(bounds, np.tile(external, (len(bounds), 1, 1)))
+        return [names[i] for i in np.nonzero(ok)[0]]
+
+    def _numpy_candidates_internal(self):
+        """
+        Pairs of object names whose bounds overlap.
+        """
+        names = sorted(self._objs.keys())
+        if len(names) < 2:
+            return []
+        tree = bvh.BVH(self._numpy_bounds(names, self._objs))
+        return [(names[a], names[b]) for a, b in tree.query_pairs()]
+
+    def _numpy_candidates_other(self, other):
+        """
+        Pairs of object names from this and another manager whose
+        bounds overlap.
+        """
+        names = list(self._objs.keys())
+        other_names = list(other._objs.keys())
+        if len(names) == 0 or len(other_names) == 0:
+            return []
+        tree = bvh.BVH(self._numpy_bounds(names, self._objs))
+        other_tree = bvh.BVH(self._numpy_bounds(other_names, other._objs))
+        return [(names[a], other_names[b])
+                for a, b in tree.query_pairs(other_tree)]
+
+    def _numpy_collide(self,
+                       pairs,
+                       objects=None,
+                       other=None,
+                       return_names=False,
+                       return_data=False):
+        """
+        Check pairs of objects for collision with the numpy engine.
+
+        Parameters
+        -----------
+        pairs:   list of (name, name) of objects to check
+        objects: dict, extra objects referenced by the second name
+        other:   CollisionManager, holding objects of the second name
+
+        Returns
+        -----------
+        result:   bool, whether any pair is in collision
+        names:    list of (name, name) of pairs in collision
+        contacts: list of ContactData
+        """
+        first = self._objs
+        second = dict(self._objs)
+        if other is not None:
+            second = other._objs
+        if objects is not None:
+            second.update(objects)
+
+        result = False
+        names = []
+        contacts = []
+        for a, b in pairs:
+            faces, points = mesh_contacts(
+                first[a]['mesh'], first[a]['transform'],
+                second[b]['mesh'], second[b]['transform'],
+                first_only=not return_data)
+            if len(faces) == 0:
+                continue
+            result = True
+            names.append((a, b))
+            if return_data:
+                contacts.extend(ContactData((a, b), _Contact(f[0], f[1], p))
+                                for f, p in zip(faces, points))
+            elif not return_names:
+                # any collision answers the query
+                break
+
+        return result, names, contacts
+
+    def _numpy_distance(self, pairs, objects=None, other=None):
+        """
+        Find the closest pair of objects with the numpy engine.
+
+        Parameters
+        -----------
+        pairs:   list of (name, name) of objects to check
+        objects: dict, extra objects referenced by the second name
+        other:   CollisionManager, holding objects of the second name
+
+        Returns
+        -----------
+        distance: float, distance between closest pair or inf
+        names:    (name, name) of closest pair, or None
+        data:     DistanceData for closest pair, or None
+        """
+        first = self._objs
+        second = dict(self._objs)
+        if other is not None:
+            second = other._objs
+        if objects is not None:
+            second.update(objects)
+
+        if len(pairs) == 0:
+            return np.inf, None, None
+
+        # check pairs in order of the distance between their bounds
+        # so far away pairs can be skipped
+        lower = bvh.bounds_separation(
+            self._numpy_bounds([a for a, b in pairs], first),
+            self._numpy_bounds([b for a, b in pairs], second))
+
+        best = np.inf
+        names, data = None, None
+        for index in lower.argsort():
+            if lower[index] > best:
+                break
+            a, b = pairs[index]
+            distance, faces, points = mesh_distance(
+                first[a]['mesh'], first[a]['transform'],
+                second[b]['mesh'], second[b]['transform'],
+                upper=best)
+            # faces are None if nothing is closer than best
+            if faces is not None and (distance < best or names is None):
+                best = distance
+                names = (a, b)
+                data = DistanceData(names, _DistanceResult(
+                    faces[0], faces[1], points, distance))
+
+        return best, names, data
 
     def _get_BVH(self, mesh):
+
         """
         Get a BVH for a mesh.
 
@@ -578,19 +971,424 @@ class CollisionManager(object):
         --------------
         bvh: fcl.BVHModel object
         """
-        bvh = mesh_to_BVH(mesh)
-        return bvh
+        return bvh_registry.get(mesh)
 
-    def _extract_name(self, geom):
+    def _add_name(self, name):
         """
-        Retrieve the name of an object from the manager by its
-        CollisionObject, or return None if not found.
+        Store the name of an object by its geometry and transform,
+        which must be called whenever the transform is changed.
 
         Parameters
         -----------
-        geom: CollisionObject, BVHModel
+        name: str, an identifier for an object in the manager
+        """
+        key = _object_key(self._objs[name]['geom'],
+                          self._objs[name]['obj'])
+        self._objs[name]['key'] = key
+        self._names.setdefault(key, []).append(name)
+
+    def _remove_name(self, name):
         """
-        return self._names[id(geom)]
+        Remove the name of an object stored by _add_name.
+
+        Parameters
+        -----------
+        name: str, an identifier for an object in the manager
+        """
+        key = self._objs[name].pop('key')
+        self._names[key].remove(name)
+        if len(self._names[key]) == 0:
+            self._names.pop(key)
+
+    def _extract_names(self, geom, obj):
+        """
+        Retrieve the names of objects in the manager by their
+        geometry and CollisionObject.
+
+        FCL callbacks are passed copies of the CollisionObjects and
+        a BVHModel may be shared by many objects, so objects are
+        found by their geometry and transform. Objects with both the
+        same geometry and transform can't be told apart, so all of
+        their names are returned.
+
+        Parameters
+        -----------
+        geom: BVHModel, the geometry of the object
+        obj:  CollisionObject, passed to an FCL callback
+
+        Returns
+        -----------
+        names: list of str, names of matching objects, empty if none
+        """
+        return self._names.get(_object_key(geom, obj), [])
+
+    def _pair_names(self, geoms, objects, other=None):
+        """
+        Retrieve the names of a pair of objects from an FCL query.
+
+        Parameters
+        -----------
+        geoms:   (2,) BVHModel, geometry of each object
+        objects: (2,) CollisionObject, passed to an FCL callback
+        other:   CollisionManager, self for a query inside this
+                 manager, or None for a query with an external object
+
+        Returns
+        -----------
+        pairs: list of (2,) str, every pair of names the objects could
+               be, with the name from this manager first
+        names: (2,) str, one of pairs in the order of the FCL query
+        """
+        first = self._extract_names(geoms[0], objects[0])
+        second = self._extract_names(geoms[1], objects[1])
+        if other is self:
+            pairs = [(a, b) for a in first for b in second if a != b]
+            names = pairs[:1]
+        else:
+            if other is None:
+                other_first = other_second = ['__external']
+            else:
+                other_first = other._extract_names(geoms[0], objects[0])
+                other_second = other._extract_names(geoms[1], objects[1])
+
+            # FCL may return the pair in either order
+            forward = [(a, b) for a in first for b in other_second]
+            reverse = [(a, b) for a in second for b in other_first]
+            pairs = forward + reverse
+            names = forward[:1] + [i[::-1] for i in reverse[:1]]
+
+        if len(pairs) == 0:
+            raise ValueError('objects found by FCL are not in the ' +
+                             'collision manager, were transforms set ' +
+                             'without set_transform?')
+        return pairs, names[0]
+
+
+def _object_key(geom, obj):
+    """
+    Get a key to find an object by its geometry and transform.
+
+    Parameters
+    -----------
+    geom: BVHModel, the geometry of the object
+    obj:  CollisionObject, or a copy passed to an FCL callback
+
+    Returns
+    -----------
+    key: (int, bytes, bytes) id of geom, translation and rotation
+    """
+    translation = np.asanyarray(obj.getTranslation(), dtype=np.float64)
+    rotation = np.asanyarray(obj.getRotation(), dtype=np.float64)
+    return id(geom), translation.tostring(), rotation.tostring()
+
+
+def _contact_callback(objects):
+    """
+    Create an FCL collision callback which also records the pair
+    of CollisionObjects every contact was found between.
+
+    Parameters
+    -----------
+    objects: list, (o1, o2) will be appended for every contact
+
+    Returns
+    -----------
+    callback: function, to pass to an FCL collide
+    """
+    def callback(o1, o2, cdata):
+        count = len(cdata.result.contacts)
+        done = fcl.defaultCollisionCallback(o1, o2, cdata)
+        objects.extend([(o1, o2)] * (len(cdata.result.contacts) - count))
+        return done
+    return callback
+
+
+def _distance_callback(objects):
+    """
+    Create an FCL distance callback which also records the pair
+    of CollisionObjects the minimum distance was found between.
+
+    Parameters
+    -----------
+    objects: list, will be replaced with [o1, o2] of the closest pair
+
+    Returns
+    -----------
+    callback: function, to pass to an FCL distance
+    """
+    def callback(o1, o2, ddata):
+        if ddata.done:
+            return True, ddata.result.min_distance
+        # python- fcl replaces the faces and points of a result with
+        # those of every pair it is passed, so only keep the closest
+        result = fcl.DistanceResult()
+        fcl.distance(o1, o2, ddata.request, result)
+        if (len(objects) == 0 or
+                result.min_distance < ddata.result.min_distance):
+            ddata.result = result
+            objects[:] = [o1, o2]
+        distance = ddata.result.min_distance
+        return distance <= 0, distance
+    return callback
+
+
+def mesh_contacts(mesh_a,
+                  transform_a,
+                  mesh_b,
+                  transform_b,
+                  first_only=False,
+                  chunk=100000):
+    """
+    Find the pairs of faces where two meshes intersect, using the
+    triangle hierarchy of each mesh.
+
+    Parameters
+    -----------
+    mesh_a:      Trimesh object
+    transform_a: (4,4) float, transform of mesh_a into the world
+    mesh_b:      Trimesh object
+    transform_b: (4,4) float, transform of mesh_b into the world
+    first_only:  bool, stop after the first intersecting pair is found
+    chunk:       int, number of triangle pairs to test at once
+
+    Returns
+    -----------
+    faces:  (n,2) int, index of face in mesh_a and mesh_b
+    points: (n,3) float, contact point of each pair in the world frame
+    """
+    transform_a = np.asanyarray(transform_a, dtype=np.float64)
+    transform_b = np.asanyarray(transform_b, dtype=np.float64)
+
+    # intersection is unchanged by an affine transform so
+    # check mesh_b in the frame of mesh_a
+    relative = np.dot(np.linalg.inv(transform_a), transform_b)
+    pairs = mesh_a.triangles_bvh.query_pairs(mesh_b.triangles_bvh,
+                                             transform=relative)
+
+    faces = []
+    points = []
+    if len(pairs) > 0:
+        triangles_b = transformations.transform_points(
+            mesh_b.vertices, relative)[mesh_b.faces]
+
+    for start in range(0, len(pairs), chunk):
+        current = pairs[start:start + chunk]
+        hit, point = intersections.triangle_triangle(
+            mesh_a.triangles[current[:, 0]],
+            triangles_b[current[:, 1]])
+        if not hit.any():
+            continue
+        faces.append(current[hit])
+        points.append(point[hit])
+        if first_only:
+            faces = [faces[0][:1]]
+            points = [points[0][:1]]
+            break
+
+    if len(faces) == 0:
+        return np.zeros((0, 2), dtype=np.int64), np.zeros((0, 3))
+
+    faces = np.vstack(faces)
+    points = transformations.transform_points(np.vstack(points),
+                                              transform_a)
+    return faces, points
+
+
+def mesh_distance(mesh_a,
+                  transform_a,
+                  mesh_b,
+                  transform_b,
+                  upper=np.inf,
+                  chunk=100000):
+    """
+    Find the minimum distance between two meshes, using a branch
+    and bound traversal over pairs of nodes of their triangle
+    hierarchies. Meshes which intersect have a distance of zero.
+
+    Parameters
+    -----------
+    mesh_a:      Trimesh object
+    transform_a: (4,4) float, transform of mesh_a into the world
+    mesh_b:      Trimesh object
+    transform_b: (4,4) float, transform of mesh_b into the world
+    upper:       float, only distances below this are searched for
+    chunk:       int, number of triangle pairs to evaluate at once
+
+    Returns
+    -----------
+    distance: float, minimum distance or inf if not below upper
+    faces:    (2,) int, index of closest face in mesh_a and mesh_b
+              or None if not below upper
+    points:   (2,3) float, closest point on mesh_a and mesh_b in
+              the world frame or None if not below upper
+    """
+    if len(mesh_a.faces) == 0 or len(mesh_b.faces) == 0:
+        return np.inf, None, None
+
+    # crossing meshes are much cheaper to find with the
+    # overlap query than with the distance traversal
+    faces, points = mesh_contacts(mesh_a, transform_a,
+                                  mesh_b, transform_b,
+                                  first_only=True)
+    if len(faces) > 0:
+        return 0.0, faces[0], np.vstack((points, points))
+
+    tree_a = mesh_a.triangles_bvh
+    tree_b = mesh_b.triangles_bvh
+
+    # everything is evaluated in the world frame so non- rigid
+    # transforms still produce world distances
+    triangles_a = transformations.transform_points(
+        mesh_a.vertices, transform_a)[mesh_a.faces]
+    triangles_b = transformations.transform_points(
+        mesh_b.vertices, transform_b)[mesh_b.faces]
+    nodes_a = bvh.transform_bounds(tree_a.node_bounds, transform_a)
+    nodes_b = bvh.transform_bounds(tree_b.node_bounds, transform_b)
+    bounds_a = np.stack((triangles_a.min(axis=1),
+                         triangles_a.max(axis=1)), axis=1)
+    bounds_b = np.stack((triangles_b.min(axis=1),
+                         triangles_b.max(axis=1)), axis=1)
+
+    # the distance between any two vertices bounds the result
+    # so start with a vertex of b near a and its nearest vertex on a
+    vertices_a = triangles_a.reshape((-1, 3))
+    vertices_b = triangles_b.reshape((-1, 3))
+    near_b = vertices_b[((vertices_b - vertices_a.mean(axis=0)) ** 2).sum(
+        axis=1).argmin()]
+    near_a = vertices_a[((vertices_a - near_b) ** 2).sum(axis=1).argmin()]
+    best = min(float(upper), np.linalg.norm(near_a - near_b) + tol.merge)
+
+    result = None
+    a = np.zeros(1, dtype=np.int64)
+    b = np.zeros(1, dtype=np.int64)
+    while len(a) > 0:
+        keep = bvh.bounds_separation(nodes_a[a], nodes_b[b]) <= best
+        a, b, leaf_a, leaf_b = tree_a.expand_pairs(tree_b, a[keep], b[keep])
+        if len(leaf_a) == 0:
+            continue
+
+        pairs = bvh.leaf_pairs(tree_a, leaf_a, tree_b, leaf_b)
+        separation = bvh.bounds_separation(bounds_a[pairs[:, 0]],
+                                           bounds_b[pairs[:, 1]])
+        pairs = pairs[separation <= best]
+        separation = separation[separation <= best]
+
+        for start in range(0, len(pairs), chunk):
+            current = pairs[start:start + chunk]
+            current = current[separation[start:start + chunk] <= best]
+            if len(current) == 0:
+                continue
+            distance, closest = pair_distance(triangles_a[current[:, 0]],
+                                              triangles_b[current[:, 1]])
+            index = distance.argmin()
+            if distance[index] <= best:
+                best = distance[index]
+                result = (current[index], closest[index])
+
+    if result is None:
+        return np.inf, None, None
+    return best, result[0], result[1]
+
+
+class BVHRegistry(object):
+    """
+    A least recently used cache of BVH models keyed by the MD5 of
+    the mesh they were built from, which lets collision managers
+    over the same geometry share models rather than rebuilding them.
+    """
+
+    def __init__(self, size=256, build=None):
+        """
+        Parameters
+        ----------
+        size:  int, maximum number of models to keep
+        build: function, which takes a Trimesh object and returns a
+               model, mesh_to_BVH by default
+        """
+        self.size = int(size)
+        self._build = build
+        self._models = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.clear()
+
+    def get(self, mesh):
+        """
+        Get a model for a mesh, building it if it isn't cached.
+
+        Parameters
+        ----------
+        mesh: Trimesh object
+
+        Returns
+        ----------
+        model: fcl.BVHModel object, or result of build
+        """
+        key = mesh.md5()
+        with self._lock:
+            if key in self._models:
+                # move to the most recently used end
+                model = self._models.pop(key)
+                self._models[key] = model
+                self._hits += 1
+                return model
+
+        build = self._build
+        if build is None:
+            build = mesh_to_BVH
+        tic = time.time()
+        model = build(mesh)
+        toc = time.time()
+
+        with self._lock:
+            self._misses += 1
+            self._build_time += toc - tic
+            self._models[key] = model
+            while len(self._models) > self.size:
+                self._models.popitem(last=False)
+                self._evictions += 1
+        return model
+
+    def clear(self):
+        """
+        Remove every cached model and reset the metrics.
+        """
+        with self._lock:
+            self._models.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+            self._build_time = 0.0
+
+    def __len__(self):
+        return len(self._models)
+
+    def __contains__(self, mesh):
+        return mesh.md5() in self._models
+
+    @property
+    def metrics(self):
+        """
+        Statistics about how well the cache is being used.
+
+        Returns
+        ----------
+        metrics: dict with keys:
+                 'hits':       int, models returned from the cache
+                 'misses':     int, models which had to be built
+                 'evictions':  int, models dropped to stay under size
+                 'build_time': float, total seconds spent building
+                 'count':      int, models currently cached
+        """
+        with self._lock:
+            return {'hits': self._hits,
+                    'misses': self._misses,
+                    'evictions': self._evictions,
+                    'build_time': self._build_time,
+                    'count': len(self._models)}
+
+
+# the registry used by every CollisionManager
+bvh_registry = BVHRegistry()
 
 
 def mesh_to_BVH(mesh):
@@ -625,7 +1423,8 @@ def scene_to_collision(scene):
     Returns
     ------------
     manager: CollisionManager object
-    objects: {node name: CollisionObject}
+    objects: {node name: handle} as returned by add_object,
+             which depends on the engine of the manager
     """
     manager = CollisionManager()
     objects = {}
@@ -83,6 +83,7 @@ def convex_hull(obj, qhull_options='QbB Pp'):
     # flip the winding and normals to be outward facing
     faces[backwards] = np.fliplr(faces[backwards])
     normals[backwards] *= -1.0
+    crosses[backwards] *= -1.0
 
     # save the work we did to the cache so it doesn't have to be recomputed
     initial_cache = {'triangles_cross': crosses,
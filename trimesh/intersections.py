@@ -252,3 +252,285 @@ def planes_lines(plane_origins,
     on_plane += line_origins[valid]
 
     return on_plane, valid
+
+
+def triangle_triangle(a, b, return_segments=False):
+    """
+    Check corresponding pairs of triangles for intersection.
+
+    Triangles which aren't coplanar are checked by intersecting the
+    segment where each triangle crosses the plane of the other along
+    the line where the planes meet, following Moller 1997 "A Fast
+    Triangle- Triangle Intersection Test". Coplanar triangles are
+    checked with the distance between their edges and vertices.
+
+    Parameters
+    ----------
+    a: (n,3,3) float, triangles in space
+    b: (n,3,3) float, triangles in space
+    return_segments: bool, if True return the shared segments
+                     rather than their middle points
+
+    Returns
+    ----------
+    intersects: (n,) bool, whether each pair of triangles intersects
+    points:     (n,3) float, middle of the shared segment for
+                pairs which intersect, NaN otherwise
+    segments:   (n,2,3) float, only returned if return_segments,
+                the shared segment of each pair, which is a single
+                repeated point for coplanar pairs, NaN otherwise
+    """
+    from .triangles import pair_distance
+
+    a = np.asanyarray(a, dtype=np.float64)
+    b = np.asanyarray(b, dtype=np.float64)
+    if not util.is_shape(a, (-1, 3, 3)) or a.shape != b.shape:
+        raise ValueError('triangles must be (n,3,3) and correspond!')
+
+    intersects = np.zeros(len(a), dtype=np.bool)
+    segments = np.full((len(a), 2, 3), np.nan, dtype=np.float64)
+    if len(a) == 0:
+        if return_segments:
+            return intersects, segments
+        return intersects, segments[:, 0]
+
+    normal_a, valid_a = util.unitize(np.cross(a[:, 1] - a[:, 0],
+                                              a[:, 2] - a[:, 0]),
+                                     check_valid=True)
+    normal_b, valid_b = util.unitize(np.cross(b[:, 1] - b[:, 0],
+                                              b[:, 2] - b[:, 0]),
+                                     check_valid=True)
+    full_a = np.zeros((len(a), 3), dtype=np.float64)
+    full_b = np.zeros((len(a), 3), dtype=np.float64)
+    full_a[valid_a] = normal_a
+    full_b[valid_b] = normal_b
+
+    # signed distance of every vertex to the plane of the other
+    distance_a = np.einsum('nij,nj->ni', a - b[:, :1], full_b)
+    distance_b = np.einsum('nij,nj->ni', b - a[:, :1], full_a)
+    distance_a[np.abs(distance_a) < tol.merge] = 0.0
+    distance_b[np.abs(distance_b) < tol.merge] = 0.0
+
+    # pairs entirely on one side of a plane can't intersect
+    separated = np.logical_or(
+        np.logical_or((distance_a > 0).all(axis=1),
+                      (distance_a < 0).all(axis=1)),
+        np.logical_or((distance_b > 0).all(axis=1),
+                      (distance_b < 0).all(axis=1)))
+
+    direction = np.cross(full_a, full_b)
+    coplanar = util.diagonal_dot(direction, direction) < tol.zero
+    check = np.logical_and(np.logical_not(separated),
+                           np.logical_not(coplanar))
+
+    if check.any():
+        # the line where the planes meet
+        line = util.unitize(direction[check])
+        low_a, high_a = _plane_segment(a[check], distance_a[check], line)
+        low_b, high_b = _plane_segment(b[check], distance_b[check], line)
+
+        # the segments of the two triangles along the line overlap
+        low = np.where((low_a[:, 0] >= low_b[:, 0]).reshape((-1, 1)),
+                       low_a, low_b)
+        high = np.where((high_a[:, 0] <= high_b[:, 0]).reshape((-1, 1)),
+                        high_a, high_b)
+        ok = low[:, 0] <= high[:, 0] + tol.merge
+
+        index = np.nonzero(check)[0][ok]
+        intersects[index] = True
+        segments[index, 0] = low[ok, 1:]
+        segments[index, 1] = high[ok, 1:]
+
+    # triangles in the same plane touch if their edges or
+    # vertices do, which includes degenerate triangles
+    check = np.logical_and(np.logical_not(separated), coplanar)
+    if check.any():
+        distance, closest = pair_distance(a[check], b[check])
+        ok = distance < tol.merge
+        index = np.nonzero(check)[0][ok]
+        intersects[index] = True
+        segments[index] = closest[ok].mean(axis=1).reshape((-1, 1, 3))
+
+    if return_segments:
+        return intersects, segments
+    return intersects, segments.mean(axis=1)
+
+
+def _plane_segment(triangles, distance, line):
+    """
+    Find the segment where triangles cross a plane, as positions
+    along a line in that plane.
+
+    Parameters
+    ----------
+    triangles: (n,3,3) float, triangles in space
+    distance:  (n,3) float, signed distance of vertices to the plane
+               with values on the plane set to exactly zero
+    line:      (n,3) float, unit direction of line in the plane
+
+    Returns
+    ----------
+    low:  (n,4) float, position along line and point of first end
+    high: (n,4) float, position along line and point of second end,
+          with position below low if triangle doesn't cross the plane
+    """
+    count = len(triangles)
+    candidates = np.zeros((count, 6, 3), dtype=np.float64)
+    valid = np.zeros((count, 6), dtype=np.bool)
+    for i in range(3):
+        j = (i + 1) % 3
+        # vertices on the plane
+        candidates[:, i] = triangles[:, i]
+        valid[:, i] = distance[:, i] == 0.0
+        # edges crossing the plane
+        cross = distance[:, i] * distance[:, j] < 0.0
+        ratio = np.zeros(count)
+        ratio[cross] = distance[cross, i] / (distance[cross, i] -
+                                             distance[cross, j])
+        candidates[:, i + 3] = (triangles[:, i] + (
+            triangles[:, j] - triangles[:, i]) * ratio.reshape((-1, 1)))
+        valid[:, i + 3] = cross
+
+    position = np.einsum('nij,nj->ni', candidates, line)
+    index = np.arange(count)
+    first = np.where(valid, position, np.inf).argmin(axis=1)
+    second = np.where(valid, position, -np.inf).argmax(axis=1)
+
+    low = np.column_stack((position[index, first],
+                           candidates[index, first]))
+    high = np.column_stack((position[index, second],
+                            candidates[index, second]))
+    # triangles which don't reach the plane get an empty segment
+    empty = np.logical_not(valid.any(axis=1))
+    low[empty, 0] = np.inf
+    high[empty, 0] = -np.inf
+    return low, high
+
+
+def mesh_self(mesh, return_segments=False, chunk=100000):
+    """
+    Find pairs of faces of a mesh which intersect each other,
+    ignoring faces which share an edge.
+
+    Candidate pairs come from the triangle hierarchy of the mesh,
+    and are checked with triangle_triangle. Faces which share a
+    single vertex are only reported if they touch somewhere else.
+
+    Parameters
+    ----------
+    mesh:            Trimesh object, with merged vertices
+    return_segments: bool, if True return the shared segments
+    chunk:           int, number of face pairs to check at once
+
+    Returns
+    ----------
+    pairs:    (n,2) int, index of faces which intersect
+    segments: (n,2,3) float, only returned if return_segments,
+              where each pair of faces intersects
+    """
+    pairs = mesh.triangles_bvh.query_pairs()
+
+    hit = np.zeros(len(pairs), dtype=np.bool)
+    segments = [np.zeros((0, 2, 3))]
+    faces = mesh.faces
+    triangles = mesh.triangles
+    for start in range(0, len(pairs), chunk):
+        end = start + chunk
+        a = triangles[pairs[start:end, 0]]
+        b = triangles[pairs[start:end, 1]]
+        current, segment = triangle_triangle(a, b, return_segments=True)
+
+        # which vertex of the first face is which of the second
+        match = (faces[pairs[start:end, 0]].reshape((-1, 3, 1)) ==
+                 faces[pairs[start:end, 1]].reshape((-1, 1, 3)))
+        shared = match.sum(axis=(1, 2))
+        # faces which share an edge always touch along it
+        current[shared > 1] = False
+        # faces which share a vertex always touch there
+        one = shared == 1
+        if one.any():
+            current[one] = _fan_crossing(a[one], b[one], match[one])
+
+        hit[start:end] = current
+        segments.append(segment[current])
+
+    if return_segments:
+        return pairs[hit], np.vstack(segments)
+    return pairs[hit]
+
+
+def _fan_crossing(a, b, match):
+    """
+    Check pairs of triangles which share one vertex for contact
+    anywhere other than that vertex, which happens exactly when the
+    edge opposite the shared vertex of one touches the other.
+
+    Parameters
+    ----------
+    a:     (n,3,3) float, triangles in space
+    b:     (n,3,3) float, triangles in space
+    match: (n,3,3) bool, whether vertex i of a is vertex j of b
+
+    Returns
+    ----------
+    crossing: (n,) bool, whether each pair touches away from the vertex
+    """
+    index = np.arange(len(a))
+    shared_a = match.any(axis=2).argmax(axis=1)
+    shared_b = match.any(axis=1).argmax(axis=1)
+    return np.logical_or(
+        _segment_triangle(a[index, (shared_a + 1) % 3],
+                          a[index, (shared_a + 2) % 3],
+                          b),
+        _segment_triangle(b[index, (shared_b + 1) % 3],
+                          b[index, (shared_b + 2) % 3],
+                          a))
+
+
+def _segment_triangle(start, end, triangles):
+    """
+    Check corresponding line segments and triangles for contact.
+
+    Parameters
+    ----------
+    start:     (n,3) float, first point of each segment
+    end:       (n,3) float, second point of each segment
+    triangles: (n,3,3) float, triangles in space
+
+    Returns
+    ----------
+    touch: (n,) bool, whether each segment touches its triangle
+    """
+    from .triangles import closest_point, segments_closest
+
+    def squared(points):
+        # squared distance from points to the triangles
+        return ((closest_point(triangles, points) - points) ** 2).sum(axis=1)
+
+    # the ends of the segment, and the segment against every edge
+    candidates = [squared(start), squared(end)]
+    for i in range(3):
+        on_segment, on_edge = segments_closest(start,
+                                               end,
+                                               triangles[:, i],
+                                               triangles[:, (i + 1) % 3])
+        candidates.append(((on_segment - on_edge) ** 2).sum(axis=1))
+
+    # the segment passing through the middle of the triangle
+    normal, valid = util.unitize(np.cross(triangles[:, 1] - triangles[:, 0],
+                                          triangles[:, 2] - triangles[:, 0]),
+                                 check_valid=True)
+    full = np.zeros((len(triangles), 3), dtype=np.float64)
+    full[valid] = normal
+    distance_start = util.diagonal_dot(start - triangles[:, 0], full)
+    distance_end = util.diagonal_dot(end - triangles[:, 0], full)
+    cross = distance_start * distance_end < 0.0
+    ratio = np.zeros(len(triangles), dtype=np.float64)
+    ratio[cross] = distance_start[cross] / (distance_start[cross] -
+                                            distance_end[cross])
+    through = start + (end - start) * ratio.reshape((-1, 1))
+    piercing = np.full(len(triangles), np.inf)
+    piercing[cross] = squared(through)[cross]
+    candidates.append(piercing)
+
+    return np.min(candidates, axis=0) < tol.merge ** 2
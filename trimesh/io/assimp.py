@@ -2,7 +2,7 @@ import tempfile
 import numpy as np
 
 
-def load_pyassimp(file_obj, file_type=None):
+def load_pyassimp(file_obj, file_type=None, **kwargs):
     '''
     Use the pyassimp library to load a mesh, from a file object and type,
     or filename (if file_obj is a string)
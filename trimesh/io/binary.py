@@ -0,0 +1,302 @@
+"""
+A native binary format for Trimesh and Scene objects.
+
+The file is a small fixed header, a JSON description of the
+contents, and then uncompressed arrays which are each aligned
+so they can be memory mapped and used without any parsing.
+"""
+
+import json
+
+import numpy as np
+
+from .. import util
+
+from ..constants import log
+
+# the first bytes of every file
+_magic = b'TRIMESHB'
+
+# the layout version written by this module; it is only increased
+# for changes older readers can't handle, as readers skip
+# any JSON keys and arrays they don't know about
+_version = 1
+
+# magic, version, and the length of the JSON description
+_dtype_header = np.dtype([('magic', 'S8'),
+                          ('version', '<u4'),
+                          ('length', '<u4')])
+
+# byte alignment of the start of the data section and every array
+_align = 64
+
+
+def export_trimesh(mesh, file_obj=None, include_cache=False):
+    """
+    Export a mesh in the native binary format.
+
+    Parameters
+    ------------
+    mesh:          Trimesh object
+    file_obj:      None, or open file object to write to, where the
+                   arrays are written one at a time without copying
+    include_cache: bool, also store arrays from the mesh cache
+                   so they don't have to be recomputed on load
+
+    Returns
+    ----------
+    export: bytes, exported result, or None if file_obj was passed
+    """
+    arrays = []
+    header = {'class': 'Trimesh',
+              'mesh': _mesh_header(mesh, arrays, include_cache)}
+    return _write(header, arrays, file_obj)
+
+
+def export_scene(scene, file_obj=None, include_cache=False):
+    """
+    Export a scene in the native binary format.
+
+    Parameters
+    ------------
+    scene:         trimesh.Scene object
+    file_obj:      None, or open file object to write to, where the
+                   arrays are written one at a time without copying
+    include_cache: bool, also store arrays from the mesh caches
+                   so they don't have to be recomputed on load
+
+    Returns
+    ----------
+    export: bytes, exported result, or None if file_obj was passed
+    """
+    arrays = []
+    geometry = {}
+    for name, mesh in scene.geometry.items():
+        if not util.is_instance_named(mesh, 'Trimesh'):
+            log.warning('skipping geometry %s which is not a Trimesh',
+                        name)
+            continue
+        geometry[name] = _mesh_header(mesh, arrays, include_cache)
+
+    header = {'class': 'Scene',
+              'geometry': geometry,
+              'graph': scene.graph.to_edgelist(),
+              'base_frame': scene.graph.base_frame,
+              'metadata': util.tolist_dict(scene.metadata)}
+    return _write(header, arrays, file_obj)
+
+
+def load_trimesh(file_obj, file_type=None, **kwargs):
+    """
+    Load a file in the native binary format.
+
+    Files on disk are memory mapped copy- on- write, so every array
+    is a view of the file which is only read when it is used.
+
+    Parameters
+    ------------
+    file_obj:  open file object
+    file_type: not used
+
+    Returns
+    ------------
+    loaded: dict, kwargs for a Trimesh constructor or for a
+            Scene as loaded by load_kwargs
+    """
+    start = file_obj.tell()
+    head = np.frombuffer(file_obj.read(_dtype_header.itemsize),
+                         dtype=_dtype_header)
+    if len(head) != 1 or head['magic'][0] != _magic:
+        raise ValueError('file is not a trimesh binary file!')
+
+    version = int(head['version'][0])
+    if version > _version:
+        raise ValueError('file version %d is newer than supported %d!' %
+                         (version, _version))
+
+    length = int(head['length'][0])
+    header = json.loads(file_obj.read(length).decode('utf-8'))
+
+    # the data section starts after the padded JSON
+    data_start = start + _aligned(_dtype_header.itemsize + length)
+    try:
+        # map files on disk rather than reading them into memory
+        data = np.memmap(file_obj,
+                         dtype=np.uint8,
+                         mode='c',
+                         offset=data_start)
+    except (AttributeError, IOError, ValueError):
+        # file objects in memory are read once into a mutable
+        # buffer so the loaded arrays are writeable
+        file_obj.seek(data_start)
+        data = np.frombuffer(bytearray(file_obj.read()),
+                             dtype=np.uint8)
+
+    if header['class'] == 'Scene':
+        geometry = {name: _mesh_kwargs(mesh, data) for name, mesh
+                    in header['geometry'].items()}
+        return {'class': 'Scene',
+                'geometry': geometry,
+                'graph': header['graph'],
+                'base_frame': header['base_frame'],
+                'metadata': header['metadata']}
+
+    return _mesh_kwargs(header['mesh'], data)
+
+
+def _aligned(position):
+    """
+    Round a position up to the next multiple of the alignment.
+    """
+    return int(np.ceil(position / float(_align)) * _align)
+
+
+def _mesh_header(mesh, arrays, include_cache):
+    """
+    Describe a mesh for the JSON header, appending the arrays
+    to be written after it.
+
+    Parameters
+    ------------
+    mesh:          Trimesh object
+    arrays:        list, of (offset, array), will be appended to
+    include_cache: bool, include arrays from the mesh cache
+
+    Returns
+    ------------
+    described: dict, with metadata and array descriptions
+    """
+    stored = {'vertices': mesh.vertices,
+              'faces': mesh.faces,
+              'face_normals': mesh.face_normals}
+    if 'vertex_normals' in mesh._cache:
+        stored['vertex_normals'] = mesh.vertex_normals
+    if mesh.visual.kind == 'face':
+        stored['face_colors'] = mesh.visual.face_colors
+    elif mesh.visual.kind == 'vertex':
+        stored['vertex_colors'] = mesh.visual.vertex_colors
+
+    cache = {}
+    if include_cache:
+        # check the cache is current before saving it
+        mesh._cache.verify()
+        for key, value in mesh._cache.cache.items():
+            if (key not in stored and
+                isinstance(value, np.ndarray) and
+                    value.dtype.kind in 'biuf'):
+                cache[key] = value
+
+    return {'metadata': util.tolist_dict(mesh.metadata),
+            'arrays': {k: _describe(v, arrays) for k, v in stored.items()},
+            'cache': {k: _describe(v, arrays) for k, v in cache.items()}}
+
+
+def _describe(array, arrays):
+    """
+    Describe an array for the JSON header and add it to
+    the list of arrays to be written.
+
+    Parameters
+    ------------
+    array:  numpy array
+    arrays: list, of (offset, array) to be written, will be appended to
+
+    Returns
+    ------------
+    described: dict, with dtype, shape and byte offset in data section
+    """
+    array = np.ascontiguousarray(array)
+    # the offset in the data section, after the previous array
+    if len(arrays) == 0:
+        offset = 0
+    else:
+        offset = _aligned(arrays[-1][0] + arrays[-1][1].nbytes)
+    arrays.append((offset, array))
+    return {'dtype': array.dtype.str,
+            'shape': list(array.shape),
+            'offset': offset}
+
+
+def _mesh_kwargs(described, data):
+    """
+    Create Trimesh constructor kwargs from a mesh description.
+
+    Parameters
+    ------------
+    described: dict, from _mesh_header
+    data:      (n,) uint8, data section of the file
+
+    Returns
+    ------------
+    kwargs: dict, for the Trimesh constructor
+    """
+    kwargs = {k: _read_array(v, data) for k, v in
+              described['arrays'].items()}
+    kwargs['initial_cache'] = {k: _read_array(v, data) for k, v in
+                               described.get('cache', {}).items()}
+    kwargs['metadata'] = described.get('metadata', {})
+    # the mesh was exported as it was, with nothing to clean up
+    kwargs['process'] = False
+    return kwargs
+
+
+def _read_array(described, data):
+    """
+    Get an array from the data section as a view without copying.
+
+    Parameters
+    ------------
+    described: dict, with dtype, shape and offset
+    data:      (n,) uint8, data section of the file
+
+    Returns
+    ------------
+    array: numpy array, view of data
+    """
+    dtype = np.dtype(str(described['dtype']))
+    shape = tuple(described['shape'])
+    start = int(described['offset'])
+    end = start + int(np.prod(shape)) * dtype.itemsize
+    if end > len(data):
+        raise ValueError('array runs past the end of the file!')
+    return np.asarray(data[start:end]).view(dtype).reshape(shape)
+
+
+def _write(header, arrays, file_obj):
+    """
+    Write a JSON header and aligned arrays.
+
+    Parameters
+    ------------
+    header:   dict, JSON serializable description of the file
+    arrays:   list, of (offset, array) from _describe
+    file_obj: None, or open file object to write to
+
+    Returns
+    ----------
+    export: bytes, exported result, or None if file_obj was passed
+    """
+    content = json.dumps(header).encode('utf-8')
+    # pad the JSON with spaces so the data section is aligned
+    length = _aligned(_dtype_header.itemsize + len(content))
+    content += b' ' * (length - _dtype_header.itemsize - len(content))
+
+    head = np.zeros(1, dtype=_dtype_header)
+    head['magic'] = _magic
+    head['version'] = _version
+    head['length'] = len(content)
+
+    def chunks():
+        yield head.tostring()
+        yield content
+        position = 0
+        for offset, array in arrays:
+            # padding to align the start of the array
+            yield b'\x00' * (offset - position)
+            yield array
+            position = offset + array.nbytes
+
+    return util.write_chunks(chunks(), file_obj=file_obj)
+
+
+_binary_loaders = {'trimesh': load_trimesh}
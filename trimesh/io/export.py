@@ -8,6 +8,7 @@ from .wavefront import _obj_exporters
 from .urdf import export_urdf
 from .stl import export_stl, export_stl_ascii
 from .ply import _ply_exporters
+from .binary import export_trimesh
 
 
 def export_mesh(mesh, file_obj, file_type=None):
@@ -41,12 +42,16 @@ def export_mesh(mesh, file_obj, file_type=None):
         raise ValueError('%s exporter not available!', file_type)
 
     log.debug('Exporting %d faces as %s', len(mesh.faces), file_type.upper())
-    export = _mesh_exporters[file_type](mesh)
-
-    if hasattr(file_obj, 'write'):
-        result = util.write_encoded(file_obj, export)
+    if hasattr(file_obj, 'write') and file_type in _stream_exporters:
+        # write the export a chunk at a time rather than
+        # creating the whole thing in memory first
+        result = _mesh_exporters[file_type](mesh, file_obj=file_obj)
     else:
-        result = export
+        export = _mesh_exporters[file_type](mesh)
+        if hasattr(file_obj, 'write'):
+            result = util.write_encoded(file_obj, export)
+        else:
+            result = export
 
     if was_opened:
         file_obj.close()
@@ -54,31 +59,49 @@ def export_mesh(mesh, file_obj, file_type=None):
     return result
 
 
-def export_off(mesh):
+def export_off(mesh, file_obj=None, chunk=100000):
     '''
     Export a mesh as an OFF file, a simple text format
 
     Parameters
     -----------
-    mesh: Trimesh object
+    mesh:     Trimesh object
+    file_obj: None, or open file object to write to a
+              number of vertices and faces at a time
+    chunk:    int, number of vertices or faces to format at once
 
     Returns
     -----------
-    export: str, string of OFF format output
+    export: str, string of OFF format output,
+            or None if file_obj was passed
     '''
-    # prepend a 3 (face count) to each face
-    faces_stacked = np.column_stack((np.ones(len(mesh.faces)) * 3,
-                                     mesh.faces)).astype(np.int64)
-    export = 'OFF\n'
-    export += str(len(mesh.vertices)) + ' ' + str(len(mesh.faces)) + ' 0\n'
-    export += util.array_to_string(mesh.vertices,
-                                   col_delim=' ',
-                                   row_delim='\n',
-                                   digits=8) + '\n'
-    export += util.array_to_string(faces_stacked,
-                                   col_delim=' ',
-                                   row_delim='\n')
-    return export
+    # get arrays once rather than checking the cache every chunk
+    faces = mesh.faces
+    vertices = mesh.vertices
+
+    def chunks():
+        yield 'OFF\n'
+        yield str(len(vertices)) + ' ' + str(len(faces)) + ' 0\n'
+        for formatted in util.array_to_string_chunks(vertices,
+                                                     chunk=chunk,
+                                                     col_delim=' ',
+                                                     row_delim='\n',
+                                                     digits=8):
+            yield formatted
+        yield '\n'
+        for start in range(0, len(faces), chunk):
+            # prepend a 3 (face count) to each face
+            current = faces[start:start + chunk]
+            faces_stacked = np.column_stack((np.ones(len(current)) * 3,
+                                             current)).astype(np.int64)
+            formatted = util.array_to_string(faces_stacked,
+                                             col_delim=' ',
+                                             row_delim='\n')
+            if start > 0:
+                formatted = '\n' + formatted
+            yield formatted
+
+    return util.write_chunks(chunks(), file_obj=file_obj)
 
 
 def export_collada(mesh):
@@ -155,7 +178,11 @@ _mesh_exporters = {'stl': export_stl,
                    'dict64': export_dict64,
                    'msgpack': export_msgpack,
                    'collada': export_collada,
-                   'stl_ascii': export_stl_ascii}
+                   'stl_ascii': export_stl_ascii,
+                   'trimesh': export_trimesh}
 
 _mesh_exporters.update(_ply_exporters)
 _mesh_exporters.update(_obj_exporters)
+
+# exporters which accept a file object to write to in chunks
+_stream_exporters = set(['stl', 'stl_ascii', 'off', 'ply', 'obj', 'trimesh'])
@@ -7,6 +7,8 @@ import collections
 
 import numpy as np
 
+from .. import util
+
 # magic numbers which have meaning in GLTF
 # most are uint32's of UTF-8 text
 _magic = {'gltf': 1179937895,
@@ -14,17 +16,18 @@ _magic = {'gltf': 1179937895,
           'bin': 5130562}
 
 # GLTF data type codes: numpy dtypes
-_types = {5120: np.bool,
+_types = {5120: np.int8,
+          5121: np.uint8,
           5122: np.int16,
           5123: np.uint16,
           5125: np.uint32,
           5126: np.float32}
 
-# GLTF data formats: numpy shapes
-_shapes = {'SCALAR': -1,
-           'VEC2': (-1, 2),
-           'VEC3': (-1, 3),
-           'VEC4': (-1, 4),
+# GLTF data formats: numpy shapes of a single element
+_shapes = {'SCALAR': (),
+           'VEC2': (2,),
+           'VEC3': (3,),
+           'VEC4': (4,),
            'MAT2': (2, 2),
            'MAT3': (3, 3),
            'MAT4': (4, 4)}
@@ -51,8 +54,8 @@ def export_gltf(scene):
     buffers = []
     views = []
     files = {}
-    for i, name in zip(range(0, len(buffer_items), 2),
-                       scene.geometry.keys()):
+    for i, mesh in zip(range(0, len(buffer_items), 2),
+                       tree['meshes']):
 
         # create the buffer views
         current_pos = 0
@@ -60,12 +63,13 @@ def export_gltf(scene):
             current_item = buffer_items[i + j]
             views.append({"buffer": len(buffers),
                           "byteOffset": current_pos,
-                          "byteLength": len(current_item)})
-            current_pos += len(current_item)
+                          "byteLength": current_item.nbytes})
+            current_pos += current_item.nbytes
 
         # the data is just appended
-        buffer_data = bytes().join(buffer_items[i:i + 2])
-        buffer_name = 'mesh_' + name + '.bin'
+        buffer_data = bytes().join(item.tostring() for item in
+                                   buffer_items[i:i + 2])
+        buffer_name = 'mesh_' + mesh['name'] + '.bin'
         buffers.append({'uri': buffer_name,
                         'byteLength': len(buffer_data)})
         files[buffer_name] = buffer_data
@@ -77,17 +81,19 @@ def export_gltf(scene):
     return files
 
 
-def export_glb(scene):
+def export_glb(scene, file_obj=None):
     """
     Export a scene as a binary GLTF (GLB) file.
 
     Parameters
     ------------
-    scene: trimesh.Scene object
+    scene:    trimesh.Scene object
+    file_obj: None, or open file object to write to, where the
+              mesh data is written one buffer at a time
 
     Returns
     ----------
-    exported: bytes, exported result
+    exported: bytes, exported result, or None if file_obj was passed
     """
 
     tree, buffer_items = _create_gltf_structure(scene)
@@ -99,20 +105,19 @@ def export_glb(scene):
     for current_item in buffer_items:
         views.append({"buffer": 0,
                       "byteOffset": current_pos,
-                      "byteLength": len(current_item)})
-        current_pos += len(current_item)
-
-        # the data is just appended
-    buffer_data = bytes().join(buffer_items)
+                      "byteLength": current_item.nbytes})
+        current_pos += current_item.nbytes
+    # the total length of the binary data
+    buffer_length = current_pos
 
-    tree['buffers'] = [{'byteLength': len(buffer_data)}]
+    tree['buffers'] = [{'byteLength': buffer_length}]
     tree['bufferViews'] = views
 
     # export the tree to JSON for the content of the file
     content = json.dumps(tree)
     # add spaces to content, so the start of the data
     # is 4 byte aligned as per spec
-    content += ((len(content) + 20) % 4) * ' '
+    content += ((4 - len(content) % 4) % 4) * ' '
     content = content.encode('utf-8')
 
     # the initial header of the file
@@ -120,7 +125,7 @@ def export_glb(scene):
                        2,  # GLTF version
                        # length is the total length of the Binary glTF
                        # including Header and all Chunks, in bytes.
-                       len(content) + len(buffer_data) + 28,
+                       len(content) + buffer_length + 28,
                        # contentLength is the length, in bytes,
                        # of the glTF content (JSON)
                        len(content),
@@ -129,16 +134,20 @@ def export_glb(scene):
                       dtype=np.uint32)
 
     # the header of the binary data section
-    bin_header = np.array([len(buffer_data),
+    bin_header = np.array([buffer_length,
                            0x004E4942],
                           dtype=np.uint32)
 
-    exported = (header.tostring() +
-                content +
-                bin_header.tostring() +
-                buffer_data)
+    def chunks():
+        yield header.tostring()
+        yield content
+        yield bin_header.tostring()
+        # write the buffers one at a time so the whole
+        # file is never concatenated in memory
+        for item in buffer_items:
+            yield item.tostring()
 
-    return exported
+    return util.write_chunks(chunks(), file_obj=file_obj)
 
 
 def load_glb(file_obj, **passed):
@@ -162,53 +171,59 @@ def load_glb(file_obj, **passed):
     start = file_obj.tell()
     # read the first 20 bytes which contain section lengths
     head_data = file_obj.read(20)
-    head = np.fromstring(head_data,
+    head = np.frombuffer(head_data,
                          dtype=np.uint32)
 
     # check to make sure first index is gltf
     # and second is 2, for GLTF 2.0
-    if head[0] != _magic['gltf'] or head[1] != 2:
+    if len(head) != 5 or head[0] != _magic['gltf'] or head[1] != 2:
         raise ValueError('file is not GLTF 2.0')
 
     # overall file length
     # first chunk length
     # first chunk type
-    length, chunk_length, chunk_type = head[2:]
+    length, chunk_length, chunk_type = (int(i) for i in head[2:])
 
     # first chunk should be JSON header
     if chunk_type != _magic['json']:
         raise ValueError('no initial JSON header!')
 
-    # np.uint32 causes an error in read, so we convert to native int
-    # for the length passed to read, for the JSON header
-    json_data = file_obj.read(int(chunk_length))
-    # convert to text
-    if hasattr(json_data, 'decode'):
-        json_data = json_data.decode('utf-8')
+    try:
+        # map files on disk rather than reading them into memory
+        # so accessors are views which are only read when used
+        data = np.memmap(file_obj,
+                         dtype=np.uint8,
+                         mode='r',
+                         offset=start,
+                         shape=(length,))
+    except (AttributeError, IOError, ValueError):
+        # file objects in memory are read once and not copied
+        file_obj.seek(start)
+        data = np.frombuffer(file_obj.read(length), dtype=np.uint8)
+    if len(data) != length:
+        raise ValueError('file was not expected length!')
+    # leave the file object at the end of the GLB
+    file_obj.seek(start + length)
+
     # load the json header to native dict
+    json_data = data[20:20 + chunk_length].tostring().decode('utf-8')
     header = json.loads(json_data)
 
-    # read the binary data referred to by GLTF as 'buffers'
+    # views of the binary data referred to by GLTF as 'buffers'
     buffers = []
-    while (file_obj.tell() - start) < length:
-        # the last read put us past the JSON chunk
-        # we now read the chunk header, which is 8 bytes
-        chunk_head = file_obj.read(8)
-        if len(chunk_head) != 8:
-            # double check to make sure we didn't
-            # read the whole file
-            break
-
-        chunk_length, chunk_type = np.fromstring(chunk_head,
-                                                 dtype=np.uint32)
+    position = 20 + chunk_length
+    while position + 8 <= length:
+        # every chunk starts with an 8 byte header
+        chunk_length, chunk_type = data[position:position + 8].view(
+            np.uint32).astype(np.int64)
+        position += 8
         # make sure we have the right data type
         if chunk_type != _magic['bin']:
             raise ValueError('not binary GLTF!')
-        # read the chunk
-        chunk_data = file_obj.read(int(chunk_length))
-        if len(chunk_data) != chunk_length:
+        if position + chunk_length > length:
             raise ValueError('chunk was not expected length!')
-        buffers.append(chunk_data)
+        buffers.append(data[position:position + chunk_length])
+        position += chunk_length
 
     # turn the layout header and data into kwargs
     # that can be used to instantiate a trimesh.Scene object
@@ -256,14 +271,23 @@ def _create_gltf_structure(scene):
             'meshes': [],
             'materials': []}
 
-    # GLTF references meshes by index, so store them here
-    mesh_index = {name: i for i, name in enumerate(scene.geometry.keys())}
+    # GLTF references meshes by index, and identical meshes
+    # with the same material are only included once
+    mesh_index = {}
+    unique = collections.OrderedDict()
+    for name, mesh in scene.geometry.items():
+        material = _mesh_to_material(mesh)
+        key = (mesh.md5(), json.dumps(material, sort_keys=True))
+        if key not in unique:
+            unique[key] = (len(unique), name, mesh, material)
+        mesh_index[name] = unique[key][0]
+
     # grab the flattened scene graph in GLTF's format
     nodes = scene.graph.to_gltf(mesh_index=mesh_index)
     tree.update(nodes)
 
     buffer_items = []
-    for name, mesh in scene.geometry.items():
+    for index, name, mesh, material in unique.values():
         # meshes reference accessor indexes
         tree['meshes'].append({"name": name,
                                "primitives": [
@@ -273,7 +297,7 @@ def _create_gltf_structure(scene):
                                     "mode": 4,  # mode 4 is GL_TRIANGLES
                                     'material': len(tree['materials'])}]})
 
-        tree['materials'].append(_mesh_to_material(mesh))
+        tree['materials'].append(material)
 
         # accessors refer to data locations
         # mesh faces are stored as flat list of integers
@@ -292,16 +316,34 @@ def _create_gltf_structure(scene):
                                   "max": mesh.vertices.max(axis=0).tolist(),
                                   "min": mesh.vertices.min(axis=0).tolist()})
 
-        # convert to the correct dtypes
+        # the correct dtypes, which are only converted when
+        # written to keep a single converted copy in memory
         # 5126 is a float32
         # 5125 is an unsigned 32 bit integer
         # add faces, then vertices
-        buffer_items.append(mesh.faces.astype(np.uint32).tostring())
-        buffer_items.append(mesh.vertices.astype(np.float32).tostring())
+        buffer_items.append(_BufferItem(mesh.faces, np.uint32))
+        buffer_items.append(_BufferItem(mesh.vertices, np.float32))
 
     return tree, buffer_items
 
 
+class _BufferItem(object):
+    """
+    An array to be written to a GLTF buffer as a specific dtype.
+    """
+
+    def __init__(self, data, dtype):
+        self.data = data
+        self.dtype = np.dtype(dtype)
+
+    @property
+    def nbytes(self):
+        return self.data.size * self.dtype.itemsize
+
+    def tostring(self):
+        return self.data.astype(self.dtype).tostring()
+
+
 def _read_buffers(header, buffers):
     """
     Given a list of binary data and a layout, return the
@@ -310,31 +352,21 @@ def _read_buffers(header, buffers):
     Parameters
     -----------
     header:  dict, with GLTF keys
-    buffers: list, of bytes
+    buffers: list, of (n,) uint8 arrays
 
     Returns
     -----------
     kwargs: can be passed to load_kwargs for a trimesh.Scene
     """
-    # split buffer data into buffer views
-    views = []
-    for view in header['bufferViews']:
-        start = view['byteOffset']
-        end = start + view['byteLength']
-        views.append(buffers[view['buffer']][start:end])
-        assert len(views[-1]) == view['byteLength']
-
-    # load data from buffers and bufferviews into numpy arrays
-    # using the layout described by accessors
-    access = []
-    for a in header['accessors']:
-        data = views[a['bufferView']]
-        dtype = _types[a['componentType']]
-        shape = _shapes[a['type']]
-        array = np.fromstring(data,
-                              dtype=dtype).reshape(shape)
-        assert len(array) == a['count']
-        access.append(array)
+    # accessors are only created when a primitive uses them
+    access = {}
+
+    def accessor(index):
+        if index not in access:
+            access[index] = _read_accessor(header=header,
+                                           buffers=buffers,
+                                           index=index)
+        return access[index]
 
     # turn materials into a simple list of colors if populated
     colors = []
@@ -354,12 +386,16 @@ def _read_buffers(header, buffers):
         for p in m['primitives']:
             if p['mode'] != 4:
                 raise ValueError('only GL_TRIANGLES meshes supported!')
-            kwargs['faces'].append(access[p['indices']].reshape((-1, 3)))
-            kwargs['vertices'].append(access[p['attributes']['POSITION']])
+            kwargs['faces'].append(accessor(p['indices']).reshape((-1, 3)))
+            kwargs['vertices'].append(accessor(p['attributes']['POSITION']))
             if 'material' in p:
                 color = colors[p['material']]
         for key, value in kwargs.items():
-            kwargs[key] = np.vstack(value)
+            if len(value) == 1:
+                # a single primitive can stay a view of the buffer
+                kwargs[key] = value[0]
+            else:
+                kwargs[key] = np.vstack(value)
         kwargs['face_colors'] = color
         meshes[m['name']] = kwargs
 
@@ -427,4 +463,46 @@ def _read_buffers(header, buffers):
     return result
 
 
+def _read_accessor(header, buffers, index):
+    """
+    Create a numpy array from an accessor, which is a view of the
+    buffer it is stored in rather than a copy.
+
+    Parameters
+    -----------
+    header:  dict, with GLTF keys
+    buffers: list, of (n,) uint8 arrays
+    index:   int, index of accessor in header
+
+    Returns
+    -----------
+    array: (count, ...) view of the accessor data
+    """
+    a = header['accessors'][index]
+    view = header['bufferViews'][a['bufferView']]
+    buffer = buffers[view['buffer']]
+
+    dtype = np.dtype(_types[a['componentType']])
+    shape = (a['count'],) + _shapes[a['type']]
+    # the size of a single element of the accessor
+    size = int(np.prod(shape[1:])) * dtype.itemsize
+
+    # elements may be interleaved with other data
+    stride = view.get('byteStride', size)
+    offset = view.get('byteOffset', 0) + a.get('byteOffset', 0)
+    if a['count'] > 0 and (offset + stride * (a['count'] - 1) + size >
+                           view.get('byteOffset', 0) + view['byteLength']):
+        raise ValueError('accessor is outside of its buffer view!')
+
+    # strides of the components within an element
+    inner = tuple(np.cumprod((dtype.itemsize,) +
+                             shape[:0:-1])[:-1][::-1].tolist())
+    array = np.ndarray(shape=shape,
+                       dtype=dtype,
+                       buffer=buffer,
+                       offset=offset,
+                       strides=(stride,) + inner)
+    return array
+
+
 _gltf_loaders = {'glb': load_glb}
@@ -14,6 +14,7 @@ from . import misc
 from .ply import _ply_loaders
 from .stl import _stl_loaders
 from .misc import _misc_loaders
+from .binary import _binary_loaders
 from .gltf import _gltf_loaders
 from .assimp import _assimp_loaders
 from .threemf import _three_loaders
@@ -126,7 +127,8 @@ def load_mesh(file_obj, file_type=None, **kwargs):
     # make sure we keep passed kwargs to loader
     # but also make sure loader keys override passed keys
     results = mesh_loaders[file_type](file_obj,
-                                      file_type=file_type)
+                                      file_type=file_type,
+                                      **kwargs)
 
     if util.is_file(file_obj):
         file_obj.close()
@@ -354,3 +356,4 @@ mesh_loaders.update(_xml_loaders)
 mesh_loaders.update(_obj_loaders)
 mesh_loaders.update(_gltf_loaders)
 mesh_loaders.update(_three_loaders)
+mesh_loaders.update(_binary_loaders)
@@ -5,7 +5,7 @@ import json
 from .. import util
 
 
-def load_off(file_obj, file_type=None):
+def load_off(file_obj, file_type=None, **kwargs):
     '''
     Load an OFF file into the kwargs for a Trimesh constructor
 
@@ -41,7 +41,7 @@ def load_off(file_obj, file_type=None):
             'faces': faces}
 
 
-def load_msgpack(blob, file_type=None):
+def load_msgpack(blob, file_type=None, **kwargs):
     '''
     Load a dict packed with msgpack into kwargs for Trimesh constructor
 
@@ -64,7 +64,7 @@ def load_msgpack(blob, file_type=None):
     return loaded
 
 
-def load_dict(data, file_type=None):
+def load_dict(data, file_type=None, **kwargs):
     '''
     Load multiple input types into kwargs for a Trimesh constructor.
     Tries to extract keys ['faces', 'vertices', 'face_normals', 'vertex_normals'].
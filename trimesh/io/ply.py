@@ -57,17 +57,20 @@ def load_ply(file_obj, *args, **kwargs):
     return kwargs
 
 
-def export_ply(mesh):
+def export_ply(mesh, file_obj=None, chunk=100000):
     '''
     Export a mesh in the PLY format.
 
     Parameters
     ----------
-    mesh : Trimesh object
+    mesh :     Trimesh object
+    file_obj : None, or open file object to write to a
+               number of vertices and faces at a time
+    chunk :    int, number of vertices or faces to pack at once
 
     Returns
     ----------
-    export : bytes of result
+    export : bytes of result, or None if file_obj was passed
     '''
     dtype_face = [('count', '<u1'),
                   ('index', '<i4', (3))]
@@ -80,37 +83,41 @@ def export_ply(mesh):
     header = templates['intro']
     header += templates['vertex']
 
+    # source arrays for every field of the vertex and face data
+    vertex_fields = {'vertex': mesh.vertices}
     if mesh.visual.kind == 'vertex':
         dtype_vertex.append(dtype_color)
-        vertex = np.zeros(len(mesh.vertices),
-                          dtype=dtype_vertex)
-        vertex['rgba'] = mesh.visual.vertex_colors
+        vertex_fields['rgba'] = mesh.visual.vertex_colors
         header += templates['color']
-    else:
-        vertex = np.zeros(len(mesh.vertices),
-                          dtype=dtype_vertex)
-    vertex['vertex'] = mesh.vertices
 
     header += templates['face']
+    face_fields = {'count': 3,
+                   'index': mesh.faces}
     if mesh.visual.kind == 'face':
         header += templates['color']
         dtype_face.append(dtype_color)
-        faces = np.zeros(len(mesh.faces), dtype=dtype_face)
-        faces['rgba'] = mesh.visual.face_colors
-    else:
-        faces = np.zeros(len(mesh.faces), dtype=dtype_face)
-    faces['count'] = 3
-    faces['index'] = mesh.faces
+        face_fields['rgba'] = mesh.visual.face_colors
 
     header += templates['outro']
 
     counts = {'vertex_count': len(mesh.vertices),
               'face_count': len(mesh.faces)}
 
-    export = Template(header).substitute(counts).encode('utf-8')
-    export += vertex.tostring()
-    export += faces.tostring()
-    return export
+    def chunks():
+        yield Template(header).substitute(counts).encode('utf-8')
+        for dtype, fields, length in [
+                (dtype_vertex, vertex_fields, len(mesh.vertices)),
+                (dtype_face, face_fields, len(mesh.faces))]:
+            # pack the fields a number of rows at a time
+            for start in range(0, length, chunk):
+                packed = np.zeros(min(chunk, length - start), dtype=dtype)
+                for name, value in fields.items():
+                    if isinstance(value, np.ndarray):
+                        value = value[start:start + chunk]
+                    packed[name] = value
+                yield packed
+
+    return util.write_chunks(chunks(), file_obj=file_obj)
 
 
 def read_ply_header(file_obj):
@@ -185,32 +192,34 @@ def elements_to_kwargs(elements):
     if not util.is_shape(vertices, (-1, 3)):
         raise ValueError('Vertices were not (n,3)!')
 
+    # some exporters set this name to 'vertex_index'
+    # and some others use 'vertex_indices', but we really
+    # don't care about the name unless there are multiple properties
     index_names = ['vertex_index',
                    'vertex_indices']
     face_data = elements['face']['data']
-    if util.is_shape(face_data, (-1, (3, 4))):
-        faces = face_data
-    elif isinstance(face_data, dict):
+    faces = None
+    if len(face_data) == 1:
+        faces = next(iter(face_data.values()))
+    else:
         for i in index_names:
             if i in face_data:
                 faces = face_data[i]
                 break
-    elif isinstance(face_data, np.ndarray):
-        blob = elements['face']['data']
-        # some exporters set this name to 'vertex_index'
-        # and some others use 'vertex_indices', but we really
-        # don't care about the name unless there are multiple properties
-        if len(blob.dtype.names) == 1:
-            name = blob.dtype.names[0]
-        elif len(blob.dtype.names) > 1:
-            for i in blob.dtype.names:
-                if i in index_names:
-                    name = i
-                    break
-        faces = elements['face']['data'][name]['f1']
-    else:
+    if faces is None:
         raise ValueError('Couldn\'t extract face data!')
 
+    # index of the original face for every face we return
+    face_index = None
+    if isinstance(faces, dict):
+        # faces with a mix of lengths
+        faces, face_index = triangulate_lists(**faces)
+    elif util.is_shape(faces, (-1, -1)) and faces.shape[1] > 4:
+        # polygons with more sides than Trimesh triangulates
+        faces, face_index = triangulate_lists(
+            values=faces.ravel(),
+            counts=np.tile(faces.shape[1], len(faces)))
+
     if not util.is_shape(faces, (-1, (3, 4))):
         raise ValueError('Faces weren\'t (n,(3|4))!')
 
@@ -221,6 +230,8 @@ def elements_to_kwargs(elements):
     # if both vertex and face color are defined, pick the one
     # with the most going on
     f_color, f_signal = element_colors(elements['face'])
+    if f_color is not None and face_index is not None:
+        f_color = f_color[face_index]
     v_color, v_signal = element_colors(elements['vertex'])
     colors = [{'face_colors': f_color},
               {'vertex_colors': v_color}]
@@ -231,6 +242,35 @@ def elements_to_kwargs(elements):
     return result
 
 
+def triangulate_lists(values, counts):
+    '''
+    Triangulate polygons with any number of sides as fans around
+    their first vertex.
+
+    Parameters
+    ------------
+    values: (n,) int, vertex indices of every polygon in order
+    counts: (m,) int, number of vertices in each polygon
+
+    Returns
+    ------------
+    faces:      (p,3) int, triangles
+    face_index: (p,) int, index of the polygon for each triangle
+    '''
+    counts = np.asanyarray(counts, dtype=np.int64)
+    values = np.asanyarray(values)
+
+    # a polygon with n sides becomes n - 2 triangles
+    tri_count = np.maximum(counts - 2, 0)
+    face_index = np.repeat(np.arange(len(counts)), tri_count)
+    first = (np.cumsum(counts) - counts)[face_index]
+    fan = np.arange(len(face_index)) - np.repeat(
+        np.cumsum(tri_count) - tri_count, tri_count) + 1
+    faces = values[np.column_stack((first, first + fan, first + fan + 1))]
+
+    return faces, face_index
+
+
 def element_colors(element):
     '''
     Given an element, try to extract RGBA color from its properties
@@ -261,6 +301,9 @@ def ply_ascii(elements, file_obj):
     '''
     Load data from an ASCII PLY file into an existing elements data structure.
 
+    Every row of an element is a line of the file, so list properties
+    may have a different length on every row.
+
     Parameters
     ------------
     elements: OrderedDict object, populated from the file header.
@@ -269,54 +312,57 @@ def ply_ascii(elements, file_obj):
     file_obj: open file object, with current position at the start
               of the data section (past the header)
     '''
-
-    # list of strings, split by newlines and spaces
-    blob = file_obj.read().decode('utf-8')
-    # numpy array with string type
-    raw = np.array(blob.split())
-    position = 0
-
-    for key, values in elements.items():
-        # will store (start, end) column index of data
-        columns = collections.deque()
-        # will store the total number of rows
-        rows = 0
-
-        for name, dtype in values['properties'].items():
-            if '$LIST' in dtype:
-                # if an element contains a list property handle it here
-
-                # the first value is a count, followed by data
-                list_count = int(raw[position + rows])
-
-                # ignore the count and take the data
-                columns.append([rows + 1,
-                                rows + 1 + list_count])
-                rows += list_count + 1
-                # change the datatype to just the dtype for data
-                values['properties'][name] = dtype.split('($LIST,)')[-1]
-            else:
-                # a single column data field
-                columns.append([rows, rows + 1])
-                rows += 1
-
-        # total flat count of values
-        count = values['length'] * rows
-        # reshape the data into the specified rows
-        data = raw[position:position + count].reshape((-1, rows))
-
-        # store columns we care about by name and convert to specified data
-        # type
-        elements[key]['data'] = {n: data[:, c[0]:c[1]].astype(dt) for n, dt, c in zip(
-            values['properties'].keys(),    # field name
-            values['properties'].values(),  # data type of field
-            columns)}                       # list of (start, end) column indexes
-
-        # move up our position in the file based on how many
-        # values we just read
-        position += count
-
-    if position != len(raw):
+    text = file_obj.read()
+
+    # parse every number in the file at once
+    values = np.fromstring(text, sep=' ')
+
+    # the start of every word, and the line it is on
+    raw = np.frombuffer(text, dtype=np.uint8)
+    space = ((raw == ord(' ')) | (raw == ord('\t')) |
+             (raw == ord('\n')) | (raw == ord('\r')))
+    start = np.logical_not(space)
+    start[1:] &= space[:-1]
+    line = np.searchsorted(np.nonzero(raw == ord('\n'))[0],
+                           np.nonzero(start)[0])
+
+    # the number of values on every line which isn't empty
+    sizes = np.bincount(line)
+    sizes = sizes[sizes > 0]
+    if sizes.sum() != len(values):
+        raise ValueError('File contains values which aren\'t numbers!')
+    # the index in values of the first value on every line
+    offsets = np.cumsum(sizes) - sizes
+
+    def read(positions, dtype):
+        return values[positions].astype(dtype)
+
+    row = 0
+    for element in elements.values():
+        length = element['length']
+        properties = _properties(element)
+        if row + length > len(offsets):
+            raise ValueError('File was unexpected length!')
+
+        rows = offsets[row:row + length]
+        if (length > 0 and
+                all(p[1] is None for p in properties) and
+                (sizes[row:row + length] == len(properties)).all()):
+            # every row is the same so we can just reshape
+            end = offsets[row] + len(properties) * length
+            data = values[offsets[row]:end].reshape((-1, len(properties)))
+            element['data'] = {p[0]: data[:, i].astype(p[2])
+                               for i, p in enumerate(properties)}
+        else:
+            element['data'], end = _read_rows(read=read,
+                                              offsets=rows,
+                                              properties=properties,
+                                              size=lambda dtype: 1)
+            if (end != rows + sizes[row:row + length]).any():
+                raise ValueError('Rows were unexpected length!')
+        row += length
+
+    if row != len(offsets):
         raise ValueError('File was unexpected length!')
 
 
@@ -324,6 +370,9 @@ def ply_binary(elements, file_obj):
     '''
     Load the data from a binary PLY file into the elements data structure.
 
+    List properties may have a different length on every row, as
+    the start of every row is found before the data is read.
+
     Parameters
     ------------
     elements: OrderedDict object, populated from the file header.
@@ -332,81 +381,302 @@ def ply_binary(elements, file_obj):
     file_obj: open file object, with current position at the start
               of the data section (past the header)
     '''
+    buffer = np.frombuffer(file_obj.read(), dtype=np.uint8)
+
+    def read(positions, dtype):
+        # gather the bytes of a value at every position, clipped
+        # as guessed positions may run off the end of the file
+        index = positions.reshape((-1, 1)) + np.arange(dtype.itemsize)
+        index = np.minimum(index, len(buffer) - 1)
+        return buffer[index].view(dtype).reshape(-1)
 
-    def populate_listsize(file_obj, elements):
-        '''
-        Given a set of elements populated from the header if there are any
-        list properties seek in the file the length of the list.
-
-        Note that if you have a list where each instance is different length
-        (if for example you mixed triangles and quads) this won't work at all
-        '''
-        p_start = file_obj.tell()
-        p_current = file_obj.tell()
-        for element_key, element in elements.items():
-            props = element['properties']
-            prior_data = ''
-            for k, dtype in props.items():
-                if '$LIST' in dtype:
-                    # every list field has two data types:
-                    # the list length (single value), and the list data (multiple)
-                    # here we are only reading the single value for list length
-                    field_dtype = np.dtype(dtype.split(',')[0])
-                    if len(prior_data) == 0:
-                        offset = 0
-                    else:
-                        offset = np.dtype(prior_data).itemsize
-                    file_obj.seek(p_current + offset)
-                    size = np.fromstring(file_obj.read(field_dtype.itemsize),
-                                         dtype=field_dtype)[0]
-                    props[k] = props[k].replace('$LIST', str(size))
-                prior_data += props[k] + ','
-            itemsize = np.dtype(', '.join(props.values())).itemsize
-            p_current += element['length'] * itemsize
-        file_obj.seek(p_start)
-
-    def populate_data(file_obj, elements):
-        '''
-        Given the data type and field information from the header,
-        read the data and add it to a 'data' field in the element.
-        '''
-        for key in elements.keys():
-            items = list(elements[key]['properties'].items())
-            dtype = np.dtype(items)
-            data = file_obj.read(elements[key]['length'] * dtype.itemsize)
-            elements[key]['data'] = np.fromstring(data, dtype=dtype)
-        return elements
-
-    def elements_size(elements):
-        '''
-        Given an elements data structure populated from the header,
-        calculate how long the file should be if it is intact.
-        '''
-        size = 0
-        for element in elements.values():
-            dtype = np.dtype(','.join(element['properties'].values()))
-            size += element['length'] * dtype.itemsize
-        return size
-
-    # some elements are passed where the list dimensions
-    # are not included in the header, so this function goes
-    # into the meat of the file and grabs the list dimensions
-    # before we to the main data read as a single operation
-    populate_listsize(file_obj, elements)
-
-    # how many bytes are left in the file
-    size_file = util.distance_to_end(file_obj)
-    # how many bytes should the data structure described by
-    # the header take up
-    size_elements = elements_size(elements)
+    position = 0
+    for element in elements.values():
+        length = element['length']
+        properties = _properties(element)
+
+        # try reading every row with the list lengths of the first row
+        data = _binary_uniform(read=read,
+                               buffer=buffer,
+                               start=position,
+                               length=length,
+                               properties=properties)
+        if data is not None:
+            element['data'] = {
+                p[0]: data[p[0]] if p[1] is None else
+                data[p[0]]['values'].reshape((length, -1))
+                for p in properties}
+            position += data.itemsize * length
+            continue
+
+        offsets = _binary_offsets(read=read,
+                                  start=position,
+                                  end=len(buffer),
+                                  length=length,
+                                  properties=properties)
+        element['data'], end = _read_rows(read=read,
+                                          offsets=offsets,
+                                          properties=properties,
+                                          size=lambda dtype: dtype.itemsize)
+        if len(end) > 0:
+            position = end[-1]
+        if position > len(buffer):
+            raise ValueError('File is unexpected length!')
 
     # if the number of bytes is not the same the file is probably corrupt
-    if size_file != size_elements:
+    if position != len(buffer):
         raise ValueError('File is unexpected length!')
 
-    # with everything populated and a reasonable confidence the file
-    # is intact, read the data fields described by the header
-    populate_data(file_obj, elements)
+
+def _properties(element):
+    '''
+    Parse the data types of every property of an element.
+
+    Parameters
+    ------------
+    element: dict, populated from the file header
+
+    Returns
+    ------------
+    properties: list of (name, count dtype, dtype) tuples, where
+                count dtype is None for properties which aren't lists
+    '''
+    properties = []
+    for name, dtype in element['properties'].items():
+        if '$LIST' in dtype:
+            count, dtype = dtype.split(', ($LIST,)')
+            properties.append((name, np.dtype(count), np.dtype(dtype)))
+        else:
+            properties.append((name, None, np.dtype(dtype)))
+    return properties
+
+
+def _read_rows(read, offsets, properties, size, lists=True):
+    '''
+    Read the properties of every row of an element, where rows
+    may have list properties of any length.
+
+    Parameters
+    ------------
+    read:       function, (positions, dtype) returns the value
+                of dtype at every position
+    offsets:    (n,) int, position of the start of every row
+    properties: list, from _properties
+    size:       function, returns the distance between two
+                consecutive values of a dtype
+    lists:      bool, if False only read the length of lists
+
+    Returns
+    ------------
+    data: dict, values of each property by name, where lists are
+          (n, count) arrays or if the rows have lists of different
+          lengths a dict with 'values' and 'counts'
+    end:  (n,) int, position after the end of every row
+    '''
+    data = {}
+    cursor = np.asanyarray(offsets, dtype=np.int64)
+    for name, count_dtype, dtype in properties:
+        if count_dtype is None:
+            if lists:
+                data[name] = read(cursor, dtype)
+            cursor = cursor + size(dtype)
+            continue
+
+        counts = read(cursor, count_dtype).astype(np.int64)
+        cursor = cursor + size(count_dtype)
+        if lists:
+            # the position of every value of every list
+            index = (np.arange(counts.sum()) -
+                     np.repeat(np.cumsum(counts) - counts, counts))
+            values = read(np.repeat(cursor, counts) + index * size(dtype),
+                          dtype)
+            if len(counts) == 0 or (counts == counts[0]).all():
+                data[name] = values.reshape((len(counts), -1))
+            else:
+                data[name] = {'values': values, 'counts': counts}
+        cursor = cursor + counts * size(dtype)
+    return data, cursor
+
+
+def _binary_uniform(read, buffer, start, length, properties):
+    '''
+    Read an element from a binary file if every list has the same
+    length as it does in the first row, which is the case for
+    almost every PLY file in the wild.
+
+    Parameters
+    ------------
+    read:       function, (positions, dtype) returns the value
+                of dtype at every position
+    buffer:     (n,) uint8, data section of the file
+    start:      int, byte offset of the first row
+    length:     int, number of rows in the element
+    properties: list, from _properties
+
+    Returns
+    ------------
+    data: (length,) structured array, where lists are fields with
+          'count' and 'values', or None if rows differ in size
+    '''
+    # find the length of every list in the first row
+    fields = []
+    position = np.array([start])
+    for name, count_dtype, dtype in properties:
+        if count_dtype is None:
+            fields.append((name, dtype))
+            position = position + dtype.itemsize
+            continue
+        if length == 0:
+            count = 0
+        else:
+            count = int(read(position, count_dtype)[0])
+        fields.append((name, [('count', count_dtype),
+                              ('values', dtype, (count,))]))
+        position = position + count_dtype.itemsize + count * dtype.itemsize
+
+    dtype = np.dtype(fields)
+    if start + dtype.itemsize * length > len(buffer):
+        return None
+    data = np.frombuffer(buffer,
+                         dtype=dtype,
+                         count=length,
+                         offset=start)
+
+    # check every row against the first row
+    for name, count_dtype, _ in properties:
+        if count_dtype is None:
+            continue
+        if (data[name]['count'] != data[name]['values'].shape[1]).any():
+            return None
+    return data
+
+
+def _binary_offsets(read, start, end, length, properties, sync=64):
+    '''
+    Find the byte offset of every row of an element from a binary
+    file, where lists may have different lengths in every row.
+
+    The row after any byte is found by reading it as the start of
+    a row, and rows followed from different bytes almost always line
+    up with the real rows after a few rows. Rows are followed from
+    evenly spaced seed bytes all at once, and the real rows are
+    stitched together from where each seed lines up with the rows
+    of the seed before it, starting with the first row. Seeds which
+    take too long to line up fall back to _binary_doubling.
+
+    Parameters
+    ------------
+    read:       function, (positions, dtype) returns the value
+                of dtype at every position
+    start:      int, byte offset of the first row
+    end:        int, byte offset of the end of the data section
+    length:     int, number of rows in the element
+    properties: list, from _properties
+    sync:       int, number of rows past the next seed to follow
+                each seed, which is increased when it isn't enough
+
+    Returns
+    ------------
+    offsets: (length,) int, byte offset of the start of every row
+    '''
+    if length == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    last = max(end - start, 0)
+
+    def row_end(positions):
+        # the position after the row starting at every position
+        # relative to start, where rows which don't fit in the
+        # file end at the last position
+        row_end = _read_rows(read=read,
+                             offsets=positions + start,
+                             properties=properties,
+                             size=lambda dtype: dtype.itemsize,
+                             lists=False)[1]
+        return np.clip(row_end - start, 0, last)
+
+    # about as many seeds as rows followed from each of them
+    spacing = max(int(np.sqrt(last + 1)) * 4, 256)
+    seeds = np.arange(0, last + 1, spacing, dtype=np.int64)
+
+    steps = [seeds]
+    rows = collections.deque()
+    count = 0
+    # the rows of seed i from index begin on are real rows
+    i = 0
+    begin = 0
+    while True:
+        if sync > 4096:
+            # the seeds aren't lining up with the real rows
+            return _binary_doubling(row_end=row_end,
+                                    start=start,
+                                    last=last,
+                                    length=length)
+        # follow every seed until it has passed sync rows of the
+        # next seed, and the last seed until the end of the file
+        while (len(steps) <= sync or
+               steps[-1][-1] != last or
+               (steps[-1][:-1] < steps[sync][1:]).any()):
+            steps.append(row_end(steps[-1]))
+        path = np.column_stack(steps)
+
+        while i < len(seeds) - 1 and count < length:
+            real = path[i][begin:]
+            following = path[i + 1]
+            # the first row of the next seed which is a real row
+            index = np.minimum(np.searchsorted(real, following),
+                               len(real) - 1)
+            match = np.nonzero(real[index] == following)[0]
+            if len(match) == 0:
+                # follow the seeds further and try again
+                sync *= 4
+                break
+            rows.append(real[:index[match[0]]])
+            count += len(rows[-1])
+            begin = match[0]
+            i += 1
+        else:
+            break
+
+    if count < length:
+        rows.append(path[i][begin:])
+
+    offsets = np.concatenate(rows)[:length]
+    if len(offsets) < length:
+        # rows ran off the end of the file
+        offsets = np.append(offsets, [last] * (length - len(offsets)))
+    return offsets + start
+
+
+def _binary_doubling(row_end, start, last, length):
+    '''
+    Find the byte offset of every row of an element from a binary
+    file using pointer doubling, where jumping 2*n rows from a byte
+    is two jumps of n rows from every byte.
+
+    Parameters
+    ------------
+    row_end: function, returns the position after a row starting
+             at each position relative to start
+    start:   int, byte offset of the first row
+    last:    int, last position relative to start
+    length:  int, number of rows in the element
+
+    Returns
+    ------------
+    offsets: (length,) int, byte offset of the start of every row
+    '''
+    jump = row_end(np.arange(last + 1, dtype=np.int64))
+    offsets = np.zeros(length, dtype=np.int64)
+    # jump moves count rows from every byte
+    count = 1
+    while count < length:
+        current = min(count, length - count)
+        offsets[count:count + current] = jump[offsets[:current]]
+        count += current
+        if count < length:
+            jump = jump[jump]
+    return offsets + start
 
 
 def export_draco(mesh):
@@ -442,7 +712,7 @@ def export_draco(mesh):
     return data
 
 
-def load_draco(file_obj, file_type=None):
+def load_draco(file_obj, file_type=None, **kwargs):
     '''
     Load a mesh from Google's Draco format.
 
@@ -1,5 +1,9 @@
+import re
+
 import numpy as np
 
+from .. import util
+
 
 class HeaderError(Exception):
     # the exception raised if an STL file object doesn't match its header
@@ -13,9 +17,11 @@ _stl_dtype = np.dtype([('normals', np.float32, (3)),
 # define a numpy datatype for the header of a binary STL file
 _stl_dtype_header = np.dtype([('header', np.void, 80),
                               ('face_count', np.int32)])
+# matches the name of a solid in an ASCII STL file until the end of line
+_solid_regex = re.compile(b'solid[^\n]*')
 
 
-def load_stl(file_obj, file_type=None):
+def load_stl(file_obj, file_type=None, process=True, **kwargs):
     '''
     Load an STL file from a file object.
 
@@ -23,6 +29,8 @@ def load_stl(file_obj, file_type=None):
     ----------
     file_obj: open file- like object
     file_type: not used
+    process:   bool, if False return the triangle soup of binary
+               files rather than merging vertices
 
     Returns
     ----------
@@ -38,7 +46,7 @@ def load_stl(file_obj, file_type=None):
         # if that is true, it is almost certainly a binary STL file
         # if the header doesn't match the file length a HeaderError will be
         # raised
-        return load_stl_binary(file_obj)
+        return load_stl_binary(file_obj, merge=process)
     except HeaderError:
         # move the file back to where it was initially
         file_obj.seek(file_pos)
@@ -48,13 +56,15 @@ def load_stl(file_obj, file_type=None):
         return load_stl_ascii(file_obj)
 
 
-def load_stl_binary(file_obj):
+def load_stl_binary(file_obj, merge=True):
     '''
     Load a binary STL file from a file object.
 
     Parameters
     ----------
     file_obj: open file- like object
+    merge:    bool, merge bitwise identical vertices, or if False
+              return every vertex of every triangle
 
     Returns
     ----------
@@ -63,6 +73,119 @@ def load_stl_binary(file_obj):
               faces:        (m,3) int, indexes of vertices
               face_normals: (m,3) float, normal vector of each face
     '''
+    face_count, data_start = _binary_header(file_obj)
+    if face_count == 0:
+        return {'vertices': np.zeros((0, 3)),
+                'face_normals': np.zeros((0, 3)),
+                'faces': np.zeros((0, 3), dtype=np.int64)}
+
+    try:
+        # map files on disk rather than reading them into memory
+        blob = np.memmap(file_obj,
+                         dtype=_stl_dtype,
+                         mode='r',
+                         offset=data_start,
+                         shape=(face_count,))
+    except (AttributeError, IOError, ValueError):
+        # file objects in memory have to be read
+        file_obj.seek(data_start)
+        blob = np.frombuffer(file_obj.read(), dtype=_stl_dtype)
+
+    if merge:
+        # vertices and normals are strided views of the records
+        # and merging is done in chunks so the raw triangle soup
+        # is never copied into memory in full
+        vertices, faces = _merge_triangles(blob['vertices'])
+    else:
+        vertices = blob['vertices'].reshape((-1, 3))
+        faces = np.arange(face_count * 3, dtype=np.int64).reshape((-1, 3))
+
+    result = {'vertices': vertices,
+              'face_normals': blob['normals'],
+              'faces': faces}
+    return result
+
+
+def _merge_triangles(triangles, chunk=1000000):
+    '''
+    Merge bitwise identical vertices of a triangle soup, in a single
+    pass over the triangles.
+
+    Parameters
+    ----------
+    triangles: (n,3,3) float32, triangles in space, which can be a view
+    chunk:     int, number of triangles to merge at once
+
+    Returns
+    ----------
+    vertices: (m,3) float32, unique vertices
+    faces:    (n,3) int64, indexes of vertices
+    '''
+    faces = np.zeros((len(triangles), 3), dtype=np.int64)
+    unique = []
+    offset = 0
+    # merge within each chunk
+    for start in range(0, len(triangles), chunk):
+        end = start + chunk
+        current = np.ascontiguousarray(
+            triangles[start:end]).reshape((-1, 3))
+        current, inverse = _unique_float32(current)
+        faces[start:end] = inverse.reshape((-1, 3)) + offset
+        unique.append(current)
+        offset += len(current)
+
+    # merge vertices which were unique in more than one chunk
+    vertices, inverse = _unique_float32(np.vstack(unique))
+    for start in range(0, len(faces), chunk):
+        faces[start:start + chunk] = inverse[faces[start:start + chunk]]
+
+    return vertices, faces
+
+
+def _unique_float32(points):
+    '''
+    Find bitwise unique rows of float32 points.
+
+    Parameters
+    ----------
+    points: (n,3) float32, contiguous points
+
+    Returns
+    ----------
+    unique:  (m,3) float32, unique points
+    inverse: (n,) int64, index of unique point for each point
+    '''
+    # sorting the bits as integers is much faster than
+    # sorting rows of float or void values
+    bits = points.view(np.uint32)
+    order = np.lexsort(bits.T[::-1])
+    ordered = bits[order]
+
+    first = np.ones(len(order), dtype=np.bool)
+    first[1:] = (ordered[1:] != ordered[:-1]).any(axis=1)
+
+    inverse = np.zeros(len(order), dtype=np.int64)
+    inverse[order] = np.cumsum(first) - 1
+    unique = points[order[first]]
+
+    return unique, inverse
+
+
+def _binary_header(file_obj):
+    '''
+    Check that a file object is a binary STL by comparing the face
+    count in its header to its length.
+
+    Parameters
+    ----------
+    file_obj: open file- like object, at the start of the header
+
+    Returns
+    ----------
+    face_count: int, number of faces in the file
+    data_start: int, position of the first face in file_obj,
+                which file_obj is left at
+    '''
     # the header is always 84 bytes long, we just reference the dtype.itemsize
     # to be explicit about where that magical number comes from
     header_length = _stl_dtype_header.itemsize
@@ -96,20 +219,13 @@ def load_stl_binary(file_obj):
     if len_data != len_expected:
         raise HeaderError('Binary STL has incorrect length in header!')
 
-    # all of our vertices will be loaded in order due to the STL format,
-    # so faces are just sequential indices reshaped.
-    faces = np.arange(header['face_count'] * 3).reshape((-1, 3))
-    blob = np.fromstring(file_obj.read(), dtype=_stl_dtype)
-
-    result = {'vertices': blob['vertices'].reshape((-1, 3)),
-              'face_normals': blob['normals'].reshape((-1, 3)),
-              'faces': faces}
-    return result
+    return int(header['face_count'][0]), data_start
 
 
 def load_stl_ascii(file_obj):
     '''
-    Load an ASCII STL file from a file object.
+    Load an ASCII STL file from a file object, which may contain
+    more than one solid.
 
     Parameters
     ----------
@@ -122,93 +238,269 @@ def load_stl_ascii(file_obj):
               faces:        (m,3) int, indexes of vertices
               face_normals: (m,3) float, normal vector of each face
     '''
-    header = file_obj.readline()
-
-    text = file_obj.read()
-    if hasattr(text, 'decode'):
-        text = text.decode('utf-8')
-    text = text.lower().split('endsolid')[0]
-    blob = np.array(text.split())
-
-    # there are 21 'words' in each face
-    face_len = 21
-    face_count = len(blob) / face_len
-    if (len(blob) % face_len) != 0:
-        raise HeaderError('Incorrect number of values in STL file!')
-
-    face_count = int(face_count)
-    # this offset is to be added to a fixed set of indices that is tiled
-    offset = face_len * np.arange(face_count).reshape((-1, 1))
-    normal_index = np.tile([2, 3, 4], (face_count, 1)) + offset
-    vertex_index = np.tile([8, 9, 10,
-                            12, 13, 14,
-                            16, 17, 18], (face_count, 1)) + offset
+    face_normals, triangles = _parse_ascii(file_obj.read())
 
     # faces are groups of three sequential vertices
-    faces = np.arange(face_count * 3).reshape((-1, 3))
-    face_normals = blob[normal_index].astype(np.float64)
-    vertices = blob[vertex_index.reshape((-1, 3))].astype(np.float64)
+    faces = np.arange(len(triangles) * 3).reshape((-1, 3))
+    vertices = triangles.reshape((-1, 3))
 
     return {'vertices': vertices,
             'faces': faces,
             'face_normals': face_normals}
 
 
-def export_stl(mesh):
+def _parse_ascii(text):
     '''
-    Convert a Trimesh object into a binary STL file.
+    Parse facets from ASCII STL text.
+
+    Rather than splitting the text into words, lines naming solids
+    and keywords are blanked out and every remaining number is
+    converted in a single call to np.fromstring.
 
     Parameters
-    ---------
-    mesh: Trimesh object
+    ----------
+    text: bytes or str, complete facets of an ASCII STL file
 
     Returns
-    ---------
-    export: bytes, representing mesh in binary STL form
+    ----------
+    face_normals: (n,3) float, normal vector of each face
+    triangles:    (n,3,3) float, triangles of faces
     '''
-    header = np.zeros(1, dtype=_stl_dtype_header)
-    header['face_count'] = len(mesh.faces)
+    if not hasattr(text, 'decode'):
+        text = text.encode('utf-8')
+    text = text.lower()
+
+    # remove 'solid name' and 'endsolid name' lines as the
+    # names can contain anything, leaving 'end' of endsolid
+    text = _solid_regex.sub(b' ', text)
+
+    face_count = text.count(b'normal')
+    if text.count(b'vertex') != face_count * 3:
+        raise HeaderError('Incorrect number of vertices in STL file!')
+
+    # longer keywords first so they aren't broken up
+    for keyword in [b'endfacet', b'endloop', b'facet', b'normal',
+                    b'outer', b'loop', b'vertex', b'end']:
+        text = text.replace(keyword, b' ')
+
+    if face_count == 0:
+        values = np.zeros(0)
+    else:
+        values = np.fromstring(text, sep=' ')
+    if len(values) != face_count * 12:
+        raise HeaderError('Incorrect number of values in STL file!')
+
+    values = values.reshape((-1, 12))
+    face_normals = values[:, :3]
+    triangles = values[:, 3:].reshape((-1, 3, 3))
 
-    packed = np.zeros(len(mesh.faces), dtype=_stl_dtype)
-    packed['normals'] = mesh.face_normals
-    packed['vertices'] = mesh.triangles
+    return face_normals, triangles
 
-    export = header.tostring()
-    export += packed.tostring()
 
-    return export
+def iterate_stl(file_obj, chunk=100000):
+    '''
+    Iterate over batches of faces from a binary or ASCII STL file,
+    reading only one batch at a time so files larger than memory
+    can be reduced out of core.
 
+    Parameters
+    ----------
+    file_obj: open file- like object
+    chunk:    int, number of faces in each batch, the last
+              batch may have fewer
 
-def export_stl_ascii(mesh):
+    Yields
+    ----------
+    batch: dict with keys:
+             triangles:    (n,3,3) float, triangles of faces
+             face_normals: (n,3) float, normal vector of each face
+             start:        int, index of first face in the file
+             bounds:       (2,3) float, bounds of every face so far
     '''
-    Convert a Trimesh object into an ASCII STL file.
+    chunk = int(chunk)
+    if chunk < 1:
+        raise ValueError('chunk must be positive!')
+
+    file_pos = file_obj.tell()
+    try:
+        face_count, data_start = _binary_header(file_obj)
+        batches = _iterate_binary(file_obj, face_count, chunk)
+    except HeaderError:
+        file_obj.seek(file_pos)
+        batches = _iterate_ascii(file_obj, chunk)
+
+    start = 0
+    bounds = None
+    for face_normals, triangles in batches:
+        current = np.array([triangles.reshape((-1, 3)).min(axis=0),
+                            triangles.reshape((-1, 3)).max(axis=0)])
+        if bounds is None:
+            bounds = current
+        else:
+            bounds = np.array([np.minimum(bounds[0], current[0]),
+                               np.maximum(bounds[1], current[1])])
+        yield {'triangles': triangles,
+               'face_normals': face_normals,
+               'start': start,
+               'bounds': bounds}
+        start += len(triangles)
+
+
+def _iterate_binary(file_obj, face_count, chunk):
+    '''
+    Read batches of faces from a binary STL file, which should be
+    positioned at the first face.
+
+    Parameters
+    ----------
+    file_obj:   open file- like object
+    face_count: int, number of faces in the file
+    chunk:      int, number of faces to read at once
+
+    Yields
+    ----------
+    face_normals: (n,3) float, normal vector of each face
+    triangles:    (n,3,3) float, triangles of faces
+    '''
+    for start in range(0, face_count, chunk):
+        count = min(chunk, face_count - start)
+        blob = np.frombuffer(file_obj.read(count * _stl_dtype.itemsize),
+                             dtype=_stl_dtype)
+        yield (blob['normals'].astype(np.float64),
+               blob['vertices'].astype(np.float64))
+
+
+def _iterate_ascii(file_obj, chunk, block=2**22):
+    '''
+    Parse batches of faces from an ASCII STL file, which should be
+    positioned at the start of the file.
+
+    Parameters
+    ----------
+    file_obj: open file- like object
+    chunk:    int, number of faces to yield at once
+    block:    int, number of bytes to read at once
+
+    Yields
+    ----------
+    face_normals: (n,3) float, normal vector of each face
+    triangles:    (n,3,3) float, triangles of faces
+    '''
+    # text after the last complete facet of a block
+    remainder = b''
+    # parsed faces which haven't been yielded yet
+    normals, triangles = [], []
+    count = 0
+
+    done = False
+    while not done:
+        text = file_obj.read(block)
+        if not hasattr(text, 'decode'):
+            text = text.encode('utf-8')
+        done = len(text) == 0
+        text = remainder + text
+
+        # only parse complete facets
+        cut = len(text)
+        if not done:
+            cut = text.lower().rfind(b'endfacet')
+            cut = 0 if cut < 0 else cut + len(b'endfacet')
+        remainder = text[cut:]
+
+        if cut > 0:
+            current = _parse_ascii(text[:cut])
+            normals.append(current[0])
+            triangles.append(current[1])
+            count += len(current[0])
+
+        # yield as many full batches as we have parsed
+        if count >= chunk or (done and count > 0):
+            normals = np.vstack(normals)
+            triangles = np.vstack(triangles)
+            # keep a partial batch unless this is the end
+            end = count if done else count - (count % chunk)
+            for start in range(0, end, chunk):
+                yield (normals[start:start + chunk],
+                       triangles[start:start + chunk])
+            normals, triangles = [normals[end:]], [triangles[end:]]
+            count -= end
+
+
+def export_stl(mesh, file_obj=None, chunk=100000):
+    '''
+    Convert a Trimesh object into a binary STL file.
 
     Parameters
     ---------
-    mesh: Trimesh object
+    mesh:     Trimesh object
+    file_obj: None, or open file object to write to a
+              number of faces at a time
+    chunk:    int, number of faces to pack at once
 
     Returns
     ---------
-    export: str, mesh represented as an ASCII STL file
+    export: bytes, representing mesh in binary STL form,
+            or None if file_obj was passed
     '''
+    # get arrays once rather than checking the cache every chunk
+    faces = mesh.faces
+    normals = mesh.face_normals
+    vertices = mesh.vertices
+
+    def chunks():
+        header = np.zeros(1, dtype=_stl_dtype_header)
+        header['face_count'] = len(faces)
+        yield header
+
+        for start in range(0, len(faces), chunk):
+            packed = np.zeros(len(faces[start:start + chunk]),
+                              dtype=_stl_dtype)
+            packed['normals'] = normals[start:start + chunk]
+            packed['vertices'] = vertices[faces[start:start + chunk]]
+            yield packed
 
-    # move all the data thats going into the STL file into one array
-    blob = np.zeros((len(mesh.faces), 4, 3))
-    blob[:, 0, :] = mesh.face_normals
-    blob[:, 1:, :] = mesh.triangles
+    return util.write_chunks(chunks(), file_obj=file_obj)
 
-    # create a lengthy format string for the data section of the file
-    format_string = 'facet normal {} {} {}\nouter loop\n'
-    format_string += 'vertex {} {} {}\n' * 3
-    format_string += 'endloop\nendfacet\n'
-    format_string *= len(mesh.faces)
 
-    # concatenate the header, data, and footer
-    export = 'solid \n'
-    export += format_string.format(*blob.reshape(-1))
-    export += 'endsolid'
+def export_stl_ascii(mesh, file_obj=None, chunk=100000):
+    '''
+    Convert a Trimesh object into an ASCII STL file.
 
-    return export
+    Parameters
+    ---------
+    mesh:     Trimesh object
+    file_obj: None, or open file object to write to a
+              number of faces at a time
+    chunk:    int, number of faces to format at once
+
+    Returns
+    ---------
+    export: str, mesh represented as an ASCII STL file,
+            or None if file_obj was passed
+    '''
+    # create a format string for the data of a single face
+    # repr of python floats is the shortest string which round trips
+    facet = 'facet normal %r %r %r\nouter loop\n'
+    facet += 'vertex %r %r %r\n' * 3
+    facet += 'endloop\nendfacet\n'
+
+    # get arrays once rather than checking the cache every chunk
+    faces = mesh.faces
+    normals = mesh.face_normals
+    vertices = mesh.vertices
+
+    def chunks():
+        yield 'solid \n'
+        for start in range(0, len(faces), chunk):
+            current = faces[start:start + chunk]
+            # move all the data thats going into the STL file into one array
+            blob = np.zeros((len(current), 4, 3))
+            blob[:, 0, :] = normals[start:start + chunk]
+            blob[:, 1:, :] = vertices[current]
+            yield (facet * len(current)) % tuple(blob.reshape(-1).tolist())
+        yield 'endsolid'
+
+    return util.write_chunks(chunks(), file_obj=file_obj)
 
 
 _stl_loaders = {'stl': load_stl,
@@ -1,6 +1,9 @@
+import re
+
 import numpy as np
 
 from .. import util
+from .. import grouping
 
 
 def load_wavefront(file_obj, **kwargs):
@@ -11,6 +14,13 @@ def load_wavefront(file_obj, **kwargs):
     Vertices with the same position but different normals or uvs are split
     into multiple vertices.
 
+    Lines are classified by their first characters and every value of
+    each kind is parsed at once, so no Python code runs per line.
+    Polygons are triangulated as fans, negative indices count back
+    from the most recent value, and every object ('o') is returned
+    as a separate mesh with groups ('g') and materials ('usemtl')
+    stored per face in the metadata.
+
     Colors are discarded.
 
     Parameters
@@ -20,108 +30,310 @@ def load_wavefront(file_obj, **kwargs):
 
     Returns
     ----------
-    loaded: dict with kwargs for Trimesh constructor (vertices, faces)
+    loaded: list of dict with kwargs for Trimesh constructor
+            (vertices, faces, vertex_normals, metadata)
     '''
-
-    # make sure text is UTF-8 with only \n newlines
+    # make sure text is bytes with only \n newlines
+    # and no whitespace at the start of lines
     text = file_obj.read()
-    if hasattr(text, 'decode'):
-        text = text.decode('utf-8')
-    text = text.replace('\r\n', '\n').replace('\r', '\n') + ' \n'
+    if not hasattr(text, 'decode'):
+        text = text.encode('utf-8')
+    text = b'\n' + text.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+    text = _indent_regex.sub(b'\n', text) + b'\n'
+    # pad so the first characters of every line can be checked
+    data = np.frombuffer(text + b'\n' * 6, dtype=np.uint8).copy()
 
-    meshes = []
+    # every line starts after a newline and ends before the next
+    newlines = np.nonzero(data[:len(text)] == ord('\n'))[0]
+    starts = newlines[:-1] + 1
+    lengths = newlines[1:] - starts
+
+    kind = _classify(data, starts)
+
+    # blank out the keyword of every line so only values are left
+    keyword = np.array([len(k) for k in _kinds])[kind]
+    for i in range(keyword.max()):
+        blank = starts[keyword > i] + i
+        data[blank] = ord(' ')
 
-    def append_mesh():
-        # append kwargs for a Trimesh constructor to our list of meshes
-        if len(current['f']) > 0:
-            loaded = {'vertices': np.array(current['v'],
-                                           dtype=np.float64),
-                      'vertex_normals': np.array(current['vn'],
-                                                 dtype=np.float64),
-                      'faces': np.array(current['f'],
-                                        dtype=np.int64).reshape((-1, 3)),
-                      'metadata': {}}
-            if len(current['vt']) > 0:
-                loaded['metadata']['vertex_texture'] = np.array(
-                    current['vt'], dtype=np.float64)
-            if len(current['g']) > 0:
-                # build face groups information
-                face_groups = np.zeros(len(current['f']) // 3, dtype=int)
-                for idx, start_f in current['g']:
-                    face_groups[start_f:] = idx
-                loaded['metadata']['face_groups'] = face_groups
-            meshes.append(loaded)
-
-    attribs = {k: [] for k in ['v', 'vt', 'vn']}
-    current = {k: [] for k in ['v', 'vt', 'vn', 'f', 'g']}
-    remap_table = {}
-    next_idx = 0
-    group_idx = 0
-
-    for line in text.split("\n"):
-        line_split = line.strip().split()
-        if len(line_split) < 2:
+    # the kind of line every character is on, where the
+    # first line starts after the padding newline
+    char_kind = np.repeat(kind.astype(np.uint8), lengths + 1)
+    data = data[1:len(char_kind) + 1]
+
+    attributes = {}
+    for name in ['v', 'vt', 'vn']:
+        index = _kinds.index(name)
+        values, counts = _parse_values(data[char_kind == index],
+                                       lengths[kind == index],
+                                       dtype=np.float64)
+        if len(counts) == 0 or counts.min() < 2:
+            attributes[name] = np.zeros((0, 3))
             continue
-        if line_split[0] in attribs:
-            # v, vt, or vn
-            # vertex, vertex texture, or vertex normal
-            # only parse 3 values-- colors shoved into vertices are ignored
-            attribs[line_split[0]].append([float(x) for x in line_split[1:4]])
-        elif line_split[0] == 'f':
-            # a face
-            ft = line_split[1:]
-            if len(ft) == 4:
-                # hasty triangulation of quad
-                ft = [ft[0], ft[1], ft[2], ft[2], ft[3], ft[0]]
-            for f in ft:
-                # loop through each vertex reference of a face
-                # we are reshaping later into (n,3)
-                if f not in remap_table:
-                    remap_table[f] = next_idx
-                    next_idx += 1
-                    # faces are "vertex index"/"vertex texture"/"vertex normal"
-                    # you are allowed to leave a value blank, which .split
-                    # will handle by nicely maintaining the index
-                    f_split = f.split('/')
-                    current['v'].append(attribs['v'][int(f_split[0]) - 1])
-                    if len(f_split) > 1 and f_split[1] != '':
-                        current['vt'].append(
-                            attribs['vt'][int(f_split[1]) - 1])
-                    if len(f_split) > 2:
-                        current['vn'].append(
-                            attribs['vn'][int(f_split[2]) - 1])
-                current['f'].append(remap_table[f])
-        elif line_split[0] == 'o':
-            # defining a new object
-            append_mesh()
-            # reset current to empty lists
-            current = {k: [] for k in current.keys()}
-            remap_table = {}
-            next_idx = 0
-            group_idx = 0
-
-        elif line_split[0] == 'g':
-            # defining a new group
-            group_idx += 1
-            current['g'].append((group_idx, len(current['f']) // 3))
-
-    if next_idx > 0:
-        append_mesh()
+        # only take the first 3 values, skipping colors
+        columns = min(3, counts.min())
+        offset = np.cumsum(counts) - counts
+        attributes[name] = values[offset.reshape((-1, 1)) +
+                                  np.arange(columns)]
+
+    is_face = kind == _kinds.index('f')
+    corners, corner_count = _parse_corners(
+        data[char_kind == _kinds.index('f')], lengths[is_face])
+    if len(corners) == 0:
+        return []
+
+    # negative indices count back from the values defined so far
+    face_line = np.nonzero(is_face)[0]
+    corner_line = np.repeat(face_line, corner_count)
+    for column, name in enumerate(['v', 'vt', 'vn']):
+        negative = corners[:, column] < 0
+        if negative.any():
+            defined = np.cumsum(kind == _kinds.index(name))
+            corners[negative, column] += defined[corner_line[negative]] + 1
+    # indexes are one based and zero is not defined
+    corners -= 1
+
+    # triangulate every polygon as a fan around its first corner
+    tri_count = np.maximum(corner_count - 2, 0)
+    tri_line = np.repeat(np.arange(len(face_line)), tri_count)
+    first = (np.cumsum(corner_count) - corner_count)[tri_line]
+    fan = np.arange(len(tri_line)) - np.repeat(
+        np.cumsum(tri_count) - tri_count, tri_count) + 1
+    triangles = np.column_stack((first, first + fan, first + fan + 1))
+    tri_line = face_line[tri_line]
+
+    # objects, groups and materials are all counted per line
+    objects = np.cumsum(kind == _kinds.index('o'))
+    groups = np.cumsum(kind == _kinds.index('g'))
+    is_material = kind == _kinds.index('usemtl')
+    material_line = np.maximum.accumulate(
+        np.where(is_material, np.arange(len(kind)), -1))
+    material_names = {}
+    for line in np.nonzero(is_material)[0]:
+        name = text[starts[line] + 6:starts[line] + lengths[line]]
+        material_names[line] = name.strip().decode('utf-8')
+
+    meshes = []
+    for obj in np.unique(objects[tri_line]):
+        mask = objects[tri_line] == obj
+        mesh = _assemble(corners=corners,
+                         triangles=triangles[mask],
+                         attributes=attributes)
+
+        # groups are numbered from the start of each object
+        lines = tri_line[mask]
+        object_start = np.searchsorted(objects, obj)
+        object_end = np.searchsorted(objects, obj, side='right')
+        group_start = groups[object_start]
+        if groups[object_end - 1] > group_start:
+            mesh['metadata']['face_groups'] = groups[lines] - group_start
+
+        materials = material_line[lines]
+        if (materials >= 0).any():
+            unique, inverse = np.unique(materials, return_inverse=True)
+            mesh['metadata']['materials'] = [
+                material_names.get(i) for i in unique]
+            mesh['metadata']['face_materials'] = inverse
+
+        meshes.append(mesh)
 
     return meshes
 
 
-def export_wavefront(mesh, include_normals=True, include_texture=True):
+# the keyword at the start of each kind of line
+_kinds = ['', 'v', 'vt', 'vn', 'f', 'o', 'g', 'usemtl']
+# whitespace at the start of a line
+_indent_regex = re.compile(b'\n[ \t]+')
+
+
+def _classify(data, starts):
+    '''
+    Find the kind of every line from its first characters.
+
+    Parameters
+    ----------
+    data:   (n,) uint8, text padded past the last line
+    starts: (m,) int, index of the first character of each line
+
+    Returns
+    ----------
+    kind: (m,) int, index of keyword in _kinds, or zero for
+          comments and lines which aren't loaded
+    '''
+    kind = np.zeros(len(starts), dtype=np.int64)
+    # keywords must be followed by whitespace
+    for index, keyword in enumerate(_kinds):
+        if index == 0:
+            continue
+        match = np.ones(len(starts), dtype=np.bool)
+        for i, char in enumerate(keyword.encode('utf-8')):
+            match &= data[starts + i] == char
+        after = data[starts + len(keyword)]
+        match &= (after == ord(' ')) | (after == ord('\t'))
+        kind[match] = index
+    return kind
+
+
+def _parse_values(text, lengths, dtype):
+    '''
+    Parse the whitespace separated values of some lines.
+
+    Parameters
+    ----------
+    text:    (n,) uint8, lines with keywords blanked out,
+             each followed by a newline
+    lengths: (m,) int, length of each line
+    dtype:   numpy dtype to parse values as
+
+    Returns
+    ----------
+    values: (p,) dtype, every value in order
+    counts: (m,) int, number of values on each line
+    '''
+    if len(lengths) == 0:
+        return np.zeros(0, dtype=dtype), np.zeros(0, dtype=np.int64)
+
+    counts = _count_words(text, lengths)
+    values = np.fromstring(text.tostring(), sep=' ', dtype=dtype)
+    if len(values) != counts.sum():
+        raise ValueError('OBJ contains values which are not numbers!')
+    return values, counts
+
+
+def _parse_corners(text, lengths):
+    '''
+    Parse the vertex, texture and normal index of every corner of
+    every face.
+
+    Parameters
+    ----------
+    text:    (n,) uint8, face lines with keywords blanked out,
+             each followed by a newline
+    lengths: (m,) int, length of each line
+
+    Returns
+    ----------
+    corners: (p,3) int, vertex, texture and normal index of each
+             corner, one based with zero for missing values
+    counts:  (m,) int, number of corners on each face
+    '''
+    if len(lengths) == 0:
+        return np.zeros((0, 3), dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    # corners are words like 'v/vt/vn'
+    counts = _count_words(text, lengths)
+    corner_count = counts.sum()
+
+    text = text.tostring().replace(b'//', b'/0/')
+    slashes = text.count(b'/')
+    if slashes == 0:
+        fields = 1
+    elif slashes == corner_count * 2:
+        fields = 3
+    else:
+        # corners have a mix of formats so pad them all to 3 fields
+        text = _corner_regex.sub(_pad_corner, text)
+        fields = 3
+
+    values = np.fromstring(text.replace(b'/', b' '), sep=' ', dtype=np.int64)
+    if len(values) != corner_count * fields:
+        raise ValueError('OBJ contains faces which are not indexes!')
+
+    corners = np.zeros((corner_count, 3), dtype=np.int64)
+    corners[:, :fields] = values.reshape((-1, fields))
+    return corners, counts
+
+
+def _count_words(text, lengths):
+    '''
+    Count the runs of non- whitespace characters on each line.
+
+    Parameters
+    ----------
+    text:    (n,) uint8, lines each followed by a newline
+    lengths: (m,) int, length of each line
+
+    Returns
+    ----------
+    counts: (m,) int, number of words on each line
+    '''
+    space = (text == ord(' ')) | (text == ord('\n')) | (text == ord('\t'))
+    start = np.logical_not(space)
+    start[1:] &= space[:-1]
+    offset = np.cumsum(lengths + 1) - (lengths + 1)
+    counts = np.add.reduceat(start, offset).astype(np.int64)
+    return counts
+
+
+# a corner of a face, like '1' or '1/2' or '1/2/3'
+_corner_regex = re.compile(br'[^\s/]+(?:/[^\s/]*){0,2}')
+
+
+def _pad_corner(match):
+    '''
+    Pad a corner of a face to three fields.
+    '''
+    corner = match.group(0)
+    return corner + b'/0' * (2 - corner.count(b'/'))
+
+
+def _assemble(corners, triangles, attributes):
+    '''
+    Create kwargs for a Trimesh constructor from the corners used by
+    some triangles, with a vertex for each unique combination of
+    position, texture and normal index.
+
+    Parameters
+    ----------
+    corners:    (n,3) int, zero based index of position, texture and
+                normal of each corner, with -1 for missing values
+    triangles:  (m,3) int, index of corners
+    attributes: dict, {'v', 'vt', 'vn'} parsed values
+
+    Returns
+    ----------
+    loaded: dict with kwargs for Trimesh constructor
+    '''
+    used = corners[triangles.reshape(-1)]
+    unique, inverse = grouping.unique_rows(used)
+    # number vertices in the order they first appear
+    order = unique.argsort()
+    rank = np.zeros(len(unique), dtype=np.int64)
+    rank[order] = np.arange(len(unique))
+    unique = used[unique[order]]
+    faces = rank[inverse].reshape((-1, 3))
+
+    loaded = {'vertices': attributes['v'][unique[:, 0]],
+              'faces': faces,
+              'metadata': {}}
+    if (unique[:, 2] >= 0).all() and len(attributes['vn']) > 0:
+        loaded['vertex_normals'] = attributes['vn'][unique[:, 2]]
+    if (unique[:, 1] >= 0).all() and len(attributes['vt']) > 0:
+        loaded['metadata']['vertex_texture'] = attributes['vt'][unique[:, 1]]
+    return loaded
+
+
+def export_wavefront(mesh,
+                     include_normals=True,
+                     include_texture=True,
+                     file_obj=None,
+                     chunk=100000):
     '''
     Export a mesh as a Wavefront OBJ file
 
     Parameters
     -----------
-    mesh: Trimesh object
+    mesh:            Trimesh object
+    include_normals: bool, export vertex normals if already computed
+    include_texture: bool, export texture coordinates if defined
+    file_obj:        None, or open file object to write to a
+                     number of rows at a time
+    chunk:           int, number of rows to format at once
 
     Returns
     -----------
-    export: str, string of OBJ format output
+    export: str, string of OBJ format output,
+            or None if file_obj was passed
     '''
     # store the multiple options for formatting a vertex index for a face
     face_formats = {('v',): '{}',
@@ -131,43 +343,50 @@ def export_wavefront(mesh, include_normals=True, include_texture=True):
     # we are going to reference face_formats with this
     face_type = ['v']
 
-    export = 'v '
-    export += util.array_to_string(mesh.vertices,
-                                   col_delim=' ',
-                                   row_delim='\nv ',
-                                   digits=8) + '\n'
+    # (keyword, array) for each block of values
+    blocks = [('v', mesh.vertices)]
 
     if include_normals and 'vertex_normals' in mesh._cache:
         # if vertex normals are stored in cache export them
         # these will have been autogenerated if they have ever been called
         face_type.append('vn')
-        export += 'vn '
-        export += util.array_to_string(mesh.vertex_normals,
-                                       col_delim=' ',
-                                       row_delim='\nvn ',
-                                       digits=8) + '\n'
+        blocks.append(('vn', mesh.vertex_normals))
 
     if (include_texture and
         'vertex_texture' in mesh.metadata and
             len(mesh.metadata['vertex_texture']) == len(mesh.vertices)):
         # if vertex texture exists and is the right shape export here
         face_type.append('vt')
-        export += 'vt '
-        export += util.array_to_string(mesh.metadata['vertex_texture'],
-                                       col_delim=' ',
-                                       row_delim='\nvt ',
-                                       digits=8) + '\n'
+        blocks.append(('vt', mesh.metadata['vertex_texture']))
 
     # the format for a single vertex reference of a face
     face_format = face_formats[tuple(face_type)]
-    faces = 'f ' + util.array_to_string(mesh.faces + 1,
-                                        col_delim=' ',
-                                        row_delim='\nf ',
-                                        value_format=face_format)
-    # add the exported faces to the export
-    export += faces
-
-    return export
+    faces = mesh.faces
+
+    def chunks():
+        for keyword, values in blocks:
+            yield keyword + ' '
+            for formatted in util.array_to_string_chunks(
+                    values,
+                    chunk=chunk,
+                    col_delim=' ',
+                    row_delim='\n' + keyword + ' ',
+                    digits=8):
+                yield formatted
+            yield '\n'
+
+        yield 'f '
+        for start in range(0, len(faces), chunk):
+            formatted = util.array_to_string(
+                faces[start:start + chunk] + 1,
+                col_delim=' ',
+                row_delim='\nf ',
+                value_format=face_format)
+            if start > 0:
+                formatted = '\nf ' + formatted
+            yield formatted
+
+    return util.write_chunks(chunks(), file_obj=file_obj)
 
 
 _obj_loaders = {'obj': load_wavefront}
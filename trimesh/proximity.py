@@ -6,18 +6,21 @@ Query mesh- point proximity.
 """
 import numpy as np
 
+from . import bvh
 from . import util
+from . import sample
 
 from .constants import tol, _log_time
 from .triangles import closest_point as closest_point_corresponding
 
-from collections import deque
-
 
 def nearby_faces(mesh, points):
     """
     For each point find nearby faces relativly quickly.
 
+    Queries in this module use mesh.triangles_bvh instead, this is
+    kept as part of the public API.
+
     The closest point on the mesh to the queried point is guaranteed to be
     on one of the faces listed.
 
@@ -101,83 +104,155 @@ def closest_point_naive(mesh, points):
     return closest, distance, triangle_id
 
 
-def closest_point(mesh, points):
+def closest_point(mesh, points, chunk=20000, max_distance=None):
     """
     Given a mesh and a list of points, find the closest point on any triangle.
 
+    Points descend the triangle hierarchy of the mesh together, and
+    nodes further away than the best distance found so far are pruned.
+    The best distance starts as the distance to the nearest vertex,
+    or max_distance if it is specified.
+
     Parameters
     ----------
-    mesh   : Trimesh object
-    points : (m,3)   float, points in space
+    mesh         : Trimesh object
+    points       : (m,3)   float, points in space
+    chunk        : int, number of points to query at once, to bound memory
+    max_distance : float, only search for triangles within this distance
 
     Returns
     ----------
-    closest     : (m,3) float, closest point on triangles for each point
-    distance    : (m,)  float, distance
-    triangle_id : (m,)  int, index of triangle containing closest point
+    closest     : (m,3) float, closest point on triangles for each point,
+                  or NaN if nothing was within max_distance
+    distance    : (m,)  float, distance, or inf if nothing was
+                  within max_distance
+    triangle_id : (m,)  int, index of triangle containing closest point,
+                  or -1 if nothing was within max_distance
     """
 
     points = np.asanyarray(points, dtype=np.float64)
     if not util.is_shape(points, (-1, 3)):
         raise ValueError('points must be (n,3)!')
 
-    # do a tree- based query for faces near each point
-    candidates = nearby_faces(mesh, points)
-    # view triangles as an ndarray so we don't have to recompute
-    # the MD5 during all of the subsequent advanced indexing
-    triangles = mesh.triangles.view(np.ndarray)
+    result_close = np.zeros((len(points), 3), dtype=np.float64)
+    result_tid = np.zeros(len(points), dtype=np.int64)
+    result_distance = np.zeros(len(points), dtype=np.float64)
 
-    # create the corresponding list of triangles
-    # and query points to send to the closest_point function
-    query_point = deque()
-    query_tri = deque()
-    for triangle_ids, point in zip(candidates, points):
-        query_point.append(np.tile(point, (len(triangle_ids), 1)))
-        query_tri.append(triangles[triangle_ids])
+    for start in range(0, len(points), chunk):
+        end = start + chunk
+        if max_distance is None:
+            upper = None
+        else:
+            upper = np.full(len(points[start:end]), float(max_distance))
+        (result_close[start:end],
+         result_distance[start:end],
+         result_tid[start:end]) = _closest_point(mesh,
+                                                 points[start:end],
+                                                 upper=upper)
+
+    if max_distance is not None:
+        result_distance[result_tid < 0] = np.inf
 
-    # stack points into an (n,3) array
-    query_point = np.vstack(query_point)
-    # stack triangles into an (n,3,3) array
-    query_tri = np.vstack(query_tri)
+    return result_close, result_distance, result_tid
 
-    # do the computation for closest point
-    query_close = closest_point_corresponding(query_tri, query_point)
-    query_group = np.cumsum(np.array([len(i) for i in candidates]))[:-1]
 
-    distance_2 = ((query_close - query_point) ** 2).sum(axis=1)
+def _closest_point(mesh, points, upper=None):
+    """
+    Find the closest point on a mesh for a chunk of points.
 
-    # find the single closest point f6or each group of candidates
-    result_close = np.zeros((len(points), 3), dtype=np.float64)
-    result_tid = np.zeros(len(points), dtype=np.int64)
-    result_distance = np.zeros(len(points), dtype=np.float64)
+    Parameters
+    ----------
+    mesh   : Trimesh object
+    points : (m,3) float, points in space
+    upper  : (m,) float, only search for triangles closer than this,
+             by default the distance to the nearest vertex of a face
 
-    for i, close_points, distance, candidate in zip(
-        np.arange(
-            len(points)), np.array_split(
-            query_close, query_group), np.array_split(
-                distance_2, query_group), candidates):
-        idx = distance.argmin()
-        result_close[i] = close_points[idx]
-        result_tid[i] = candidate[idx]
-        result_distance[i] = distance[idx]
+    Returns
+    ----------
+    closest     : (m,3) float, closest point or NaN if nothing
+                  was closer than upper
+    distance    : (m,)  float, distance, or upper if nothing was found
+    triangle_id : (m,)  int, index of triangle or -1
+    """
+    # view triangles as an ndarray so we don't have to recompute
+    # the MD5 during all of the subsequent advanced indexing
+    triangles = mesh.triangles.view(np.ndarray)
+    tree = mesh.triangles_bvh
+
+    # the nearest vertex gives an upper bound for the distance
+    vertex_tree = mesh.kdtree_referenced
+    if upper is None:
+        upper = vertex_tree.query(points)[0]
+    else:
+        upper = np.zeros(len(points), dtype=np.float64) + upper
+        vertex = vertex_tree.query(points,
+                                   distance_upper_bound=upper.max())[0]
+        upper = np.minimum(upper, vertex)
+    closest = np.full((len(points), 3), np.nan, dtype=np.float64)
+    # pad the bound so triangles touching the vertex are kept
+    best = (upper + tol.merge) ** 2
+    best_tid = np.full(len(points), -1, dtype=np.int64)
+
+    query = np.arange(len(points))
+    node = np.zeros(len(points), dtype=np.int64)
+    while len(query) > 0:
+        # prune nodes which can't contain anything closer
+        lower = bvh.bounds_distance(points[query],
+                                    tree.node_bounds[node],
+                                    squared=True)
+        keep = lower <= best[query]
+        (query,
+         node,
+         leaf_query,
+         leaf_tri) = tree.expand(query[keep], node[keep])
+
+        if len(leaf_query) == 0:
+            continue
+
+        # exact distance to every triangle in the reached leaves
+        leaf_close = closest_point_corresponding(triangles[leaf_tri],
+                                                 points[leaf_query])
+        leaf_distance = ((leaf_close - points[leaf_query]) ** 2).sum(axis=1)
+
+        # the closest candidate for each query point
+        order = np.lexsort((leaf_distance, leaf_query))
+        first = order[np.append(True, np.diff(leaf_query[order]) != 0)]
+        improved = leaf_distance[first] < best[leaf_query[first]]
+        first = first[improved]
+
+        index = leaf_query[first]
+        best[index] = leaf_distance[first]
+        best_tid[index] = leaf_tri[first]
+        closest[index] = leaf_close[first]
+
+    found = best_tid >= 0
+    distance = upper.copy()
     # we were comparing the distance squared, so now take the square root
-    result_distance **= .5
+    distance[found] = best[found] ** .5
 
-    return result_close, result_distance, result_tid
+    return closest, distance, best_tid
 
 
-def signed_distance(mesh, points):
+def signed_distance(mesh,
+                    points,
+                    contains_engine=None,
+                    max_distance=None):
     """
     Find the signed distance from a mesh to a list of points.
 
     * Points OUTSIDE the mesh will have NEGATIVE distance
     * Points within tol.merge of the surface will have POSITIVE distance
     * Points INSIDE the mesh will have POSITIVE distance
+    * Points further than max_distance from the surface will be NaN
 
     Parameters
     -----------
     mesh   : Trimesh object
     points : (n,3) float, list of points in space
+    contains_engine : str, engine for Trimesh.contains used for the sign,
+                      by default the ray tests of mesh.ray
+    max_distance    : float, only find the distance for points within
+                      this distance of the surface
 
     Returns
     ----------
@@ -187,7 +262,12 @@ def signed_distance(mesh, points):
     points = np.asanyarray(points, dtype=np.float64)
 
     # find the closest point on the mesh to the queried points
-    closest, distance, triangle_id = closest_point(mesh, points)
+    closest, distance, triangle_id = closest_point(
+        mesh, points, max_distance=max_distance)
+
+    if max_distance is not None:
+        # points too far away don't need a sign
+        distance[triangle_id < 0] = np.nan
 
     # we only care about nonzero distances
     nonzero = distance > tol.merge
@@ -195,7 +275,10 @@ def signed_distance(mesh, points):
     if not nonzero.any():
         return distance
 
-    inside = mesh.ray.contains_points(points[nonzero])
+    if contains_engine is None:
+        inside = mesh.ray.contains_points(points[nonzero])
+    else:
+        inside = mesh.contains(points[nonzero], engine=contains_engine)
     sign = (inside.astype(int) * 2) - 1
 
     # apply sign to previously computed distance
@@ -204,6 +287,369 @@ def signed_distance(mesh, points):
     return distance
 
 
+def hausdorff_distance(mesh,
+                       other,
+                       symmetric=True,
+                       count=10000,
+                       tolerance=None,
+                       chunk=20000):
+    """
+    Find the Hausdorff distance between two meshes, the largest
+    distance from a point on one surface to the other surface.
+
+    The surface is represented by its vertices plus random samples.
+    Points are checked in order of the distance to the nearest vertex
+    of the other mesh, which is an upper bound for their distance, and
+    stop being checked once that bound can't increase the result.
+
+    Parameters
+    -----------
+    mesh:      Trimesh object
+    other:     Trimesh object
+    symmetric: bool, if False only distances from mesh to other
+    count:     int, number of random samples on each surface
+    tolerance: float, if specified stop as soon as a distance larger
+                      than tolerance is found
+    chunk:     int, number of points to query at once
+
+    Returns
+    ----------
+    distance: float, Hausdorff distance, or if it exceeds tolerance
+                     a distance larger than tolerance
+    """
+    pairs = [(mesh, other)]
+    if symmetric:
+        pairs.append((other, mesh))
+
+    distance = 0.0
+    for source, target in pairs:
+        points = np.vstack((source.vertices,
+                            sample.sample_surface(source, count)[0]))
+        upper = target.kdtree_referenced.query(points)[0]
+
+        # check points with the largest bound first
+        order = np.argsort(upper)[::-1]
+        for start in range(0, len(order), chunk):
+            index = order[start:start + chunk]
+            # points sorted so remaining bounds are all smaller
+            index = index[upper[index] > distance]
+            if len(index) == 0:
+                break
+            found = _closest_point(target,
+                                   points[index],
+                                   upper=upper[index])[1]
+            distance = max(distance, found.max())
+            if tolerance is not None and distance > tolerance:
+                return distance
+    return distance
+
+
+def surface_deviation(mesh, other, symmetric=True, count=10000):
+    """
+    Find statistics of the distance from one surface to another,
+    using area weighted random samples.
+
+    Parameters
+    -----------
+    mesh:      Trimesh object
+    other:     Trimesh object
+    symmetric: bool, if False only sample the surface of mesh
+    count:     int, number of random samples on each surface
+
+    Returns
+    ----------
+    deviation: dict with keys:
+                 'max':  float, largest sampled distance
+                 'mean': float, mean distance
+                 'rms':  float, root mean square distance
+    """
+    pairs = [(mesh, other)]
+    if symmetric:
+        pairs.append((other, mesh))
+
+    distance = np.hstack([
+        closest_point(target,
+                      sample.sample_surface(source, count)[0])[1]
+        for source, target in pairs])
+
+    deviation = {'max': distance.max(),
+                 'mean': distance.mean(),
+                 'rms': np.sqrt((distance ** 2).mean())}
+    return deviation
+
+
+def signed_distance_grid(mesh,
+                         pitch=None,
+                         resolution=64,
+                         band=None,
+                         exact=0.0,
+                         contains_engine='winding',
+                         chunk=20000):
+    """
+    Sample the signed distance of a mesh at the nodes of a regular grid
+    so that repeated queries can be answered by interpolation.
+
+    Parameters
+    -----------
+    mesh:            Trimesh object
+    pitch:           float, distance between grid nodes
+    resolution:      int, if pitch is None the number of cells
+                          along the longest side of the mesh bounds
+    band:            float, if specified only nodes closer than band to
+                            the surface are computed exactly, and the
+                            rest store +/- band
+    exact:           float, queries with an interpolated distance
+                            smaller than this are computed exactly
+    contains_engine: str, engine for the occupancy grid used to sign
+                          distances, passed to Trimesh.contains
+    chunk:           int, number of nodes to query at once
+
+    Returns
+    ----------
+    grid: SignedDistanceGrid object
+    """
+    if pitch is None:
+        pitch = mesh.extents.max() / float(resolution)
+    pitch = float(pitch)
+    if band is not None:
+        band = float(band)
+
+    # two cells of padding around the mesh like the occupancy grid
+    origin = mesh.bounds[0] - pitch * 2.0
+    shape = tuple(np.ceil(mesh.extents / pitch).astype(int) + 5)
+    nodes = origin + np.column_stack(np.unravel_index(
+        np.arange(np.prod(shape)), shape)) * pitch
+
+    distance = np.zeros(len(nodes), dtype=np.float64)
+    for start in range(0, len(nodes), chunk):
+        end = start + chunk
+        if band is None:
+            upper = None
+        else:
+            # nodes further than the band are pruned immediately
+            upper = np.full(len(nodes[start:end]), band)
+        distance[start:end] = _closest_point(mesh,
+                                             nodes[start:end],
+                                             upper=upper)[1]
+
+    # nodes on the surface have positive distance
+    nonzero = distance > tol.merge
+    if nonzero.any():
+        # cells away from the surface are signed with a lookup
+        occupancy = mesh.occupancy_grid(pitch=pitch,
+                                        engine=contains_engine)
+        inside = occupancy.contains_points(nodes[nonzero])
+        distance[nonzero] *= (inside.astype(int) * 2) - 1
+
+    grid = SignedDistanceGrid(origin=origin,
+                              pitch=pitch,
+                              values=distance.reshape(shape),
+                              band=band,
+                              exact=exact,
+                              mesh=mesh,
+                              contains_engine=contains_engine)
+    return grid
+
+
+def load_signed_distance_grid(file_obj, mesh=None):
+    """
+    Load a signed distance grid saved by SignedDistanceGrid.export.
+
+    Parameters
+    -----------
+    file_obj: str, file name or file object
+    mesh:     Trimesh object, used for exact queries if passed
+
+    Returns
+    ----------
+    grid: SignedDistanceGrid object
+    """
+    loaded = np.load(file_obj)
+    band = float(loaded['band'])
+    if not np.isfinite(band):
+        band = None
+    grid = SignedDistanceGrid(origin=loaded['origin'],
+                              pitch=float(loaded['pitch']),
+                              values=loaded['values'],
+                              band=band,
+                              exact=float(loaded['exact']),
+                              mesh=mesh)
+    return grid
+
+
+class SignedDistanceGrid(object):
+    """
+    Signed distance sampled at the nodes of a regular grid, queried
+    with trilinear interpolation.
+
+    Values follow signed_distance: positive inside, negative outside.
+    """
+
+    def __init__(self,
+                 origin,
+                 pitch,
+                 values,
+                 band=None,
+                 exact=0.0,
+                 mesh=None,
+                 contains_engine='winding'):
+        """
+        Parameters
+        ------------
+        origin:          (3,) float, position of node (0, 0, 0)
+        pitch:           float, distance between nodes
+        values:          (i,j,k) float, signed distance at nodes
+        band:            float or None, distances are clamped to band
+        exact:           float, if a mesh is available queries with an
+                                interpolated distance smaller than this,
+                                or outside the grid, are computed exactly
+        mesh:            Trimesh object or None
+        contains_engine: str, engine used for exact queries
+        """
+        self.origin = np.asanyarray(origin, dtype=np.float64).reshape(3)
+        self.pitch = float(pitch)
+        self.values = np.asanyarray(values, dtype=np.float64)
+        if len(self.values.shape) != 3 or min(self.values.shape) < 2:
+            raise ValueError('values must be (i,j,k) with at least 2 nodes!')
+        self.band = band
+        self.exact = float(exact)
+        self.mesh = mesh
+        self.contains_engine = contains_engine
+
+    @property
+    def shape(self):
+        """
+        Number of nodes along each axis.
+
+        Returns
+        ----------
+        shape: (3,) int, shape of self.values
+        """
+        return self.values.shape
+
+    @property
+    def bounds(self):
+        """
+        The axis aligned box covered by the grid nodes.
+
+        Returns
+        ----------
+        bounds: (2,3) float, minimum and maximum corner
+        """
+        size = (np.array(self.shape) - 1) * self.pitch
+        return np.vstack((self.origin, self.origin + size))
+
+    def _interpolate(self, points):
+        """
+        Trilinear interpolation of the grid values and their gradient,
+        clamping points to the grid.
+
+        Returns
+        ----------
+        value:    (n,) float, interpolated signed distance
+        gradient: (n,3) float, gradient of interpolated distance
+        outside:  (n,) float, distance from points to the grid bounds
+        """
+        local = (points - self.origin) / self.pitch
+        limit = np.array(self.shape) - 1
+        clamped = np.clip(local, 0, limit)
+        outside = np.linalg.norm(local - clamped, axis=1) * self.pitch
+
+        # the cell of each point and position inside of it
+        lower = np.clip(np.floor(clamped).astype(np.int64), 0, limit - 1)
+        frac = clamped - lower
+
+        value = np.zeros(len(points), dtype=np.float64)
+        gradient = np.zeros((len(points), 3), dtype=np.float64)
+        flat = self.values.ravel()
+        for corner in np.ndindex(2, 2, 2):
+            corner = np.array(corner)
+            sample = flat[np.ravel_multi_index((lower + corner).T,
+                                               self.shape)]
+            # weight of the corner along each axis
+            axis = np.where(corner, frac, 1.0 - frac)
+            value += sample * axis.prod(axis=1)
+            # derivative of the weight product along each axis
+            sign = np.where(corner, 1.0, -1.0)
+            for i in range(3):
+                others = [j for j in range(3) if j != i]
+                gradient[:, i] += (sample * sign[i] *
+                                   axis[:, others].prod(axis=1))
+        gradient /= self.pitch
+
+        return value, gradient, outside
+
+    def distance(self, points):
+        """
+        Find the signed distance at points.
+
+        Points outside of the grid are computed exactly if the grid has
+        a mesh, otherwise the distance to the grid is subtracted from
+        the value on its boundary.
+
+        Parameters
+        ------------
+        points: (n,3) float, points in space
+
+        Returns
+        ------------
+        distance: (n,) float, signed distance, positive inside
+        """
+        points = np.asanyarray(points, dtype=np.float64)
+        if not util.is_shape(points, (-1, 3)):
+            raise ValueError('points must be (n,3)!')
+
+        distance, gradient, outside = self._interpolate(points)
+        distance -= outside
+
+        if self.mesh is not None:
+            check = np.logical_or(np.abs(distance) < self.exact,
+                                  outside > 0.0)
+            if check.any():
+                distance[check] = signed_distance(
+                    self.mesh,
+                    points[check],
+                    contains_engine=self.contains_engine)
+        return distance
+
+    def gradient(self, points):
+        """
+        Find the gradient of the interpolated signed distance at points,
+        which points towards the inside of the mesh.
+
+        Parameters
+        ------------
+        points: (n,3) float, points in space
+
+        Returns
+        ------------
+        gradient: (n,3) float, gradient of signed distance
+        """
+        points = np.asanyarray(points, dtype=np.float64)
+        if not util.is_shape(points, (-1, 3)):
+            raise ValueError('points must be (n,3)!')
+        return self._interpolate(points)[1]
+
+    def export(self, file_obj):
+        """
+        Save the grid as a compressed numpy archive, which can be read
+        with load_signed_distance_grid.
+
+        Parameters
+        ------------
+        file_obj: str, file name or open file object
+        """
+        band = self.band
+        if band is None:
+            band = np.inf
+        np.savez_compressed(file_obj,
+                            origin=self.origin,
+                            pitch=self.pitch,
+                            values=self.values,
+                            band=band,
+                            exact=self.exact)
+
+
 class ProximityQuery(object):
     """
     Proximity queries for the current mesh.
@@ -211,16 +657,21 @@ class ProximityQuery(object):
 
     def __init__(self, mesh):
         self._mesh = mesh
+        self._cache = util.Cache(id_function=self._mesh.crc)
 
     @_log_time
-    def on_surface(self, points):
+    def on_surface(self, points, max_distance=None):
         """
         Given list of points, for each point find the closest point
         on any triangle of the mesh.
 
         Parameters
         ----------
-        points : (m,3) float, points in space
+        points       : (m,3) float, points in space
+        max_distance : float, only search for triangles within this
+                       distance, and return a distance of inf, a
+                       triangle_id of -1 and a closest point of NaN
+                       for points with nothing closer
 
         Returns
         ----------
@@ -229,15 +680,151 @@ class ProximityQuery(object):
         triangle_id : (m,)  int, index of closest triangle for each point
         """
         return closest_point(mesh=self._mesh,
-                             points=points)
+                             points=points,
+                             max_distance=max_distance)
+
+    def on_surface_approximate(self, points, error=None, relative=1e-3):
+        """
+        Given list of points, for each point find a point on the mesh
+        whose distance exceeds the exact distance by at most
+        max(error, relative * exact distance).
+
+        Points are matched to the nearest of a set of samples which
+        cover the surface within a radius, and then moved to the
+        closest point on the triangle of that sample, so the distance
+        is never less than the exact distance and at most radius more.
+        Covers are cached with radius growing by a factor of four from
+        error, and each point uses the coarsest cover which is accurate
+        enough for its distance. Points far from the surface relative
+        to the spacing of that cover are answered exactly, as tree
+        queries get slow when many samples are nearly equidistant.
+
+        Parameters
+        ----------
+        points   : (m,3) float, points in space
+        error    : float, absolute error allowed for every point,
+                   by default mesh.scale / 1000
+        relative : float, error allowed relative to distance
+
+        Returns
+        ----------
+        closest     : (m,3) float, point on triangles for each point
+        distance    : (m,)  float, distance
+        triangle_id : (m,)  int, index of triangle for each point
+        """
+        points = np.asanyarray(points, dtype=np.float64)
+        if not util.is_shape(points, (-1, 3)):
+            raise ValueError('points must be (n,3)!')
+        if error is None:
+            error = self._mesh.scale / 1000.0
+        error = float(error)
+        if error <= 0.0:
+            raise ValueError('error must be positive!')
+
+        # radius of each cover with the coarsest around a tenth
+        # of the mesh size and the finest exactly error
+        count = max(int(np.log(self._mesh.scale / (10.0 * error)) /
+                        np.log(4.0)), 0)
+        radii = error * 4.0 ** np.arange(count + 1)
+
+        # the coarsest cover gives a distance for every point
+        closest, distance, triangle_id = self._cover_query(
+            points, radii[-1])
+
+        # the exact distance is at least distance - radius
+        allowed = np.maximum(error,
+                             relative * (distance - radii[-1]))
+        level = np.searchsorted(radii, allowed, side='right') - 1
+        level = np.clip(level, 0, count)
+
+        # points far away relative to the spacing of their cover
+        far = np.logical_and(level < count,
+                             distance - radii[-1] > radii[level] * 64.0)
+        if far.any():
+            index = np.nonzero(far)[0]
+            exact = _closest_point(self._mesh,
+                                   points[index],
+                                   upper=distance[index])
+            # keep the current triangle if nothing was closer
+            found = exact[2] >= 0
+            index = index[found]
+            closest[index] = exact[0][found]
+            distance[index] = exact[1][found]
+            triangle_id[index] = exact[2][found]
+
+        for current in np.unique(level[np.logical_not(far)]):
+            if current == count:
+                continue
+            index = np.nonzero(np.logical_and(level == current,
+                                              np.logical_not(far)))[0]
+            (closest[index],
+             distance[index],
+             triangle_id[index]) = self._cover_query(points[index],
+                                                     radii[current])
+
+        return closest, distance, triangle_id
+
+    def _cover_query(self, points, radius):
+        """
+        Find a point on the surface at most radius further away than
+        the closest point using a cover of samples.
+
+        Parameters
+        ----------
+        points : (m,3) float, points in space
+        radius : float, radius of cover
+
+        Returns
+        ----------
+        closest     : (m,3) float, point on triangles for each point
+        distance    : (m,)  float, distance
+        triangle_id : (m,)  int, index of triangle for each point
+        """
+        tree, face_index = self._surface_cover(radius)
+        triangle_id = face_index[tree.query(points)[1]]
+        closest = closest_point_corresponding(
+            self._mesh.triangles.view(np.ndarray)[triangle_id],
+            points)
+        distance = np.linalg.norm(closest - points, axis=1)
+        return closest, distance, triangle_id
+
+    def _surface_cover(self, radius):
+        """
+        A cached tree of samples covering the surface within radius.
+
+        Parameters
+        ----------
+        radius : float, maximum distance from surface to a sample
 
-    def vertex(self, points):
+        Returns
+        ----------
+        tree       : scipy.spatial.cKDTree of samples
+        face_index : (n,) int, face of each sample
+        """
+        from scipy.spatial import cKDTree
+
+        key = 'surface_cover_{}'.format(radius)
+        if key not in self._cache:
+            samples, face_index = sample.sample_surface_cover(
+                self._mesh, radius=radius)
+            # median splits are slow to build and to query on
+            # the regular grids of samples on each triangle
+            tree = cKDTree(samples,
+                           balanced_tree=False,
+                           compact_nodes=False)
+            self._cache[key] = (tree, face_index)
+        return self._cache[key]
+
+    def vertex(self, points, max_distance=None):
         """
         Given a set of points, return the closest vertex index to each point
 
         Parameters
         ----------
-        points : (n,3) float, list of points in space
+        points       : (n,3) float, list of points in space
+        max_distance : float, only search for vertices within this
+                       distance, and return a distance of inf and
+                       a vertex_id of -1 for points with nothing closer
 
         Returns
         ----------
@@ -245,22 +832,111 @@ class ProximityQuery(object):
         vertex_id : (n,) int, index of mesh.vertices which is closest
         """
         tree = self._mesh.kdtree
-        return tree.query(points)
+        if max_distance is None:
+            return tree.query(points)
+
+        distance, vertex_id = tree.query(points,
+                                         distance_upper_bound=max_distance)
+        # scipy marks missing neighbors with the number of points
+        vertex_id[vertex_id >= len(self._mesh.vertices)] = -1
+        return distance, vertex_id
+
+    def within_distance(self, points, distance):
+        """
+        Check if points are within a distance of the surface of the mesh.
+
+        Points with a vertex within distance are answered from the
+        vertex tree, and only the rest search the triangles.
 
-    def signed_distance(self, points):
+        Parameters
+        ----------
+        points   : (n,3) float, list of points in space
+        distance : float, distance from surface
+
+        Returns
+        ----------
+        within : (n,) bool, whether each point is within distance
+        """
+        points = np.asanyarray(points, dtype=np.float64)
+        if not util.is_shape(points, (-1, 3)):
+            raise ValueError('points must be (n,3)!')
+
+        # only vertices used by faces are on the surface
+        within = self._mesh.kdtree_referenced.query(
+            points, distance_upper_bound=distance)[0] <= distance
+        check = np.logical_not(within)
+        if check.any():
+            found = closest_point(self._mesh,
+                                  points[check],
+                                  max_distance=distance)[1]
+            within[check] = found <= distance
+        return within
+
+    def signed_distance(self,
+                        points,
+                        contains_engine=None,
+                        max_distance=None):
         """
         Find the signed distance from a mesh to a list of points.
 
         * Points OUTSIDE the mesh will have NEGATIVE distance
         * Points within tol.merge of the surface will have POSITIVE distance
         * Points INSIDE the mesh will have POSITIVE distance
+        * Points further than max_distance from the surface will be NaN
 
         Parameters
         -----------
         points : (n,3) float, list of points in space
+        contains_engine : str, engine for Trimesh.contains used for the sign,
+                          for example 'grid' to use a cached occupancy grid
+        max_distance    : float, only find the distance for points within
+                          this distance of the surface
 
         Returns
         ----------
         signed_distance : (n,3) float, signed distance from point to mesh
         """
-        return signed_distance(self._mesh, points)
+        return signed_distance(self._mesh,
+                               points,
+                               contains_engine=contains_engine,
+                               max_distance=max_distance)
+
+    def signed_distance_grid(self,
+                             pitch=None,
+                             resolution=64,
+                             band=None,
+                             exact=0.0,
+                             contains_engine='winding'):
+        """
+        A cached grid of signed distance for fast repeated queries.
+
+        The grid is computed on first query and kept until the mesh
+        changes, and each combination of arguments is cached separately.
+
+        Parameters
+        -----------
+        pitch:           float, distance between grid nodes
+        resolution:      int, if pitch is None the number of cells
+                              along the longest side of the mesh bounds
+        band:            float, only compute nodes closer than band to
+                                the surface exactly
+        exact:           float, queries with an interpolated distance
+                                smaller than this are computed exactly
+        contains_engine: str, engine used to sign distances
+
+        Returns
+        ----------
+        grid: SignedDistanceGrid object
+        """
+        key = 'signed_distance_grid_{}_{}_{}_{}_{}'.format(
+            pitch, resolution, band, exact, contains_engine)
+        if key in self._cache:
+            return self._cache[key]
+        grid = signed_distance_grid(self._mesh,
+                                    pitch=pitch,
+                                    resolution=resolution,
+                                    band=band,
+                                    exact=exact,
+                                    contains_engine=contains_engine)
+        self._cache[key] = grid
+        return grid
@@ -9,13 +9,25 @@ from pyembree.mesh_construction import TriangleMesh
 from .ray_util import contains_points
 
 from .. import util
-from .. import intersections
 
-# the factor of geometry.scale to offset a ray from a triangle
-# to reliably not hit its origin triangle
-_ray_offset_factor = 1e-4
+from ..constants import tol
+
+# the factor of the largest coordinate to offset a ray origin past
+# a triangle it just hit, close to the float32 resolution embree uses
+_ray_offset_factor = 1e-6
 # for very small meshes, we want to clip our offset to a sane distance
 _ray_offset_floor = 1e-8
+# how many times the offset of a ray may be doubled when embree
+# keeps reporting the triangle the ray was just moved past
+_ray_offset_retries = 16
+
+
+class EmbreeScene(rtcore_scene.EmbreeScene):
+    """
+    An embree scene which supports weak references, so it can be
+    shared between identical meshes with util.registry.
+    """
+    pass
 
 
 class RayMeshIntersector:
@@ -27,10 +39,16 @@ class RayMeshIntersector:
     @util.cache_decorator
     def _scene(self):
         '''
-        A cached version of the pyembree scene.
+        A cached version of the pyembree scene, shared by every
+        mesh with the same geometry.
         '''
-        scene = rtcore_scene.EmbreeScene()
-        mesh = TriangleMesh(scene, self.mesh.triangles)
+        def create():
+            scene = EmbreeScene()
+            TriangleMesh(scene, self.mesh.triangles)
+            return scene
+
+        scene = util.registry.get(('embree_scene', self.mesh.md5()),
+                                  create)
         return scene
 
     def intersects_location(self,
@@ -70,18 +88,25 @@ class RayMeshIntersector:
         Find the triangles hit by a list of rays, including optionally
         multiple hits along a single ray.
 
+        Every hit is measured exactly from the original ray origin, and
+        rays are only moved past a hit by a distance close to the float
+        resolution of embree, so thin walls are not skipped. Hits on
+        the shared edge or vertex of several triangles are reported once.
+
         Parameters
         ----------
         ray_origins:      (n,3) float, origins of rays
         ray_directions:   (n,3) float, direction (vector) of rays
         multiple_hits:    bool, if True will return every hit along the ray
                                 if False will only return first hit
+        max_hits:         int, maximum number of hits per ray
         return_locations: bool, should we return hit locations or not
 
         Returns
         ----------
         index_tri: (m,) int, index of triangle the ray hit
-        index_ray: (m,) int, index of ray
+        index_ray: (m,) int, index of ray, sorted with hits along
+                             each ray ordered by distance
         locations: (m,3) float, locations in space
         '''
         # make sure input is float64 for embree
@@ -89,92 +114,108 @@ class RayMeshIntersector:
         ray_directions = np.asanyarray(ray_directions, dtype=np.float64)
         ray_directions = util.unitize(ray_directions)
 
-        # since we are constructing all hits, save them to a deque then
-        # stack into (depth, len(rays)) at the end
+        if len(ray_origins) == 0:
+            # no rays means no hits
+            empty = np.zeros(0, dtype=np.int64)
+            if return_locations:
+                return empty, empty, np.zeros((0, 3), dtype=np.float64)
+            return empty, empty
+
+        if not multiple_hits and not return_locations:
+            # a single embree query is all we need
+            first = self._scene.run(ray_origins, ray_directions)
+            hit = first != -1
+            return first[hit], np.nonzero(hit)[0]
+
+        if not multiple_hits:
+            max_hits = 1
+
+        # grab the planes from triangles
+        plane_origins = self.mesh.triangles[:, 0, :]
+        plane_normals = self.mesh.face_normals
+
+        # the smallest distance to move a ray past a hit, which is
+        # relative to the coordinates rather than the mesh size
+        # as embree is limited by absolute float32 resolution
+        offset_min = np.abs(self.mesh.bounds).max() * _ray_offset_factor
+        offset_min = max(offset_min, _ray_offset_floor)
+
+        # distance along each ray to the last recorded hit
+        start = np.zeros(len(ray_origins), dtype=np.float64)
+        # distance past the last hit to start the next query from
+        offset = np.zeros(len(ray_origins), dtype=np.float64)
+        # how many times the offset of each ray has been increased
+        retries = np.zeros(len(ray_origins), dtype=np.int64)
+        # how many hits have been recorded for each ray
+        count = np.zeros(len(ray_origins), dtype=np.int64)
+
         result_triangle = deque()
         result_ray_idx = deque()
-        result_locations = deque()
-
-        # the mask for which rays are still active
-        current = np.ones(len(ray_origins), dtype=np.bool)
-
-        if multiple_hits or return_locations:
-            # how much to offset ray to transport to the other side of it
-            offset_distance = self.mesh.scale * _ray_offset_factor
-            offset_distance = np.clip(offset_distance,
-                                      a_min=_ray_offset_floor,
-                                      a_max=1.0)
-            ray_offset = ray_directions * offset_distance
-
-            # grab the planes from triangles
-            plane_origins = self.mesh.triangles[:, 0, :]
-            plane_normals = self.mesh.face_normals
-
-        # use a for loop rather than a while to ensure this exits
-        # if a ray is offset from a triangle and then is reported hitting
-        # itself this could get stuck on that one triangle
-        for query_depth in range(max_hits):
-            # run the pyembree query
-            query = self._scene.run(ray_origins[current],
-                                    ray_directions[current])
-
-            # basically we need to reduce the rays to the ones that hit
-            # something
+        result_distance = deque()
+
+        # the indexes of rays which are still active
+        current = np.arange(len(ray_origins))
+        while len(current) > 0:
+            # move each ray to just past its last hit
+            origins = ray_origins[current] + (
+                ray_directions[current] *
+                (start[current] + offset[current]).reshape((-1, 1)))
+            query = self._scene.run(origins, ray_directions[current])
+
+            # rays that hit nothing are finished
             hit = query != -1
-            # which triangle indexes were hit
-            hit_triangle = query[hit]
-
-            # eliminate rays that didn't hit anything from future queries
-            current_index = np.nonzero(current)[0]
-            current_index_no_hit = current_index[np.logical_not(hit)]
-            current_index_hit = current_index[hit]
-            current[current_index_no_hit] = False
-
-            # append the triangle and ray index to the results
-            result_triangle.append(hit_triangle)
-            result_ray_idx.append(current_index_hit)
-
-            # if we don't need all of the hits, return the first one
-            if ((not multiple_hits and
-                 not return_locations) or
-                    not hit.any()):
-                break
-
-            # find the location of where the ray hit the triangle plane
-            new_origins, valid = intersections.planes_lines(
-                plane_origins=plane_origins[hit_triangle],
-                plane_normals=plane_normals[hit_triangle],
-                line_origins=ray_origins[current],
-                line_directions=ray_directions[current])
-
-            if not valid.all():
-                # since a plane intersection was invalid we have to go back and
-                # fix some stuff, we pop the ray index and triangle index,
-                # apply the valid mask then append it right back to keep our
-                # indexes intact
-                result_ray_idx.append(result_ray_idx.pop()[valid])
-                result_triangle.append(result_triangle.pop()[valid])
-
-                # update the current rays to reflect that we couldn't find a
-                # new origin
-                current[current_index_hit[np.logical_not(valid)]] = False
-
-            # since we had to find the intersection point anyway we save it
-            # even if we're not going to return it
-            result_locations.extend(new_origins)
-
-            if multiple_hits:
-                # move the ray origin to the other side of the triangle
-                ray_origins[current] = new_origins + ray_offset[current]
-            else:
-                break
+            current = current[hit]
+            triangle = query[hit]
+
+            # exact distance along the original ray to the hit plane
+            normal = plane_normals[triangle]
+            projection = util.diagonal_dot(ray_directions[current], normal)
+            valid = np.abs(projection) > tol.zero
+            distance = np.zeros(len(current), dtype=np.float64)
+            distance[valid] = util.diagonal_dot(
+                plane_origins[triangle[valid]] - ray_origins[current[valid]],
+                normal[valid]) / projection[valid]
+
+            # a hit which isn't past the last recorded one is the same
+            # triangle again or a neighbor sharing an edge or vertex
+            new = np.logical_and(
+                valid, np.logical_or(count[current] == 0,
+                                     distance > start[current] + offset_min))
+
+            result_triangle.append(triangle[new])
+            result_ray_idx.append(current[new])
+            result_distance.append(distance[new])
+
+            recorded = current[new]
+            start[recorded] = distance[new]
+            offset[recorded] = offset_min
+            retries[recorded] = 0
+            count[recorded] += 1
+
+            # rays stuck on a hit move a little further each time
+            stuck = current[np.logical_not(new)]
+            offset[stuck] = np.maximum(offset[stuck], offset_min) * 2.0
+            retries[stuck] += 1
+
+            current = current[np.logical_and(
+                count[current] < max_hits,
+                retries[current] <= _ray_offset_retries)]
 
         # stack the deques into nice 1D numpy arrays
-        index_tri = np.hstack(result_triangle)
-        index_ray = np.hstack(result_ray_idx)
+        index_tri = np.hstack(result_triangle).astype(np.int64)
+        index_ray = np.hstack(result_ray_idx).astype(np.int64)
+        distance = np.hstack(result_distance)
+
+        # order hits by ray and then by distance along the ray
+        order = np.lexsort((distance, index_ray))
+        index_tri = index_tri[order]
+        index_ray = index_ray[order]
 
         if return_locations:
-            return index_tri, index_ray, np.array(result_locations)
+            locations = (ray_origins[index_ray] +
+                         ray_directions[index_ray] *
+                         distance[order].reshape((-1, 1)))
+            return index_tri, index_ray, locations
         return index_tri, index_ray
 
     def intersects_first(self,
@@ -0,0 +1,137 @@
+"""
+ray_render.py
+---------------
+
+Render depth, normal and index images by casting one ray per pixel,
+which works on headless machines where OpenGL is unavailable.
+"""
+import numpy as np
+
+from .. import util
+from .. import triangles
+
+from ..constants import log
+from ..scene import cameras
+
+
+def render(geometry,
+           resolution=(320, 240),
+           transform=None,
+           angles=None,
+           distance=None,
+           center=None,
+           fov=60.0,
+           orthographic=False,
+           chunk=65536):
+    """
+    Render a mesh or scene into images by casting rays through the
+    intersector of the mesh.
+
+    If transform isn't passed the camera is placed the same way as
+    Scene.set_camera would place it from angles, distance and center.
+
+    Parameters
+    ------------
+    geometry:     Trimesh or Scene object
+    resolution:   (2,) int, (width, height) in pixels
+    transform:    (4,4) float, camera to world transform
+    angles:       (3,) float, euler angles of the camera in radians
+    distance:     float, distance of camera from center
+    center:       (3,) float, point camera looks at
+    fov:          float, vertical field of view in degrees
+    orthographic: bool, if True rays are parallel and the view is
+                  the size of the perspective view at center
+    chunk:        int, number of rays to cast at once
+
+    Returns
+    ------------
+    rendered: dict with keys:
+              'depth':  (height, width) float, distance along the view
+                        direction, np.inf where nothing was hit
+              'normal': (height, width, 3) float, face normal or zeros
+              'face':   (height, width) int, index of face or -1,
+                        for scenes the face of the node geometry
+              'node':   (height, width) int, only for scenes, index of
+                        node in rendered['nodes'] or -1
+              'nodes':  (n,) str, only for scenes, names of nodes
+    """
+    is_scene = util.is_instance_named(geometry, 'Scene')
+    if is_scene:
+        # render a single triangle soup of every node
+        # as rays need a single intersector
+        from ..base import Trimesh
+        mesh = Trimesh(**triangles.to_kwargs(geometry.triangles),
+                       process=False)
+        nodes, node_index = np.unique(geometry.triangles_node,
+                                      return_inverse=True)
+        # triangles of each node are contiguous in the soup
+        # so subtract the start of each block for the local face index
+        block = np.append(0, np.nonzero(np.diff(node_index))[0] + 1)
+        face_offset = np.repeat(block, np.diff(np.append(block,
+                                                         len(node_index))))
+    else:
+        mesh = geometry
+
+    if transform is None:
+        if center is None:
+            center = mesh.bounds.mean(axis=0)
+        if distance is None:
+            # matches the default from Scene.set_camera
+            distance = ((mesh.extents.max() / 2) /
+                        np.tan(np.radians(fov) / 2.0))
+        transform = cameras.camera_transform(center=center,
+                                             distance=distance,
+                                             angles=angles)
+    transform = np.asanyarray(transform, dtype=np.float64)
+
+    view = None
+    if orthographic:
+        # size the view to match the perspective view at center
+        if center is None:
+            center = mesh.bounds.mean(axis=0)
+        depth_center = np.linalg.norm(transform[:3, 3] - center)
+        height = 2.0 * depth_center * np.tan(np.radians(fov) / 2.0)
+        view = [height * resolution[0] / float(resolution[1]), height]
+
+    origins, directions = cameras.camera_rays(transform=transform,
+                                              resolution=resolution,
+                                              fov=fov,
+                                              orthographic=view)
+    # the view direction of the camera is -Z
+    forward = -transform[:3, 2]
+
+    depth = np.full(len(origins), np.inf, dtype=np.float64)
+    face = np.full(len(origins), -1, dtype=np.int64)
+
+    for start in range(0, len(origins), chunk):
+        end = start + chunk
+        locations, index_ray, index_tri = mesh.ray.intersects_location(
+            ray_origins=origins[start:end],
+            ray_directions=directions[start:end],
+            multiple_hits=False)
+        if len(index_ray) == 0:
+            continue
+        index_ray = np.asanyarray(index_ray, dtype=np.int64) + start
+        depth[index_ray] = np.dot(np.asanyarray(locations) -
+                                  origins[index_ray], forward)
+        face[index_ray] = index_tri
+
+    hit = face >= 0
+    normal = np.zeros((len(origins), 3), dtype=np.float64)
+    normal[hit] = mesh.face_normals[face[hit]]
+
+    shape = (int(resolution[1]), int(resolution[0]))
+    rendered = {'depth': depth.reshape(shape),
+                'normal': normal.reshape(shape + (3,))}
+
+    if is_scene:
+        node = np.full(len(origins), -1, dtype=np.int64)
+        node[hit] = node_index[face[hit]]
+        face[hit] -= face_offset[face[hit]]
+        rendered['node'] = node.reshape(shape)
+        rendered['nodes'] = nodes
+    rendered['face'] = face.reshape(shape)
+
+    log.debug('rendered %d rays, %d hits', len(origins), hit.sum())
+
+    return rendered
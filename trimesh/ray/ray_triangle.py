@@ -233,11 +233,9 @@ def ray_triangle_id(triangles,
     if len(index_ray) == 0:
         return index_tri, index_ray, location
 
-    first = np.zeros(len(index_ray), dtype=np.bool)
-    groups = grouping.group(index_ray)
-    for group in groups:
-        index = group[distance[group].argmin()]
-        first[index] = True
+    # sort hits by ray then distance and take the first of every ray
+    order = np.lexsort((distance, index_ray))
+    first = order[np.append(True, np.diff(index_ray[order]) != 0)]
 
     return index_tri[first], index_ray[first], location[first]
 
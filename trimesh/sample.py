@@ -138,6 +138,58 @@ def sample_surface_even(mesh, count):
     return result, ids[mask]
 
 
+def sample_surface_cover(mesh, radius):
+    """
+    Sample the surface of a mesh on a regular grid inside every
+    triangle, so that every point on the surface is guaranteed to be
+    within radius of a sample on the same triangle.
+
+    Each triangle is split into similar sub- triangles whose longest
+    edge is at most radius * sqrt(3), and any point in a triangle is
+    within longest edge / sqrt(3) of one of its vertices.
+
+    Parameters
+    ---------
+    mesh:   Trimesh object
+    radius: float, maximum distance from the surface to a sample
+
+    Returns
+    ---------
+    samples:    (n,3) float, points in space on the surface of mesh
+    face_index: (n,) int, indices of faces for each sampled point
+    """
+    radius = float(radius)
+    if radius <= 0.0:
+        raise ValueError('radius must be positive!')
+
+    triangles = mesh.triangles.view(np.ndarray)
+    edge = np.linalg.norm(triangles - np.roll(triangles, 1, axis=1),
+                          axis=2).max(axis=1)
+    # number of divisions along each edge of every triangle
+    divisions = np.maximum(np.ceil(edge / (radius * np.sqrt(3))),
+                           1).astype(np.int64)
+
+    samples = []
+    face_index = []
+    for count in np.unique(divisions):
+        faces = np.nonzero(divisions == count)[0]
+        # barycentric grid of points with i + j <= count
+        row, column = np.triu_indices(count + 1)
+        weights = np.column_stack((column - row,
+                                   row)).astype(np.float64) / count
+
+        origin = triangles[faces, 0]
+        vectors = triangles[faces, 1:] - origin.reshape((-1, 1, 3))
+        points = (origin.reshape((-1, 1, 3)) +
+                  np.einsum('pk,fkd->fpd', weights, vectors))
+        samples.append(points.reshape((-1, 3)))
+        face_index.append(np.repeat(faces, len(weights)))
+
+    if len(samples) == 0:
+        return np.zeros((0, 3)), np.zeros(0, dtype=np.int64)
+    return np.vstack(samples), np.hstack(face_index)
+
+
 def sample_surface_sphere(count):
     """
     Correctly pick random points on the surface of a unit sphere
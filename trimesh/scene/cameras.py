@@ -0,0 +1,105 @@
+"""
+cameras.py
+-------------
+
+Camera poses and per- pixel rays for rendering scenes without OpenGL.
+
+Cameras follow the OpenGL convention: in the camera frame the view
+direction is -Z and up is +Y, and a camera transform moves points from
+the camera frame into the world frame.
+"""
+import numpy as np
+
+from .. import util
+from .. import transformations
+
+
+def camera_transform(center, distance, angles=None):
+    """
+    The camera pose used by Scene.set_camera, which looks at a center
+    point from a distance after rotating around it.
+
+    Parameters
+    -----------
+    center:   (3,) float, point camera should center on
+    distance: float, distance away camera should be
+    angles:   (3,) float, euler angles in radians
+
+    Returns
+    -----------
+    transform: (4,4) float, camera to world transform
+    """
+    if angles is None:
+        angles = np.zeros(3)
+    center = np.asanyarray(center, dtype=np.float64)
+
+    translation = np.eye(4)
+    translation[0:3, 3] = center
+    # offset by a distance set by the model size
+    # the FOV is set for the Y axis, we multiply by a lightly
+    # padded aspect ratio to make sure the model is in view initially
+    translation[2][3] += distance * 1.35
+
+    transform = np.dot(transformations.rotation_matrix(angles[0],
+                                                       [1, 0, 0],
+                                                       point=center),
+                       transformations.rotation_matrix(angles[1],
+                                                       [0, 1, 0],
+                                                       point=center))
+    transform = np.dot(transform, translation)
+    return transform
+
+
+def camera_rays(transform,
+                resolution,
+                fov=60.0,
+                orthographic=None):
+    """
+    Generate one ray through the center of every pixel of a camera.
+
+    Parameters
+    -----------
+    transform:    (4,4) float, camera to world transform
+    resolution:   (2,) int, (width, height) in pixels
+    fov:          float, vertical field of view in degrees
+                  for a perspective camera
+    orthographic: None, or (2,) float, (width, height) of the view
+                  in world units for an orthographic camera
+
+    Returns
+    -----------
+    origins:    (height * width, 3) float, ray origins in row- major
+                pixel order with the first row at the top of the image
+    directions: (height * width, 3) float, unit ray directions
+    """
+    transform = np.asanyarray(transform, dtype=np.float64)
+    if transform.shape != (4, 4):
+        raise ValueError('transform must be (4,4)!')
+    width, height = np.asanyarray(resolution, dtype=np.int64).reshape(2)
+
+    # pixel centers on a plane one unit in front of the camera
+    # from -1.0 to 1.0 in both directions
+    x = (np.arange(width) + .5) / width * 2.0 - 1.0
+    y = 1.0 - (np.arange(height) + .5) / height * 2.0
+    x, y = [i.ravel() for i in np.meshgrid(x, y)]
+
+    if orthographic is None:
+        half_y = np.tan(np.radians(fov) / 2.0)
+        half_x = half_y * width / float(height)
+        directions = np.column_stack((x * half_x,
+                                      y * half_y,
+                                      -np.ones(len(x))))
+        origins = np.zeros((len(x), 3))
+    else:
+        half_x, half_y = np.asanyarray(orthographic,
+                                       dtype=np.float64).reshape(2) / 2.0
+        origins = np.column_stack((x * half_x,
+                                   y * half_y,
+                                   np.zeros(len(x))))
+        directions = np.tile([0.0, 0.0, -1.0], (len(x), 1))
+
+    # move rays from the camera frame into the world frame
+    origins = transformations.transform_points(origins, transform)
+    directions = util.unitize(np.dot(directions, transform[:3, :3].T))
+
+    return origins, directions
@@ -11,6 +11,8 @@ from .. import transformations
 from .. import bounds as bounds_module
 
 from ..io import gltf
+from ..io import binary
+from . import cameras
 from .transforms import TransformForest
 
 
@@ -155,6 +157,68 @@ class Scene:
                            corners.max(axis=0)])
         return bounds
 
+    @util.cache_decorator
+    def bounds_nodes(self):
+        '''
+        The axis aligned bounding box of every node with geometry,
+        in the same order as self.graph.nodes_geometry.
+
+        Returns
+        --------
+        bounds: (len(self.graph.nodes_geometry), 2, 3) float,
+                min, max corner of each node in the base frame
+        '''
+        nodes = self.graph.nodes_geometry
+        if len(nodes) == 0:
+            return np.zeros((0, 2, 3))
+
+        transforms = np.zeros((len(nodes), 4, 4))
+        geometry = []
+        for i, node_name in enumerate(nodes):
+            transforms[i], geometry_name = self.graph[node_name]
+            geometry.append(geometry_name)
+
+        # bounds of each geometry are looked up once, padding
+        # the (2,2) bounds of planar geometry to (2,3)
+        unique, inverse = np.unique(geometry, return_inverse=True)
+        local = np.zeros((len(unique), 2, 3))
+        for i, name in enumerate(unique):
+            current = np.asanyarray(self.geometry[name].bounds)
+            local[i, :, :current.shape[1]] = current
+        local = local[inverse]
+
+        # the box around a transformed box has half extents of the
+        # absolute rotation applied to the original half extents
+        center = local.mean(axis=1)
+        half = (local[:, 1] - local[:, 0]) / 2.0
+        center = (np.einsum('nij,nj->ni', transforms[:, :3, :3], center) +
+                  transforms[:, :3, 3])
+        half = np.einsum('nij,nj->ni', np.abs(transforms[:, :3, :3]), half)
+
+        bounds = np.stack((center - half, center + half), axis=1)
+        return bounds
+
+    def overlapping_nodes(self, distance=0.0):
+        '''
+        Find pairs of nodes whose axis aligned bounding boxes overlap
+        using sort and sweep, which can be used to pick candidates
+        for collision or clearance checks.
+
+        Parameters
+        -----------
+        distance: float, also include nodes whose boxes are separated
+                  by no more than this along every axis
+
+        Returns
+        -----------
+        pairs: (n, 2) str, names of nodes in self.graph
+        '''
+        from ..bvh import sweep_pairs
+
+        nodes = np.array(self.graph.nodes_geometry, dtype=object)
+        pairs = sweep_pairs(self.bounds_nodes, distance=distance)
+        return nodes[pairs].reshape((-1, 2))
+
     @util.cache_decorator
     def extents(self):
         '''
@@ -302,23 +366,9 @@ class Scene:
             distance = ((self.extents.max() / 2) /
                         np.tan(np.radians(60.0) / 2.0))
 
-        if angles is None:
-            angles = np.zeros(3)
-
-        translation = np.eye(4)
-        translation[0:3, 3] = center
-        # offset by a distance set by the model size
-        # the FOV is set for the Y axis, we multiply by a lightly
-        # padded aspect ratio to make sure the model is in view initially
-        translation[2][3] += distance * 1.35
-
-        transform = np.dot(transformations.rotation_matrix(angles[0],
-                                                           [1, 0, 0],
-                                                           point=center),
-                           transformations.rotation_matrix(angles[1],
-                                                           [0, 1, 0],
-                                                           point=center))
-        transform = np.dot(transform, translation)
+        transform = cameras.camera_transform(center=center,
+                                             distance=distance,
+                                             angles=angles)
 
         self.graph.update(frame_from='camera',
                           frame_to=self.graph.base_frame,
@@ -413,7 +463,7 @@ class Scene:
                              mutable=False)
         return obb
 
-    def export(self, file_type=None):
+    def export(self, file_type=None, file_obj=None):
         '''
         Export a snapshot of the current scene.
 
@@ -421,6 +471,8 @@ class Scene:
         ----------
         file_type: what encoding to use for meshes
                    ie: dict, dict64, stl
+        file_obj:  None, or open file object to write a
+                   'glb' or 'trimesh' export to
 
         Returns
         ----------
@@ -433,7 +485,13 @@ class Scene:
         if file_type == 'gltf':
             return gltf.export_gltf(self)
         elif file_type == 'glb':
-            return gltf.export_glb(self)
+            return gltf.export_glb(self, file_obj=file_obj)
+        elif file_type == 'trimesh':
+            return binary.export_scene(self, file_obj=file_obj)
+
+        if file_obj is not None:
+            raise ValueError('only glb and trimesh exports can be written '
+                             'to a file!')
 
         export = {'graph': self.graph.to_edgelist(),
                   'geometry': {},
@@ -99,6 +99,10 @@ class TransformForest:
         gltf: dict, with keys:
                   'nodes': list of dicts
         """
+        # find every transform from the base frame in one pass
+        # rather than searching for a path to every node
+        self._cache_transforms(frame_from=self.base_frame)
+
         gltf = collections.deque()
         for node in self.nodes_geometry:
             if node == self.base_frame:
@@ -216,6 +220,41 @@ class TransformForest:
 
         return transform, geometry
 
+    def _cache_transforms(self, frame_from=None):
+        """
+        Find the transform from a frame to every frame connected to it
+        with a single traversal of the tree, and store them in the cache
+        used by get.
+
+        Parameters
+        ---------
+        frame_from: hashable object, usually a string (eg 'world').
+                    If left as None it will be set to self.base_frame
+        """
+        if frame_from is None:
+            frame_from = self.base_frame
+        if frame_from not in self.transforms._undirected:
+            return
+
+        transforms = {frame_from: np.eye(4)}
+        for parent, child in nx.bfs_edges(self.transforms._undirected,
+                                          frame_from):
+            data, direction = self.transforms.get_edge_data_direction(
+                parent, child)
+            matrix = data['matrix']
+            if direction < 0:
+                matrix = np.linalg.inv(matrix)
+            transforms[child] = np.dot(transforms[parent], matrix)
+
+        for frame_to, transform in transforms.items():
+            cache_key = str(frame_from) + ':' + str(frame_to)
+            if self._cache[cache_key] is not None:
+                continue
+            geometry = None
+            if 'geometry' in self.transforms.node[frame_to]:
+                geometry = self.transforms.node[frame_to]['geometry']
+            self._cache[cache_key] = (transform, geometry)
+
     def show(self):
         """
         Plot the graph layout of the scene.
@@ -477,48 +477,74 @@ def closest_point(triangles, points):
     if not util.is_shape(points, (len(triangles), 3)):
         raise ValueError('triangles and points must correspond')
 
-    # convert points to barycentric coordinates
-    barycentric = points_to_barycentric(triangles, points)
-
-    # signs of barycentric coordinates
-    positive = barycentric > -tol.zero
-    positive_sum = positive.sum(axis=1)
-    # cases for signs of barycentric coordinates:
-    # 2 negative, 1 positive: closest point is positive vertex
-    # 1 negative, 2 positive: closest point is on edge between 2 positive
-    # 0 negative, 3 positive: closest point is @ barycentric coord
-    case_vertex = positive_sum == 1
-    case_edge = positive_sum == 2
-    case_barycentric = positive_sum == 3
-
-    # closest points to triangle
-    closest = np.zeros(points.shape, dtype=np.float64)
+    # check which Voronoi region of the triangle each point is in
+    # following Ericson, "Real-Time Collision Detection" 5.1.5
+    a, b, c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+    ab = b - a
+    ac = c - a
+    ap = points - a
+
+    d1 = util.diagonal_dot(ab, ap)
+    d2 = util.diagonal_dot(ac, ap)
+    # dot products with vectors from b and c
+    # are the same as from a minus a constant
+    abab = util.diagonal_dot(ab, ab)
+    abac = util.diagonal_dot(ab, ac)
+    acac = util.diagonal_dot(ac, ac)
+    d3 = d1 - abab
+    d4 = d2 - abac
+    d5 = d1 - abac
+    d6 = d2 - acac
+
+    va = d3 * d6 - d5 * d4
+    vb = d5 * d2 - d1 * d6
+    vc = d1 * d4 - d3 * d2
+
+    # assign each point to exactly one region in order
+    region_a = np.logical_and(d1 <= 0.0, d2 <= 0.0)
+    region_b = np.logical_and(d3 >= 0.0, d4 <= d3)
+    region_c = np.logical_and(d6 >= 0.0, d5 <= d6)
+    region_ab = np.logical_and(vc <= 0.0,
+                               np.logical_and(d1 >= 0.0, d3 <= 0.0))
+    region_ac = np.logical_and(vb <= 0.0,
+                               np.logical_and(d2 >= 0.0, d6 <= 0.0))
+    region_bc = np.logical_and(va <= 0.0,
+                               np.logical_and(d4 >= d3, d5 >= d6))
+    taken = np.zeros(len(points), dtype=np.bool)
+    regions = []
+    for region in [region_a, region_b, region_c,
+                   region_ab, region_ac, region_bc]:
+        region = np.logical_and(region, np.logical_not(taken))
+        taken = np.logical_or(taken, region)
+        regions.append(region)
+    region_a, region_b, region_c, region_ab, region_ac, region_bc = regions
+    # everything else projects inside the face
+    region_face = np.logical_not(taken)
 
-    # case where nearest point is a triangle vertex
-    # just take that vertex
-    closest[case_vertex] = triangles[case_vertex][positive[case_vertex]]
-
-    # case where projection is inside the triangle
-    # just evaluate the barycentric coordinates
-    closest[case_barycentric] = (triangles[case_barycentric] *
-                                 barycentric[case_barycentric].reshape((-1, 3, 1))).sum(axis=1)
-
-    # if case_edge.any():
-    # case where the closest point lies on the edge of a triangle
-    # we have to find the closest point on a line
-    edges = triangles[case_edge][positive[case_edge]].reshape((-1, 2, 3))
-    # for a line defined by A and B, and a point in space P
-    AB = np.diff(edges, axis=1).reshape((-1, 3))
-    AP = points[case_edge] - edges[:, 0]
-    # point projected onto line segment divided by line segment length squared
-    edge_distance = (util.diagonal_dot(AP, AB) /
-                     util.diagonal_dot(AB, AB)).reshape((-1, 1))
-    # our point needs to be on the edge, so the distance along the edge
-    # should be clipped to be between 0.0 and 1.0
-    edge_distance = np.clip(edge_distance, 0.0, 1.0)
-
-    projection = edges[:, 0] + (edge_distance * AB)
-    closest[case_edge] = projection
+    closest = np.zeros(points.shape, dtype=np.float64)
+    closest[region_a] = a[region_a]
+    closest[region_b] = b[region_b]
+    closest[region_c] = c[region_c]
+
+    # closest points on the edges
+    m = region_ab
+    t = d1[m] / (d1[m] - d3[m])
+    closest[m] = a[m] + ab[m] * t.reshape((-1, 1))
+
+    m = region_ac
+    t = d2[m] / (d2[m] - d6[m])
+    closest[m] = a[m] + ac[m] * t.reshape((-1, 1))
+
+    m = region_bc
+    t = (d4[m] - d3[m]) / ((d4[m] - d3[m]) + (d5[m] - d6[m]))
+    closest[m] = b[m] + (c[m] - b[m]) * t.reshape((-1, 1))
+
+    # projection inside the face from barycentric coordinates
+    m = region_face
+    denominator = va[m] + vb[m] + vc[m]
+    v = (vb[m] / denominator).reshape((-1, 1))
+    w = (vc[m] / denominator).reshape((-1, 1))
+    closest[m] = a[m] + ab[m] * v + ac[m] * w
 
     return closest
 
@@ -551,3 +577,114 @@ def to_kwargs(triangles):
               'faces': faces}
 
     return kwargs
+
+
+def pair_distance(a, b):
+    """
+    Find the closest points between corresponding pairs of triangles,
+    which are always on a vertex of one triangle or on two edges.
+
+    Triangles which cross each other are not detected and will report
+    the distance between their closest edges or vertices, use
+    intersections.triangle_triangle to check for crossings.
+
+    Parameters
+    ----------
+    a: (n,3,3) float, triangles in space
+    b: (n,3,3) float, triangles in space
+
+    Returns
+    ----------
+    distance: (n,)  float, distance between each pair
+    closest:  (n,2,3) float, closest point on a and on b
+    """
+    a = np.asanyarray(a, dtype=np.float64)
+    b = np.asanyarray(b, dtype=np.float64)
+    if not util.is_shape(a, (-1, 3, 3)) or a.shape != b.shape:
+        raise ValueError('triangles must be (n,3,3) and correspond!')
+
+    count = len(a)
+    candidates = np.zeros((count, 15, 2, 3), dtype=np.float64)
+    # vertices of each triangle against the other triangle
+    for i in range(3):
+        candidates[:, i, 0] = a[:, i]
+        candidates[:, i, 1] = closest_point(b, a[:, i])
+        candidates[:, i + 3, 0] = closest_point(a, b[:, i])
+        candidates[:, i + 3, 1] = b[:, i]
+    # every edge of one triangle against every edge of the other
+    for i in range(3):
+        for j in range(3):
+            (candidates[:, 6 + i * 3 + j, 0],
+             candidates[:, 6 + i * 3 + j, 1]) = segments_closest(
+                 a[:, i], a[:, (i + 1) % 3],
+                 b[:, j], b[:, (j + 1) % 3])
+
+    vector = candidates[:, :, 0] - candidates[:, :, 1]
+    squared = (vector ** 2).sum(axis=2)
+    index = squared.argmin(axis=1)
+    distance = np.sqrt(squared[np.arange(count), index])
+    closest = candidates[np.arange(count), index]
+
+    return distance, closest
+
+
+def segments_closest(a_start, a_end, b_start, b_end):
+    """
+    Find the closest points between corresponding pairs of line
+    segments, following Ericson "Real-Time Collision Detection" 5.1.9
+
+    Parameters
+    ----------
+    a_start: (n,3) float, first point of segment a
+    a_end:   (n,3) float, second point of segment a
+    b_start: (n,3) float, first point of segment b
+    b_end:   (n,3) float, second point of segment b
+
+    Returns
+    ----------
+    on_a: (n,3) float, closest point on segment a
+    on_b: (n,3) float, closest point on segment b
+    """
+    d1 = a_end - a_start
+    d2 = b_end - b_start
+    r = a_start - b_start
+
+    a = util.diagonal_dot(d1, d1)
+    e = util.diagonal_dot(d2, d2)
+    f = util.diagonal_dot(d2, r)
+    c = util.diagonal_dot(d1, r)
+    b = util.diagonal_dot(d1, d2)
+
+    degenerate_a = a <= tol.zero
+    degenerate_b = e <= tol.zero
+    # avoid dividing by zero for degenerate segments
+    a_safe = np.where(degenerate_a, 1.0, a)
+    e_safe = np.where(degenerate_b, 1.0, e)
+
+    # parameter on a for the closest points of the infinite lines
+    # or zero for parallel lines where any point will do
+    denominator = a * e - b * b
+    parallel = denominator <= tol.zero * np.maximum(a * e, 1.0)
+    s = np.where(parallel,
+                 0.0,
+                 np.clip((b * f - c * e) /
+                         np.where(parallel, 1.0, denominator), 0.0, 1.0))
+
+    # parameter on b for that point, clamped to the segment
+    # which moves the closest point on a when clamped
+    t = (b * s + f) / e_safe
+    low = t < 0.0
+    high = t > 1.0
+    t = np.clip(t, 0.0, 1.0)
+    s = np.where(low, np.clip(-c / a_safe, 0.0, 1.0), s)
+    s = np.where(high, np.clip((b - c) / a_safe, 0.0, 1.0), s)
+
+    # degenerate segments are points
+    s = np.where(degenerate_b, np.clip(-c / a_safe, 0.0, 1.0), s)
+    t = np.where(degenerate_b, 0.0, t)
+    t = np.where(degenerate_a, np.clip(f / e_safe, 0.0, 1.0), t)
+    s = np.where(degenerate_a, 0.0, s)
+
+    on_a = a_start + d1 * s.reshape((-1, 1))
+    on_b = b_start + d2 * t.reshape((-1, 1))
+    return on_a, on_b
@@ -19,6 +19,7 @@ import time
 import copy
 import json
 import zlib
+import weakref
 
 from sys import version_info
 from functools import wraps
@@ -1010,6 +1011,70 @@ class Cache:
         self.id_current = self._id_function()
 
 
+class Registry(object):
+    """
+    A process- wide store for objects derived from geometry, such as
+    acceleration structures, keyed by a hash of that geometry.
+
+    Values are only held by weak reference, so an entry lives exactly
+    as long as some object (usually a mesh cache) is still using it and
+    identical geometry shares a single structure.
+    """
+
+    def __init__(self):
+        self._data = weakref.WeakValueDictionary()
+        # set to False to build everything per- object
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, function):
+        """
+        Get a value from the registry, creating it if necessary.
+
+        Parameters
+        ------------
+        key:      hashable, for example (name, md5 of geometry)
+        function: callable with no arguments which creates the value
+
+        Returns
+        ------------
+        value: stored value, or the result of function()
+        """
+        if not self.enabled:
+            return function()
+        value = self._data.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        value = function()
+        try:
+            self._data[key] = value
+        except TypeError:
+            # some compiled types don't support weak references
+            log.debug('%s can not be stored in registry',
+                      value.__class__.__name__)
+        return value
+
+    def clear(self):
+        """
+        Remove every entry from the registry.
+        """
+        self._data.clear()
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+
+# acceleration structures shared by identical geometry
+registry = Registry()
+
+
 class DataStore:
     """
     A class to store multiple numpy arrays and track them all for changes.
@@ -1196,25 +1261,34 @@ def array_to_string(array,
     # allow a value to be repeated in a value format
     repeats = value_format.count('{}')
 
+    # printf- style formatting of native python numbers is much
+    # faster than str.format on numpy scalars, so escape any
+    # literal percent signs and use the old style operator
+    value_format = value_format.replace('%', '%%')
+    col_delim = col_delim.replace('%', '%%')
+    row_delim = row_delim.replace('%', '%%')
+
     if array.dtype.kind == 'i':
         # integer types don't need a specified precision
-        format_str = value_format + col_delim
+        format_str = value_format.replace('{}', '%d') + col_delim
     elif array.dtype.kind == 'f':
         # add the digits formatting to floats
         format_str = value_format.replace(
-            '{}', '{:.' + str(digits) + 'f}') + col_delim
+            '{}', '%.' + str(digits) + 'f') + col_delim
     else:
         raise ValueError('dtype %s not convertable!',
                          array.dtype.name)
+    # remove the escaped braces str.format would have used
+    format_str = format_str.replace('{{', '{').replace('}}', '}')
 
     # length of extra delimiters at the end
-    end_junk = len(col_delim)
+    end_junk = len(col_delim.replace('%%', '%'))
     # if we have a 2D array add a row delimiter
     if len(array.shape) == 2:
         format_str *= array.shape[1]
         # cut off the last column delimeter and add a row delimiter
         format_str = format_str[:-len(col_delim)] + row_delim
-        end_junk = len(row_delim)
+        end_junk = len(row_delim.replace('%%', '%'))
 
     # expand format string to whole array
     format_str *= len(array)
@@ -1224,12 +1298,43 @@ def array_to_string(array,
     shaped = np.tile(array.reshape((-1, 1)),
                      (1, repeats)).reshape(-1)
 
-    # run the format operation and remove the extra delimiters
-    formatted = format_str.format(*shaped)[:-end_junk]
+    # run the format operation on a tuple of python numbers
+    # and remove the extra delimiters
+    formatted = (format_str % tuple(shaped.tolist()))[:-end_junk]
 
     return formatted
 
 
+def array_to_string_chunks(array, chunk=100000, **kwargs):
+    """
+    Convert an array into strings a number of rows at a time,
+    where the strings joined together are the same as the result
+    of array_to_string with the same arguments.
+
+    Parameters
+    ----------
+    array:  (n,) or (n,d) float/int, array to be converted
+    chunk:  int, number of rows in each string
+    kwargs: passed to array_to_string
+
+    Returns
+    ----------
+    chunks: generator, of str
+    """
+    array = np.asanyarray(array)
+    # the delimiter which array_to_string puts between rows
+    if len(array.shape) == 2:
+        delim = str(kwargs.get('row_delim', '\n'))
+    else:
+        delim = str(kwargs.get('col_delim', ' '))
+
+    for start in range(0, len(array), chunk):
+        formatted = array_to_string(array[start:start + chunk], **kwargs)
+        if start > 0:
+            formatted = delim + formatted
+        yield formatted
+
+
 def array_to_encoded(array, dtype=None, encoding='base64'):
     """
     Export a numpy array to a compact serializable dictionary.
@@ -2024,7 +2129,11 @@ def write_encoded(file_obj, stuff, encoding='utf-8'):
     encoding: str,          encoding of text
 
     """
-    binary_file = 'b' in file_obj.mode
+    if hasattr(file_obj, 'mode'):
+        binary_file = 'b' in file_obj.mode
+    else:
+        # file objects in memory like BytesIO don't have a mode
+        binary_file = not isinstance(file_obj, StringIO)
     string_stuff = isinstance(stuff, basestring)
     binary_stuff = isinstance(stuff, bytes)
 
@@ -2039,6 +2148,31 @@ def write_encoded(file_obj, stuff, encoding='utf-8'):
     file_obj.flush()
 
 
+def write_chunks(chunks, file_obj=None):
+    """
+    Write chunks of an export to a file object one at a time, so
+    the whole export never has to be in memory at once.
+
+    Parameters
+    -----------
+    chunks:   iterable, of str, bytes, or contiguous numpy arrays
+    file_obj: None, or file object with 'write'
+
+    Returns
+    -----------
+    export: if file_obj is None, the chunks joined into str or bytes
+    """
+    if file_obj is None:
+        chunks = [c.tostring() if isinstance(c, np.ndarray) else c
+                  for c in chunks]
+        if len(chunks) == 0:
+            return ''
+        return chunks[0][:0].join(chunks)
+
+    for chunk in chunks:
+        write_encoded(file_obj, chunk)
+
+
 def unique_id(length=12):
     """
     Generate a decent looking alphanumeric unique identifier.
@@ -10,7 +10,7 @@ from . import util
 from . import remesh
 from . import grouping
 
-from .constants import log
+from .constants import log, tol
 
 from collections import deque
 
@@ -228,6 +228,254 @@ class VoxelMesh(Voxel):
         self.as_boxes.show()
 
 
+class OccupancyGrid(object):
+    """
+    A regular grid around a mesh where every cell is classified as
+    entirely outside, entirely inside or crossed by the surface.
+
+    Points landing in inside or outside cells are answered with a
+    lookup, and only points in boundary cells are checked exactly.
+    """
+
+    # values stored in self.cells
+    outside = 0
+    inside = 1
+    boundary = 2
+
+    def __init__(self, mesh, pitch=None, resolution=64, engine=None):
+        """
+        Parameters
+        ------------
+        mesh:       Trimesh object
+        pitch:      float, edge length of a cell
+        resolution: int, if pitch isn't specified the number of cells
+                         along the longest side of the mesh bounds
+        engine:     str, contains engine for boundary cells
+                         passed to Trimesh.contains
+        """
+        self.mesh = mesh
+        self.engine = engine
+        if pitch is None:
+            pitch = mesh.extents.max() / float(resolution)
+        self.pitch = float(pitch)
+        self._cache = util.Cache(id_function=self.mesh.crc)
+
+    @util.cache_decorator
+    def origin(self):
+        """
+        The corner of the grid, padded by two cells from the mesh.
+
+        Returns
+        ----------
+        origin: (3,) float, minimum corner of cell (0, 0, 0)
+        """
+        return self.mesh.bounds[0] - self.pitch * 2.0
+
+    @util.cache_decorator
+    def shape(self):
+        """
+        The number of cells along each axis, including two layers of
+        padding cells on every side so the outer layer never touches
+        the surface.
+
+        Returns
+        ----------
+        shape: (3,) int, shape of self.cells
+        """
+        shape = np.ceil(self.mesh.extents / self.pitch).astype(int) + 4
+        return tuple(shape)
+
+    @util.cache_decorator
+    def cells(self):
+        """
+        Classification of every cell of the grid.
+
+        Returns
+        ----------
+        cells: self.shape int8, with values of self.outside,
+                                self.inside or self.boundary
+        """
+        from scipy import ndimage
+
+        cells = np.zeros(self.shape, dtype=np.int8)
+        surface = surface_cells(triangles=self.mesh.triangles,
+                                origin=self.origin,
+                                pitch=self.pitch,
+                                shape=self.shape)
+        cells[tuple(surface.T)] = self.boundary
+
+        # connected regions of cells not touching the surface
+        # are either entirely inside or entirely outside
+        labels, count = ndimage.label(cells != self.boundary)
+        if count == 0:
+            return cells
+
+        # the outer padding layer is always outside
+        border = np.unique(np.concatenate(
+            [labels[0].ravel(), labels[-1].ravel(),
+             labels[:, 0].ravel(), labels[:, -1].ravel(),
+             labels[:, :, 0].ravel(), labels[:, :, -1].ravel()]))
+
+        # check one cell center from every enclosed region exactly
+        label_flat = labels.ravel()
+        label_first = np.unique(label_flat, return_index=True)
+        enclosed = np.setdiff1d(label_first[0], np.append(border, 0))
+        if len(enclosed) > 0:
+            index = np.column_stack(np.unravel_index(
+                label_first[1][np.searchsorted(label_first[0], enclosed)],
+                self.shape))
+            centers = self.origin + (index + .5) * self.pitch
+            contained = self.mesh.contains(centers, engine=self.engine)
+            region = np.zeros(count + 1, dtype=np.bool)
+            region[enclosed[contained]] = True
+            cells[region[labels]] = self.inside
+
+        return cells
+
+    def contains_points(self, points):
+        """
+        Check if the mesh contains points, using the grid for points
+        away from the surface.
+
+        Parameters
+        ------------
+        points: (n,3) float, points in space
+
+        Returns
+        ------------
+        contains: (n,) bool, whether each point is inside the mesh
+        """
+        points = np.asanyarray(points, dtype=np.float64)
+        if not util.is_shape(points, (-1, 3)):
+            raise ValueError('points must be (n,3)!')
+
+        contains = np.zeros(len(points), dtype=np.bool)
+        cells = self.cells
+
+        index = np.floor((points - self.origin) / self.pitch).astype(np.int64)
+        in_grid = np.logical_and((index >= 0).all(axis=1),
+                                 (index < self.shape).all(axis=1))
+
+        state = np.full(len(points), self.outside, dtype=np.int8)
+        state[in_grid] = cells[tuple(index[in_grid].T)]
+
+        contains[state == self.inside] = True
+        check = state == self.boundary
+        if check.any():
+            contains[check] = self.mesh.contains(points[check],
+                                                 engine=self.engine)
+        return contains
+
+
+def surface_cells(triangles, origin, pitch, shape, chunk=1000000):
+    """
+    Find the cells of a regular grid which a triangle passes through.
+
+    Candidate cells from the bounds of each triangle are checked with
+    a separating axis test, with cells slightly enlarged by tol.merge
+    so the result is conservative.
+
+    Parameters
+    ------------
+    triangles: (n,3,3) float, triangles in space
+    origin:    (3,) float, minimum corner of cell (0, 0, 0)
+    pitch:     float, edge length of a cell
+    shape:     (3,) int, number of cells along each axis
+    chunk:     int, maximum candidate pairs evaluated at once
+
+    Returns
+    ------------
+    index: (m,3) int, unique index of cells touching triangles
+    """
+    triangles = np.asanyarray(triangles, dtype=np.float64)
+    if not util.is_shape(triangles, (-1, 3, 3)):
+        raise ValueError('Triangles must be (n,3,3)!')
+    if len(triangles) == 0:
+        return np.zeros((0, 3), dtype=np.int64)
+
+    # local coordinates where each cell is a unit cube
+    local = (triangles - origin) / pitch
+    epsilon = tol.merge / pitch + 1e-9
+    lower = np.floor(local.min(axis=1) - epsilon).astype(np.int64)
+    upper = np.floor(local.max(axis=1) + epsilon).astype(np.int64)
+    lower = np.clip(lower, 0, np.array(shape) - 1)
+    upper = np.clip(upper, 0, np.array(shape) - 1)
+    size = upper - lower + 1
+    count = size.prod(axis=1)
+
+    # split triangles into chunks with a bounded number of pairs
+    split = np.searchsorted(np.cumsum(count),
+                            np.arange(chunk, count.sum(), chunk))
+    result = deque()
+    for group in np.array_split(np.arange(len(triangles)),
+                                np.unique(split)):
+        if len(group) == 0:
+            continue
+        pair = np.repeat(group, count[group])
+        offset = np.arange(len(pair)) - np.repeat(
+            np.cumsum(count[group]) - count[group], count[group])
+        cell = lower[pair] + np.column_stack(
+            _unravel(offset, size[pair]))
+
+        ok = triangle_box_overlap(triangles=local[pair],
+                                  centers=cell + .5,
+                                  half=.5 + epsilon)
+        result.append(cell[ok])
+
+    cells = np.vstack(result)
+    cells = cells[grouping.unique_rows(cells)[0]]
+    return cells
+
+
+def _unravel(index, shape):
+    """
+    Unravel flat indexes where every index has its own (n,3) shape.
+    """
+    z = index % shape[:, 2]
+    y = (index // shape[:, 2]) % shape[:, 1]
+    x = index // (shape[:, 2] * shape[:, 1])
+    return x, y, z
+
+
+def triangle_box_overlap(triangles, centers, half):
+    """
+    Separating axis test between triangles and corresponding
+    axis aligned cubes, from Akenine- Moller.
+
+    Parameters
+    ------------
+    triangles: (n,3,3) float, triangles in space
+    centers:   (n,3) float, center of each cube
+    half:      float, half of the edge length of the cubes
+
+    Returns
+    ------------
+    overlap: (n,) bool, whether each triangle touches its cube
+    """
+    vertices = triangles - centers.reshape((-1, 1, 3))
+    # the box axes
+    overlap = np.logical_and(
+        (vertices.min(axis=1) <= half).all(axis=1),
+        (vertices.max(axis=1) >= -half).all(axis=1))
+
+    # the triangle normal
+    normal = np.cross(vertices[:, 1] - vertices[:, 0],
+                      vertices[:, 2] - vertices[:, 0])
+    radius = half * np.abs(normal).sum(axis=1)
+    overlap &= np.abs(util.diagonal_dot(normal, vertices[:, 0])) <= radius
+
+    # the cross product of every triangle edge with every box axis
+    edges = np.roll(vertices, -1, axis=1) - vertices
+    for edge in edges.transpose((1, 0, 2)):
+        for axis in np.eye(3):
+            direction = np.cross(edge, axis)
+            projected = np.einsum('ij,ikj->ik', direction, vertices)
+            radius = half * np.abs(direction).sum(axis=1)
+            overlap &= np.logical_and(projected.min(axis=1) <= radius,
+                                      projected.max(axis=1) >= -radius)
+    return overlap
+
+
 def voxelize_subdivide(mesh, pitch, max_iter=10):
     """
     Voxelize a surface by subdividing a mesh until every edge is shorter
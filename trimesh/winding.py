@@ -0,0 +1,202 @@
+"""
+winding.py
+-------------
+
+Point containment using the generalized winding number.
+
+The winding number of a closed, outward facing surface is 1.0
+inside and 0.0 outside, and degrades gracefully on surfaces
+which have small holes or cracks. Far away groups of triangles
+are approximated by a single dipole, Barnes- Hut style, using
+the triangle hierarchy of the mesh.
+"""
+import numpy as np
+
+from . import util
+from . import bounds
+
+from .constants import _log_time
+
+
+class WindingQuery(object):
+    """
+    Generalized winding number queries for the current mesh.
+    """
+
+    def __init__(self, mesh, beta=2.0, chunk=50000):
+        """
+        Parameters
+        ------------
+        mesh:  Trimesh object
+        beta:  float, a node is approximated when the distance from a
+                      query point to its center is more than beta times
+                      the radius of the node
+        chunk: int, number of points to evaluate at once
+        """
+        self.mesh = mesh
+        self.beta = float(beta)
+        self.chunk = int(chunk)
+        self._cache = util.Cache(id_function=self.mesh.crc)
+
+    @util.cache_decorator
+    def _moments(self):
+        """
+        Dipole moments of every node of the triangle hierarchy.
+
+        Returns
+        ----------
+        moments: dict with keys:
+                  'normal': (n,3) float, area weighted normal
+                  'center': (n,3) float, area weighted center
+                  'radius': (n,)  float, radius of node around center
+        """
+        tree = self.mesh.triangles_bvh
+        # cross product is twice the area weighted normal
+        normal = self.mesh.triangles_cross * .5
+        area = self.mesh.area_faces
+
+        # cumulative sums over the tree order let us sum every
+        # contiguous node range with a single subtraction
+        ordered = np.column_stack((
+            normal,
+            self.mesh.triangles_center * area.reshape((-1, 1)),
+            area))[tree.order]
+        summed = np.vstack((np.zeros(7), np.cumsum(ordered, axis=0)))
+        summed = (summed[tree.node_start + tree.node_count] -
+                  summed[tree.node_start])
+
+        node_area = summed[:, 6]
+        center = tree.node_bounds.mean(axis=1)
+        nonzero = node_area > 0.0
+        center[nonzero] = (summed[nonzero, 3:6] /
+                           node_area[nonzero].reshape((-1, 1)))
+
+        # farthest corner of the node box from its center
+        corner = np.maximum(tree.node_bounds[:, 1] - center,
+                            center - tree.node_bounds[:, 0])
+        radius = np.linalg.norm(corner, axis=1)
+
+        return {'normal': summed[:, :3],
+                'center': center,
+                'radius': radius}
+
+    @_log_time
+    def number(self, points):
+        """
+        Find the generalized winding number of the mesh at points.
+
+        Parameters
+        ------------
+        points: (n,3) float, points in space
+
+        Returns
+        ------------
+        winding: (n,) float, approximately 1.0 inside and 0.0 outside
+        """
+        points = np.asanyarray(points, dtype=np.float64)
+        if not util.is_shape(points, (-1, 3)):
+            raise ValueError('points must be (n,3)!')
+
+        winding = np.zeros(len(points), dtype=np.float64)
+        if len(self.mesh.faces) == 0:
+            return winding
+        for start in range(0, len(points), self.chunk):
+            end = start + self.chunk
+            winding[start:end] = self._number(points[start:end])
+        return winding
+
+    def _number(self, points):
+        """
+        Evaluate the winding number for a chunk of points.
+        """
+        tree = self.mesh.triangles_bvh
+        moments = self._moments
+        triangles = self.mesh.triangles
+
+        winding = np.zeros(len(points), dtype=np.float64)
+        query = np.arange(len(points))
+        node = np.zeros(len(points), dtype=np.int64)
+
+        while len(query) > 0:
+            vector = moments['center'][node] - points[query]
+            distance = np.linalg.norm(vector, axis=1)
+            far = distance > (self.beta * moments['radius'][node])
+
+            # distant nodes are evaluated as a single dipole
+            if far.any():
+                dipole = (util.diagonal_dot(moments['normal'][node[far]],
+                                            vector[far]) /
+                          distance[far] ** 3)
+                winding += np.bincount(query[far],
+                                       weights=dipole,
+                                       minlength=len(points))
+
+            near = np.logical_not(far)
+            (query,
+             node,
+             leaf_query,
+             leaf_triangle) = tree.expand(query[near], node[near])
+
+            # triangles in nearby leaves are evaluated exactly
+            if len(leaf_query) > 0:
+                angle = solid_angle(triangles[leaf_triangle],
+                                    points[leaf_query])
+                winding += np.bincount(leaf_query,
+                                       weights=angle,
+                                       minlength=len(points))
+
+        winding /= 4.0 * np.pi
+        return winding
+
+    def contains_points(self, points):
+        """
+        Check if the mesh contains points using the winding number.
+
+        Parameters
+        ------------
+        points: (n,3) float, points in space
+
+        Returns
+        ------------
+        contains: (n,) bool, whether each point is inside the mesh
+        """
+        points = np.asanyarray(points, dtype=np.float64)
+        if not util.is_shape(points, (-1, 3)):
+            raise ValueError('points must be (n,3)!')
+
+        contains = np.zeros(len(points), dtype=np.bool)
+        # points outside the axis aligned bounding box are outside
+        inside_aabb = bounds.contains(self.mesh.bounds, points)
+        if not inside_aabb.any():
+            return contains
+
+        contains[inside_aabb] = self.number(points[inside_aabb]) > .5
+        return contains
+
+
+def solid_angle(triangles, points):
+    """
+    Signed solid angle subtended by triangles at corresponding points,
+    using the formula of Van Oosterom and Strackee.
+
+    Parameters
+    ------------
+    triangles: (n,3,3) float, triangles in space
+    points:    (n,3) float, points in space
+
+    Returns
+    ------------
+    angle: (n,) float, solid angle in steradians, positive when the
+           point is behind the triangle with respect to its normal
+    """
+    vectors = triangles - points.reshape((-1, 1, 3))
+    a, b, c = vectors[:, 0], vectors[:, 1], vectors[:, 2]
+    la, lb, lc = [np.linalg.norm(i, axis=1) for i in (a, b, c)]
+
+    numerator = util.diagonal_dot(a, np.cross(b, c))
+    denominator = (la * lb * lc +
+                   util.diagonal_dot(a, b) * lc +
+                   util.diagonal_dot(a, c) * lb +
+                   util.diagonal_dot(b, c) * la)
+    angle = 2.0 * np.arctan2(numerator, denominator)
+    return angle